@@ -4,7 +4,7 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 
 from app.core.database import Base
-from app.models import User, DrawResult, NumberStat, AIPrediction, UserFavorite  # noqa: F401
+from app.models import User, DrawResult, NumberStat, AIPrediction, UserFavorite, PairCount, TripletCount, JackpotCycle, DrawFeature, PrizeRollup, RawPage  # noqa: F401
 
 config = context.config
 
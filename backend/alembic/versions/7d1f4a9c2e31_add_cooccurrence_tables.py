@@ -0,0 +1,52 @@
+"""add_cooccurrence_tables
+
+Revision ID: 7d1f4a9c2e31
+Revises: 2bb9c6ce1cae
+Create Date: 2026-10-19 09:12:44.518203
+
+The tables are created empty: run scripts/rebuild_derived.py after upgrading a database
+that already holds draws.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '7d1f4a9c2e31'
+down_revision: Union[str, None] = '2bb9c6ce1cae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('pair_counts',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False, comment='Loại vé: mega645, power655'),
+    sa.Column('num_a', sa.Integer(), nullable=False),
+    sa.Column('num_b', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('type', 'num_a', 'num_b', name='uix_pair_type_numbers')
+    )
+    op.create_index('ix_pair_counts_type_num_b', 'pair_counts', ['type', 'num_b'], unique=False)
+    op.create_index('ix_pair_counts_top', 'pair_counts', ['type', sa.text('count DESC'), 'num_a', 'num_b'], unique=False)
+    op.create_table('triplet_counts',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False, comment='Loại vé: mega645, power655'),
+    sa.Column('num_a', sa.Integer(), nullable=False),
+    sa.Column('num_b', sa.Integer(), nullable=False),
+    sa.Column('num_c', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('type', 'num_a', 'num_b', 'num_c', name='uix_triplet_type_numbers')
+    )
+    op.create_index('ix_triplet_counts_top', 'triplet_counts', ['type', sa.text('count DESC'), 'num_a', 'num_b', 'num_c'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_triplet_counts_top', table_name='triplet_counts')
+    op.drop_table('triplet_counts')
+    op.drop_index('ix_pair_counts_top', table_name='pair_counts')
+    op.drop_index('ix_pair_counts_type_num_b', table_name='pair_counts')
+    op.drop_table('pair_counts')
@@ -0,0 +1,43 @@
+"""add_jackpot_cycles
+
+Revision ID: a4c8e2f71b09
+Revises: 7d1f4a9c2e31
+Create Date: 2026-10-19 10:03:27.114870
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'a4c8e2f71b09'
+down_revision: Union[str, None] = '7d1f4a9c2e31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('jackpot_cycles',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False, comment='Loại vé: mega645, power655'),
+    sa.Column('kind', sa.String(length=20), nullable=False, comment='jackpot hoặc jackpot2 (chỉ 6/55)'),
+    sa.Column('cycle_no', sa.Integer(), nullable=False),
+    sa.Column('start_period', sa.String(length=20), nullable=False),
+    sa.Column('end_period', sa.String(length=20), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('draw_count', sa.Integer(), nullable=False),
+    sa.Column('number_counts', postgresql.ARRAY(sa.INTEGER()), nullable=False),
+    sa.Column('start_jackpot', sa.BigInteger(), nullable=True),
+    sa.Column('end_jackpot', sa.BigInteger(), nullable=True),
+    sa.Column('is_closed', sa.Boolean(), nullable=False, comment='Chu kỳ đã kết thúc bằng một kỳ nổ Jackpot'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('type', 'kind', 'cycle_no', name='uix_jackpot_cycle')
+    )
+    op.create_index(op.f('ix_jackpot_cycles_type'), 'jackpot_cycles', ['type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jackpot_cycles_type'), table_name='jackpot_cycles')
+    op.drop_table('jackpot_cycles')
@@ -0,0 +1,25 @@
+"""add_number_stat_gap_histogram
+
+Revision ID: b7e1c4d92f58
+Revises: e5b2d8f3a6c4
+Create Date: 2026-10-19 12:08:15.402731
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'b7e1c4d92f58'
+down_revision: Union[str, None] = 'e5b2d8f3a6c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('number_stats', sa.Column('gap_histogram', postgresql.ARRAY(sa.INTEGER()), server_default='{}', nullable=False, comment='Số lần số xuất hiện lại sau đúng g kỳ vắng (chỉ số g)'))
+
+
+def downgrade() -> None:
+    op.drop_column('number_stats', 'gap_histogram')
@@ -0,0 +1,46 @@
+"""add_prize_rollups
+
+Revision ID: c9a3f6e0d2b7
+Revises: b7e1c4d92f58
+Create Date: 2026-10-19 12:47:52.861390
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c9a3f6e0d2b7'
+down_revision: Union[str, None] = 'b7e1c4d92f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('prize_rollups',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False, comment='Loại vé: mega645, power655'),
+    sa.Column('period', sa.String(length=10), nullable=False, comment='month hoặc year'),
+    sa.Column('period_start', sa.Date(), nullable=False, comment='Ngày đầu tháng/năm'),
+    sa.Column('draw_count', sa.Integer(), nullable=False),
+    sa.Column('total_payout', sa.BigInteger(), nullable=False, comment='Tổng trả thưởng (VND)'),
+    sa.Column('jackpot_payout', sa.BigInteger(), nullable=False, comment='Tổng Jackpot 1 + 2 đã nổ (VND)'),
+    sa.Column('jackpot_winners', sa.Integer(), nullable=False),
+    sa.Column('jackpot2_winners', sa.Integer(), nullable=False),
+    sa.Column('first_prize_winners', sa.Integer(), nullable=False),
+    sa.Column('second_prize_winners', sa.Integer(), nullable=False),
+    sa.Column('third_prize_winners', sa.Integer(), nullable=False),
+    sa.Column('jackpot_growth_sum', sa.BigInteger(), nullable=False),
+    sa.Column('jackpot_growth_draws', sa.Integer(), nullable=False),
+    sa.Column('max_jackpot', sa.BigInteger(), nullable=True, comment='Jackpot 1 cao nhất trong kỳ'),
+    sa.Column('max_jackpot_won', sa.BigInteger(), nullable=True, comment='Jackpot 1 lớn nhất đã nổ'),
+    sa.Column('max_jackpot_won_period', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('type', 'period', 'period_start', name='uix_prize_rollup')
+    )
+    op.create_index(op.f('ix_prize_rollups_type'), 'prize_rollups', ['type'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_prize_rollups_type'), table_name='prize_rollups')
+    op.drop_table('prize_rollups')
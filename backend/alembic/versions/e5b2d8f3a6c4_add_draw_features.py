@@ -0,0 +1,48 @@
+"""add_draw_features
+
+Revision ID: e5b2d8f3a6c4
+Revises: a4c8e2f71b09
+Create Date: 2026-10-19 11:21:40.538216
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'e5b2d8f3a6c4'
+down_revision: Union[str, None] = 'a4c8e2f71b09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('draw_features',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('draw_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=20), nullable=False, comment='Loại vé: mega645, power655'),
+    sa.Column('draw_period', sa.String(length=20), nullable=False),
+    sa.Column('number_sum', sa.Integer(), nullable=False),
+    sa.Column('odd_count', sa.Integer(), nullable=False),
+    sa.Column('even_count', sa.Integer(), nullable=False),
+    sa.Column('number_range', sa.Integer(), nullable=False, comment='Số lớn nhất - số nhỏ nhất'),
+    sa.Column('decade_histogram', postgresql.ARRAY(sa.INTEGER()), nullable=False, comment='Số lượng bóng theo chục: 1-9, 10-19, ...'),
+    sa.Column('decade_spread', sa.Integer(), nullable=False, comment='Số nhóm chục có bóng'),
+    sa.Column('consecutive_runs', sa.Integer(), nullable=False, comment='Số cụm số liên tiếp (độ dài >= 2)'),
+    sa.Column('max_consecutive', sa.Integer(), nullable=False),
+    sa.Column('bitmask', sa.BigInteger(), nullable=False, comment='Bit n-1 bật nếu có số n'),
+    sa.ForeignKeyConstraint(['draw_id'], ['draw_results.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('draw_id')
+    )
+    op.create_index(op.f('ix_draw_features_type'), 'draw_features', ['type'], unique=False)
+    op.create_index(op.f('ix_draw_features_number_sum'), 'draw_features', ['number_sum'], unique=False)
+    op.create_index(op.f('ix_draw_features_bitmask'), 'draw_features', ['bitmask'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_draw_features_bitmask'), table_name='draw_features')
+    op.drop_index(op.f('ix_draw_features_number_sum'), table_name='draw_features')
+    op.drop_index(op.f('ix_draw_features_type'), table_name='draw_features')
+    op.drop_table('draw_features')
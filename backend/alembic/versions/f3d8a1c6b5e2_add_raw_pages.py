@@ -0,0 +1,45 @@
+"""add_raw_pages
+
+Revision ID: f3d8a1c6b5e2
+Revises: c9a3f6e0d2b7
+Create Date: 2026-10-19 15:02:11.274903
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'f3d8a1c6b5e2'
+down_revision: Union[str, None] = 'c9a3f6e0d2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('raw_pages',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False, comment='SHA-256 của HTML gốc (khử trùng lặp)'),
+    sa.Column('draw_id', sa.Integer(), nullable=True, comment='Kỳ quay bóc tách được từ trang này, NULL nếu bóc tách lỗi'),
+    sa.Column('type', sa.String(length=20), nullable=False, comment='Loại vé: mega645, power655'),
+    sa.Column('draw_period', sa.String(length=20), nullable=True),
+    sa.Column('url', sa.String(length=500), nullable=True),
+    sa.Column('codec', sa.String(length=10), nullable=False, comment='zstd hoặc zlib'),
+    sa.Column('size', sa.Integer(), nullable=False, comment='Kích thước HTML gốc (bytes)'),
+    sa.Column('compressed_size', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False, comment='HTML thô đã nén'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['draw_id'], ['draw_results.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash')
+    )
+    op.create_index(op.f('ix_raw_pages_draw_id'), 'raw_pages', ['draw_id'], unique=False)
+    op.create_index(op.f('ix_raw_pages_type'), 'raw_pages', ['type'], unique=False)
+    op.create_index(op.f('ix_raw_pages_created_at'), 'raw_pages', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_raw_pages_created_at'), table_name='raw_pages')
+    op.drop_index(op.f('ix_raw_pages_type'), table_name='raw_pages')
+    op.drop_index(op.f('ix_raw_pages_draw_id'), table_name='raw_pages')
+    op.drop_table('raw_pages')
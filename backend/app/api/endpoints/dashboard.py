@@ -0,0 +1,28 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_user_optional
+from app.core.cache import cached
+from app.models.user import User
+from app.services.ai_service import present_prediction
+from app.services.dashboard import load_dashboard_snapshot
+
+router = APIRouter()
+
+@router.get("")
+async def read_dashboard(
+    type: str = "mega645",
+    current_user: User | None = Depends(get_current_user_optional)
+) -> Any:
+    """
+    Retrieve the whole dashboard in one round trip: summary, frequency, gaps,
+    co-occurrence, latest prediction, prediction accuracy and the first history page.
+    The snapshot is cached per draw version; Premium gating is applied per request.
+    """
+    snapshot = await cached("dashboard", type, lambda: load_dashboard_snapshot(lottery_type=type))
+    prediction = snapshot["prediction"]
+    return {
+        **snapshot,
+        "prediction": present_prediction(prediction, current_user) if prediction else None,
+    }
@@ -1,25 +1,55 @@
+from datetime import date
 from typing import Any, List
 
-from fastapi import APIRouter
-from app.services.statistics import get_frequency_stats, get_gap_stats, get_summary_stats, get_cooccurrence_stats
+import base64
+
+from fastapi import APIRouter, HTTPException, Response
+from app.core.cache import cached
+from app.services.statistics import get_frequency_stats, get_gap_stats, get_summary_stats, get_cooccurrence_stats, get_window_frequency_stats, get_number_history, lookup_combination, get_distribution_stats, search_draws, get_similar_draws, get_gap_distribution_stats, get_heatmap
+from app.services.stats_engine import MAIN_NUMBERS, get_max_number
+from app.services.pattern_search import SIMILARITY_METRICS
+from app.services.jackpot_cycles import get_cycle_kinds, get_jackpot_cycle_stats
+from app.services.prize_rollups import ROLLUP_PERIODS, get_prize_stats
 
 router = APIRouter()
 
+def parse_numbers(numbers: str, lottery_type: str, count: int | None = None) -> List[int]:
+    """Parse a comma separated number list (e.g. "5,12,23") and validate it for the lottery type."""
+    max_num = get_max_number(lottery_type)
+    try:
+        parsed = [int(n) for n in numbers.split(",") if n.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Numbers must be a comma separated list of integers.")
+    if len(set(parsed)) != len(parsed) or any(n < 1 or n > max_num for n in parsed):
+        raise HTTPException(status_code=400, detail=f"Numbers must be unique and between 1 and {max_num}.")
+    if count is not None and len(parsed) != count:
+        raise HTTPException(status_code=400, detail=f"Must provide exactly {count} numbers.")
+    return parsed
+
 @router.get("/summary")
 async def read_stats_summary(type: str = "mega645") -> Any:
     """
     Retrieve Top 6 most and least frequent numbers.
     Useful for dashboard display blocks.
     """
-    stats = await get_summary_stats(lottery_type=type)
+    stats = await cached("summary", type, lambda: get_summary_stats(lottery_type=type))
     return stats
 
 @router.get("/cooccurrence")
-async def read_cooccurrence_stats(type: str = "mega645") -> Any:
+async def read_cooccurrence_stats(type: str = "mega645", limit: int | None = None, number: int | None = None) -> Any:
     """
     Retrieve Top pairs and triplets that appear together frequently.
+    Served from the materialized co-occurrence tables; `limit` sets N (default 6).
+    With `number`, returns every pair containing that number unless `limit` is given.
     """
-    stats = await get_cooccurrence_stats(lottery_type=type)
+    if limit is None:
+        limit = get_max_number(type) if number is not None else 6
+    top_n = max(limit, 0)
+    stats = await cached(
+        "cooccurrence", type,
+        lambda: get_cooccurrence_stats(lottery_type=type, top_n=top_n, number=number),
+        params=f"{top_n}:{number}",
+    )
     return stats
 
 @router.get("/frequency")
@@ -28,7 +58,7 @@ async def read_number_frequencies(type: str = "mega645") -> Any:
     Retrieve frequency for all numbers.
     Includes Hot/Cold classification based on recent draws.
     """
-    stats = await get_frequency_stats(lottery_type=type)
+    stats = await cached("frequency", type, lambda: get_frequency_stats(lottery_type=type))
     return {"data": stats}
 
 @router.get("/gaps")
@@ -37,5 +67,171 @@ async def read_number_gaps(type: str = "mega645") -> Any:
     Retrieve gap statistics for all numbers.
     Sorted by current_gap descending to easily spot "overdue" numbers.
     """
-    stats = await get_gap_stats(lottery_type=type)
+    stats = await cached("gaps", type, lambda: get_gap_stats(lottery_type=type))
+    return {"data": stats}
+
+@router.get("/gaps/distribution")
+async def read_gap_distribution(type: str = "mega645", number: int | None = None) -> Any:
+    """
+    Retrieve each number's histogram of completed gaps and its survival curve P(gap > g).
+    `gap_survival` is the share of past gaps at least as long as the current one.
+    """
+    if number is not None and not 1 <= number <= get_max_number(type):
+        raise HTTPException(status_code=400, detail=f"Number must be between 1 and {get_max_number(type)} for {type}.")
+    stats = await cached("gap-distribution", type, lambda: get_gap_distribution_stats(lottery_type=type, number=number), params=str(number))
     return {"data": stats}
+
+@router.get("/window")
+async def read_window_frequencies(
+    type: str = "mega645",
+    last: int | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> Any:
+    """
+    Retrieve hot/cold frequency over a window of draws.
+    Either the latest `last` draws (e.g. 20, 50, 100) or a `from_date`..`to_date` range (inclusive).
+    """
+    if last is not None and (from_date or to_date):
+        raise HTTPException(status_code=400, detail="Use either `last` or a date range, not both.")
+    if last is not None and last < 1:
+        raise HTTPException(status_code=400, detail="`last` must be a positive number of draws.")
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="`from_date` must not be after `to_date`.")
+
+    stats = await get_window_frequency_stats(lottery_type=type, last=last, start_date=from_date, end_date=to_date)
+    return stats
+
+@router.get("/jackpot-cycles")
+async def read_jackpot_cycles(type: str = "mega645", kind: str = "jackpot", limit: int = 20) -> Any:
+    """
+    Retrieve jackpot cycle analytics: draws between jackpot wins, per-number
+    frequency inside each cycle and jackpot growth. `kind=jackpot2` is available for power655.
+    """
+    if kind not in get_cycle_kinds(type):
+        raise HTTPException(status_code=400, detail=f"Unsupported cycle kind '{kind}' for {type}.")
+    limit = max(limit, 0)
+    stats = await cached(
+        "jackpot-cycles", type,
+        lambda: get_jackpot_cycle_stats(lottery_type=type, kind=kind, limit=limit),
+        params=f"{kind}:{limit}",
+    )
+    return stats
+
+@router.get("/prizes")
+async def read_prize_stats(type: str = "mega645", period: str = "month", limit: int = 24) -> Any:
+    """
+    Retrieve prize analytics per month or year (`period=year`): total payout, winners per tier,
+    average jackpot growth per draw and the largest jackpots won.
+    """
+    if period not in ROLLUP_PERIODS:
+        raise HTTPException(status_code=400, detail=f"`period` must be one of: {', '.join(ROLLUP_PERIODS)}.")
+    limit = max(limit, 0)
+    stats = await cached(
+        "prizes", type,
+        lambda: get_prize_stats(lottery_type=type, period=period, limit=limit),
+        params=f"{period}:{limit}",
+    )
+    return stats
+
+@router.get("/number/{number}")
+async def read_number_history(number: int, type: str = "mega645") -> Any:
+    """
+    Retrieve one number's appearance timeline, gap series and streaks.
+    `gaps` lists the misses before each appearance, ending with the current open gap.
+    """
+    if not 1 <= number <= get_max_number(type):
+        raise HTTPException(status_code=400, detail=f"Number must be between 1 and {get_max_number(type)} for {type}.")
+    stats = await get_number_history(lottery_type=type, number=number)
+    return stats
+
+@router.get("/lookup")
+async def read_combination_lookup(numbers: str, type: str = "mega645") -> Any:
+    """
+    Check whether a 6-number ticket (e.g. `numbers=5,12,23,31,40,44`) has ever been drawn,
+    and list historic draws that matched 5 or 4 of its numbers.
+    """
+    ticket = parse_numbers(numbers, type, count=MAIN_NUMBERS)
+    return await lookup_combination(lottery_type=type, numbers=ticket)
+
+@router.get("/distribution")
+async def read_distribution_stats(type: str = "mega645") -> Any:
+    """
+    Retrieve observed histograms of ticket sum, odd count and decade spread next to the
+    exact theoretical distribution over all possible tickets (e.g. C(45,6) for mega645).
+    """
+    stats = await cached("distribution", type, lambda: get_distribution_stats(lottery_type=type))
+    return stats
+
+@router.get("/search")
+async def read_draw_search(
+    type: str = "mega645",
+    contains: str | None = None,
+    excludes: str | None = None,
+    min_sum: int | None = None,
+    max_sum: int | None = None,
+    odd_count: int | None = None,
+    from_date: date | None = None,
+    to_date: date | None = None,
+    limit: int = 50,
+) -> Any:
+    """
+    Search historic draws by constraints, e.g. `contains=5,12&excludes=40&min_sum=100&odd_count=3`.
+    All given constraints must hold; results are newest first.
+    """
+    required = parse_numbers(contains, type) if contains else []
+    banned = parse_numbers(excludes, type) if excludes else []
+    if set(required) & set(banned):
+        raise HTTPException(status_code=400, detail="A number cannot be both required and excluded.")
+    if len(required) > MAIN_NUMBERS:
+        raise HTTPException(status_code=400, detail=f"A draw has only {MAIN_NUMBERS} numbers.")
+    if odd_count is not None and not 0 <= odd_count <= MAIN_NUMBERS:
+        raise HTTPException(status_code=400, detail=f"`odd_count` must be between 0 and {MAIN_NUMBERS}.")
+    if min_sum is not None and max_sum is not None and min_sum > max_sum:
+        raise HTTPException(status_code=400, detail="`min_sum` must not be greater than `max_sum`.")
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="`from_date` must not be after `to_date`.")
+
+    return await search_draws(
+        lottery_type=type, contains=required, excludes=banned,
+        min_sum=min_sum, max_sum=max_sum, odd_count=odd_count,
+        start_date=from_date, end_date=to_date, limit=max(limit, 0),
+    )
+
+@router.get("/similar")
+async def read_similar_draws(numbers: str, type: str = "mega645", metric: str = "overlap", limit: int = 10) -> Any:
+    """
+    Retrieve the historic draws closest to a set of numbers (e.g. a favorite ticket),
+    ranked by shared numbers (`metric=overlap`) or Jaccard similarity (`metric=jaccard`).
+    """
+    if metric not in SIMILARITY_METRICS:
+        raise HTTPException(status_code=400, detail=f"`metric` must be one of: {', '.join(SIMILARITY_METRICS)}.")
+    ticket = parse_numbers(numbers, type)
+    if not ticket:
+        raise HTTPException(status_code=400, detail="Provide at least one number.")
+    return await get_similar_draws(lottery_type=type, numbers=ticket, limit=max(limit, 0), metric=metric)
+
+@router.get("/heatmap")
+async def read_heatmap(type: str = "mega645", bucket: int = 1, format: str = "base64") -> Any:
+    """
+    Retrieve the number x draw appearance heatmap as packed bytes.
+    `bucket=1` gives one bit per draw; `bucket=10`/`50` gives per-bucket appearance counts.
+    `format=binary` returns `application/octet-stream`, otherwise JSON with a base64 `data` field.
+    The payload starts with an 18-byte little-endian header: magic "VLHM", version (u8),
+    bits per cell (u8), numbers (u16), columns (u32), draws (u32), bucket (u16),
+    followed by one row per number (bit rows are padded to whole bytes).
+    """
+    if not 1 <= bucket <= 1000:
+        raise HTTPException(status_code=400, detail="`bucket` must be between 1 and 1000 draws.")
+    if format not in ("base64", "binary"):
+        raise HTTPException(status_code=400, detail="`format` must be `base64` or `binary`.")
+
+    heatmap = await get_heatmap(lottery_type=type, bucket=bucket)
+    payload = heatmap.pop("payload")
+    if format == "binary":
+        return Response(
+            content=payload,
+            media_type="application/octet-stream",
+            headers={"X-First-Period": heatmap["first_period"] or "", "X-Last-Period": heatmap["last_period"] or ""},
+        )
+    return {**heatmap, "data": base64.b64encode(payload).decode("ascii")}
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth, users, crawler, stats, predictions, favorites
+from app.api.endpoints import auth, users, crawler, stats, predictions, favorites, dashboard
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -9,3 +9,4 @@ api_router.include_router(favorites.router, prefix="/users/favorites", tags=["fa
 api_router.include_router(crawler.router, prefix="/crawler", tags=["crawler"])
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
 api_router.include_router(predictions.router, prefix="/predictions", tags=["predictions"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
@@ -0,0 +1,120 @@
+"""
+Read-through Redis cache for statistics, versioned by draw ingestion.
+
+Keys embed a per-lottery-type draw version that the crawler bumps whenever it stores a
+new draw, so a new result makes every older entry unreachable at once (the "flush Redis
+on new result" step of the design doc) without scanning keys. Stale versions expire by TTL.
+Concurrent misses for the same key are collapsed: within a process they await one shared
+fill, across processes a short Redis lock elects a single filler while the others poll.
+The lock holds a random token and is released only by its owner (compare-and-delete), so a
+filler that outlived the lock TTL cannot release the lock of the next one.
+If Redis is unavailable the loader is called directly.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = 60 * 60 * 24
+LOCK_TTL_MS = 10_000
+LOCK_POLL_SECONDS = 0.05
+# Delete the lock only if it still holds our token
+RELEASE_LOCK_LUA = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _version_key(lottery_type: str) -> str:
+    return f"stats:version:{lottery_type}"
+
+
+async def get_draw_version(lottery_type: str) -> int:
+    value = await redis_client.get(_version_key(lottery_type))
+    return int(value or 0)
+
+
+async def bump_draw_version(lottery_type: str) -> int | None:
+    """Invalidate every cached statistic of a lottery type by moving to a new version."""
+    try:
+        version = await redis_client.incr(_version_key(lottery_type))
+        logger.info(f"Stats cache version for {lottery_type} bumped to {version}")
+        return version
+    except (RedisError, OSError) as e:
+        logger.warning(f"Could not bump stats cache version for {lottery_type}: {e}")
+        return None
+
+
+async def cached(endpoint: str, lottery_type: str, loader: Callable[[], Awaitable[Any]], params: str = "") -> Any:
+    """Return the cached JSON-compatible result of ``loader`` for (endpoint, type, params, draw version)."""
+    try:
+        version = await get_draw_version(lottery_type)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Stats cache unavailable, reading {endpoint} from DB: {e}")
+        return jsonable_encoder(await loader())
+
+    key = f"stats:{endpoint}:{lottery_type}:v{version}"
+    if params:
+        key = f"{key}:{params}"
+
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await _read_through(key, loader)
+        future.set_result(value)
+        return value
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark retrieved so an unawaited failure does not log "exception was never retrieved"
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _read_through(key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    try:
+        hit = await redis_client.get(key)
+        if hit is not None:
+            return json.loads(hit)
+
+        # Another process may already be filling this key; wait for it instead of hitting the DB
+        while not await redis_client.set(lock_key, token, nx=True, px=LOCK_TTL_MS):
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+            hit = await redis_client.get(key)
+            if hit is not None:
+                return json.loads(hit)
+    except (RedisError, OSError) as e:
+        logger.warning(f"Stats cache read failed for {key}: {e}")
+        return jsonable_encoder(await loader())
+
+    try:
+        value = jsonable_encoder(await loader())
+        try:
+            await redis_client.set(key, json.dumps(value), ex=CACHE_TTL_SECONDS)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Stats cache write failed for {key}: {e}")
+        return value
+    finally:
+        try:
+            await redis_client.eval(RELEASE_LOCK_LUA, 1, lock_key, token)
+        except (RedisError, OSError):
+            pass
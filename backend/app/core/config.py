@@ -19,6 +19,29 @@ class Settings(BaseSettings):
     TELEGRAM_BOT_TOKEN: str = ""
     TELEGRAM_CHAT_ID: str = ""
 
+    # Crawler HTTP client; the base URL can point crawls at a local stand-in site (scripts/standin_site.py)
+    VIETLOTT_BASE_URL: str = "https://vietlott.vn"
+    CRAWLER_HTTP2: bool = False
+    CRAWLER_TIMEOUT_SECONDS: float = 30.0
+    CRAWLER_MAX_CONNECTIONS: int = 10
+    # Bulk crawl engine: parallel fetches and starting / maximum request rate (req/s)
+    CRAWLER_CONCURRENCY: int = 4
+    CRAWLER_RATE: float = 2.0
+    CRAWLER_MAX_RATE: float = 8.0
+    # Bulk crawl pipeline: parser processes (0 = one per CPU core) and rows per DB write batch
+    CRAWLER_PARSE_WORKERS: int = 0
+    CRAWLER_WRITE_BATCH: int = 50
+    # Content-addressed page cache and resume checkpoints of bulk crawls
+    CRAWLER_CACHE_DIR: str = "crawl_cache"
+    # Hours a period the site reported as "not found" is skipped by resumed crawls before it is retried
+    CRAWLER_UNAVAILABLE_TTL_HOURS: int = 24
+    # Polling for new results on draw days (VN time): every N minutes within these hours
+    CRAWLER_POLL_MINUTES: int = 2
+    CRAWLER_POLL_HOURS: str = "18-19"
+    # Raw HTML archive (raw_pages) retention; 0 = unlimited
+    RAW_HTML_RETENTION_DAYS: int = 0
+    RAW_HTML_MAX_PAGES: int = 0
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -0,0 +1,56 @@
+"""
+Shared, pooled HTTP client for crawling vietlott.vn.
+
+One long-lived httpx.AsyncClient keeps connections (and their TLS sessions) alive across
+fetches and persists cookies, so anti-bot redirects that set a cookie are honoured on the
+next request. HTTP/2 is opt-in through CRAWLER_HTTP2 and needs the optional `h2` package.
+"""
+import logging
+
+import httpx
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "vi-VN,vi;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_enabled() -> bool:
+    if not settings.CRAWLER_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("CRAWLER_HTTP2 is set but the 'h2' package is not installed; using HTTP/1.1.")
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide crawler client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=BROWSER_HEADERS,
+            follow_redirects=True,
+            http2=_http2_enabled(),
+            timeout=httpx.Timeout(settings.CRAWLER_TIMEOUT_SECONDS),
+            limits=httpx.Limits(max_connections=settings.CRAWLER_MAX_CONNECTIONS, max_keepalive_connections=settings.CRAWLER_MAX_CONNECTIONS),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -2,12 +2,18 @@ import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from app.services.crawler import run_daily_crawler
+from app.core.config import get_settings
+from app.services.crawler import poll_latest_draw, run_daily_crawler
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 scheduler = AsyncIOScheduler()
 
+# Mega 6/45 draws on Wed/Fri/Sun, Power 6/55 on Tue/Thu/Sat
+DRAW_DAYS = {"mega645": "wed,fri,sun", "power655": "tue,thu,sat"}
+
 def start_scheduler():
     """Builds and starts the APScheduler with predefined cron jobs."""
     # Vietlott draws typically happen around 18:00 - 18:30 VN time
@@ -18,6 +24,23 @@ def start_scheduler():
         id="vietlott_daily_crawler",
         replace_existing=True
     )
+
+    # Poll the latest-result pages on draw evenings; unchanged pages are a conditional GET
+    for lottery_type, days in DRAW_DAYS.items():
+        scheduler.add_job(
+            poll_latest_draw,
+            CronTrigger(
+                day_of_week=days,
+                hour=settings.CRAWLER_POLL_HOURS,
+                minute=f"*/{settings.CRAWLER_POLL_MINUTES}",
+                timezone="Asia/Ho_Chi_Minh",
+            ),
+            args=[lottery_type],
+            id=f"vietlott_poll_{lottery_type}",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
     
     scheduler.start()
     logger.info("Scheduler started successfully. Cron configured for 18:45 VN time.")
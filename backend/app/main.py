@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import get_settings
 from app.api.router import api_router
 from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.http_client import close_http_client
 
 settings = get_settings()
 
@@ -19,6 +20,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     stop_scheduler()
+    await close_http_client()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -3,5 +3,10 @@ from app.models.draw_result import DrawResult
 from app.models.number_stat import NumberStat
 from app.models.ai_prediction import AIPrediction
 from app.models.user_favorite import UserFavorite
+from app.models.cooccurrence import PairCount, TripletCount
+from app.models.jackpot_cycle import JackpotCycle
+from app.models.draw_feature import DrawFeature
+from app.models.prize_rollup import PrizeRollup
+from app.models.raw_page import RawPage
 
-__all__ = ["User", "DrawResult", "NumberStat", "AIPrediction", "UserFavorite"]
+__all__ = ["User", "DrawResult", "NumberStat", "AIPrediction", "UserFavorite", "PairCount", "TripletCount", "JackpotCycle", "DrawFeature", "PrizeRollup", "RawPage"]
@@ -0,0 +1,42 @@
+from sqlalchemy import Integer, String, UniqueConstraint, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PairCount(Base):
+    __tablename__ = "pair_counts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    type: Mapped[str] = mapped_column(String(20), nullable=False, comment="Loại vé: mega645, power655")
+    num_a: Mapped[int] = mapped_column(Integer, nullable=False)
+    num_b: Mapped[int] = mapped_column(Integer, nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('type', 'num_a', 'num_b', name='uix_pair_type_numbers'),
+        Index('ix_pair_counts_type_num_b', 'type', 'num_b'),
+        Index('ix_pair_counts_top', 'type', count.desc(), 'num_a', 'num_b'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PairCount type={self.type} pair=({self.num_a}, {self.num_b}) count={self.count}>"
+
+
+class TripletCount(Base):
+    __tablename__ = "triplet_counts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    type: Mapped[str] = mapped_column(String(20), nullable=False, comment="Loại vé: mega645, power655")
+    num_a: Mapped[int] = mapped_column(Integer, nullable=False)
+    num_b: Mapped[int] = mapped_column(Integer, nullable=False)
+    num_c: Mapped[int] = mapped_column(Integer, nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('type', 'num_a', 'num_b', 'num_c', name='uix_triplet_type_numbers'),
+        Index('ix_triplet_counts_top', 'type', count.desc(), 'num_a', 'num_b', 'num_c'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TripletCount type={self.type} triplet=({self.num_a}, {self.num_b}, {self.num_c}) count={self.count}>"
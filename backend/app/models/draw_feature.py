@@ -0,0 +1,28 @@
+from sqlalchemy import Integer, String, BigInteger, ForeignKey
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class DrawFeature(Base):
+    __tablename__ = "draw_features"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    draw_id: Mapped[int] = mapped_column(ForeignKey("draw_results.id", ondelete="CASCADE"), nullable=False, unique=True)
+    type: Mapped[str] = mapped_column(String(20), nullable=False, index=True, comment="Loại vé: mega645, power655")
+    draw_period: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Derived from the 6 main numbers only (power655 bonus ball excluded)
+    number_sum: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    odd_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    even_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    number_range: Mapped[int] = mapped_column(Integer, nullable=False, comment="Số lớn nhất - số nhỏ nhất")
+    decade_histogram: Mapped[list[int]] = mapped_column(ARRAY(INTEGER), nullable=False, comment="Số lượng bóng theo chục: 1-9, 10-19, ...")
+    decade_spread: Mapped[int] = mapped_column(Integer, nullable=False, comment="Số nhóm chục có bóng")
+    consecutive_runs: Mapped[int] = mapped_column(Integer, nullable=False, comment="Số cụm số liên tiếp (độ dài >= 2)")
+    max_consecutive: Mapped[int] = mapped_column(Integer, nullable=False)
+    bitmask: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True, comment="Bit n-1 bật nếu có số n")
+
+    def __repr__(self) -> str:
+        return f"<DrawFeature period={self.draw_period} type={self.type} sum={self.number_sum} odd={self.odd_count}>"
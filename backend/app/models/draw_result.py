@@ -36,7 +36,8 @@ class DrawResult(Base):
     third_prize_value: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
     third_prize_winners: Mapped[int] = mapped_column(INTEGER, default=0, nullable=False)
     
-    raw_html_log: Mapped[str | None] = mapped_column(Text, nullable=True, comment="HTML thô dự phòng")
+    # Legacy: raw HTML now lives compressed in raw_pages; deferred so draw queries never load it
+    raw_html_log: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True, comment="HTML thô dự phòng")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self) -> str:
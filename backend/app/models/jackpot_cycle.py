@@ -0,0 +1,35 @@
+from datetime import date
+
+from sqlalchemy import Integer, String, Date, BigInteger, Boolean, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class JackpotCycle(Base):
+    __tablename__ = "jackpot_cycles"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    type: Mapped[str] = mapped_column(String(20), nullable=False, index=True, comment="Loại vé: mega645, power655")
+    kind: Mapped[str] = mapped_column(String(20), nullable=False, default="jackpot", comment="jackpot hoặc jackpot2 (chỉ 6/55)")
+    cycle_no: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    start_period: Mapped[str] = mapped_column(String(20), nullable=False)
+    end_period: Mapped[str] = mapped_column(String(20), nullable=False)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    draw_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Appearances of each number (index n - 1) among the main numbers drawn in this cycle
+    number_counts: Mapped[list[int]] = mapped_column(ARRAY(INTEGER), nullable=False)
+    start_jackpot: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    end_jackpot: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    is_closed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, comment="Chu kỳ đã kết thúc bằng một kỳ nổ Jackpot")
+
+    __table_args__ = (
+        UniqueConstraint('type', 'kind', 'cycle_no', name='uix_jackpot_cycle'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<JackpotCycle type={self.type} kind={self.kind} no={self.cycle_no} draws={self.draw_count} closed={self.is_closed}>"
@@ -1,6 +1,7 @@
 from datetime import date
 
 from sqlalchemy import Integer, Date, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -16,6 +17,7 @@ class NumberStat(Base):
     last_seen: Mapped[date | None] = mapped_column(Date, nullable=True)
     max_gap: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     current_gap: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    gap_histogram: Mapped[list[int]] = mapped_column(ARRAY(INTEGER), default=list, server_default="{}", nullable=False, comment="Số lần số xuất hiện lại sau đúng g kỳ vắng (chỉ số g)")
     
     __table_args__ = (
         UniqueConstraint('number', 'type', name='uix_number_type'),
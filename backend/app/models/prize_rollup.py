@@ -0,0 +1,38 @@
+from datetime import date
+
+from sqlalchemy import Integer, String, Date, BigInteger, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class PrizeRollup(Base):
+    __tablename__ = "prize_rollups"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    type: Mapped[str] = mapped_column(String(20), nullable=False, index=True, comment="Loại vé: mega645, power655")
+    period: Mapped[str] = mapped_column(String(10), nullable=False, comment="month hoặc year")
+    period_start: Mapped[date] = mapped_column(Date, nullable=False, comment="Ngày đầu tháng/năm")
+    draw_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    total_payout: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False, comment="Tổng trả thưởng (VND)")
+    jackpot_payout: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False, comment="Tổng Jackpot 1 + 2 đã nổ (VND)")
+    jackpot_winners: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    jackpot2_winners: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    first_prize_winners: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    second_prize_winners: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    third_prize_winners: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Jackpot 1 increase between consecutive draws without a win, for the average growth per draw
+    jackpot_growth_sum: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    jackpot_growth_draws: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_jackpot: Mapped[int | None] = mapped_column(BigInteger, nullable=True, comment="Jackpot 1 cao nhất trong kỳ")
+    max_jackpot_won: Mapped[int | None] = mapped_column(BigInteger, nullable=True, comment="Jackpot 1 lớn nhất đã nổ")
+    max_jackpot_won_period: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('type', 'period', 'period_start', name='uix_prize_rollup'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PrizeRollup type={self.type} {self.period}={self.period_start} payout={self.total_payout}>"
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Integer, String, LargeBinary, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class RawPage(Base):
+    __tablename__ = "raw_pages"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, comment="SHA-256 của HTML gốc (khử trùng lặp)")
+    draw_id: Mapped[int | None] = mapped_column(ForeignKey("draw_results.id", ondelete="SET NULL"), nullable=True, index=True, comment="Kỳ quay bóc tách được từ trang này, NULL nếu bóc tách lỗi")
+    type: Mapped[str] = mapped_column(String(20), nullable=False, index=True, comment="Loại vé: mega645, power655")
+    draw_period: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    codec: Mapped[str] = mapped_column(String(10), nullable=False, comment="zstd hoặc zlib")
+    size: Mapped[int] = mapped_column(Integer, nullable=False, comment="Kích thước HTML gốc (bytes)")
+    compressed_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, comment="HTML thô đã nén")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    def __repr__(self) -> str:
+        return f"<RawPage type={self.type} period={self.draw_period} {self.codec} {self.compressed_size}/{self.size}B>"
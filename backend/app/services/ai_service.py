@@ -2,10 +2,12 @@ import logging
 import os
 import json
 import numpy as np
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
 from app.core.database import async_session
 from app.models.ai_prediction import AIPrediction
 from app.models.draw_result import DrawResult
+from app.models.draw_feature import DrawFeature
+from app.models.user import User, UserRole
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +28,17 @@ def get_model_path(lottery_type: str, model_name: str, ext: str):
 
 async def get_recent_sequences(db, length=10, lottery_type: str = "mega645"):
     result = await db.execute(
-        select(DrawResult)
+        select(DrawResult, DrawFeature)
+        .outerjoin(DrawFeature, DrawFeature.draw_id == DrawResult.id)
         .where(DrawResult.type == lottery_type)
         .order_by(desc(DrawResult.draw_date))
         .limit(length)
     )
-    draws = result.scalars().all()
-    if not draws or len(draws) < length:
+    rows = result.all()
+    if not rows or len(rows) < length:
         return None, None, None
-    draws = list(reversed(draws))
+    latest_features = rows[0][1]
+    draws = [r[0] for r in reversed(rows)]
     
     max_num = 55 if lottery_type == "power655" else 45
     encoded = []
@@ -51,8 +55,11 @@ async def get_recent_sequences(db, length=10, lottery_type: str = "mega645"):
     vec_rf = np.zeros(max_num)
     for num in last_draw:
         if 1 <= num <= max_num: vec_rf[num - 1] = 1.0
-    t_sum = sum(last_draw)
-    odd_count = sum(1 for n in last_draw if n % 2 != 0)
+    if latest_features is not None:
+        t_sum, odd_count = latest_features.number_sum, latest_features.odd_count
+    else:
+        t_sum = sum(last_draw)
+        odd_count = sum(1 for n in last_draw if n % 2 != 0)
     rf_features = np.concatenate([vec_rf, [t_sum, odd_count]])
     
     return np.array([encoded]), np.array([rf_features]), last_draw
@@ -217,3 +224,100 @@ async def verify_prediction(draw_period: str, actual_numbers: list[int], lottery
     except Exception as e:
         logger.error(f"Failed to verify prediction for period {draw_period}: {e}")
         return None
+
+def prediction_to_dict(prediction: AIPrediction) -> dict:
+    """Full, ungated representation of a prediction (safe to cache; gate with present_prediction)."""
+    return {
+        "target_period": prediction.target_period,
+        "type": prediction.type,
+        "predicted_numbers": prediction.predicted_numbers,
+        "prediction_sets": prediction.prediction_sets or [],
+        "confidence": prediction.confidence,
+        "is_premium_only": prediction.is_premium_only,
+        "is_verified": prediction.is_verified,
+        "matches": prediction.matches,
+    }
+
+def present_prediction(data: dict, current_user: User | None) -> dict:
+    """Apply Premium gating to a prediction_to_dict payload for the requesting user."""
+    is_premium_user = current_user and current_user.role in [UserRole.PREMIUM, UserRole.ADMIN]
+
+    if data["is_premium_only"] and not is_premium_user:
+        return {
+            "target_period": data["target_period"],
+            "type": data["type"],
+            "predicted_numbers": data["predicted_numbers"][:3] + ["?", "?", "?"],
+            "prediction_sets": [],
+            "confidence": "Premium Only",
+            "message": "Upgrade to Premium to unlock the full AI predicted sequence and confidence rating."
+        }
+
+    return {
+        "target_period": data["target_period"],
+        "type": data["type"],
+        "predicted_numbers": data["predicted_numbers"],
+        "prediction_sets": data["prediction_sets"],
+        "confidence": data["confidence"],
+        "is_verified": data["is_verified"],
+        "matches": data["matches"],
+        "message": "AI sequence unlocked. Good luck!"
+    }
+
+async def get_latest_prediction(db, lottery_type: str = "mega645") -> AIPrediction | None:
+    result = await db.execute(
+        select(AIPrediction)
+        .where(AIPrediction.type == lottery_type)
+        .order_by(desc(AIPrediction.target_period))
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+async def get_prediction_accuracy_stats(db, lottery_type: str = "mega645", limit: int = 50) -> dict:
+    """Accuracy stats for verified predictions, joined with the actual draw numbers."""
+    counts = await db.execute(
+        select(
+            func.count(AIPrediction.id),
+            func.count(AIPrediction.id).filter(AIPrediction.is_verified == True),
+        )
+        .where(AIPrediction.type == lottery_type)
+    )
+    total, verified_count = counts.one()
+
+    if not verified_count:
+        return {
+            "total_predictions": total or 0,
+            "verified_count": 0,
+            "avg_matches": 0,
+            "history": []
+        }
+
+    result = await db.execute(
+        select(AIPrediction, DrawResult.numbers)
+        .outerjoin(
+            DrawResult,
+            (AIPrediction.target_period == DrawResult.draw_period) & (AIPrediction.type == DrawResult.type)
+        )
+        .where((AIPrediction.is_verified == True) & (AIPrediction.type == lottery_type))
+        .order_by(desc(AIPrediction.target_period))
+        .limit(limit)
+    )
+    verified_data = result.all()
+
+    avg_matches = sum((p.AIPrediction.matches or 0) for p in verified_data) / len(verified_data) if verified_data else 0
+
+    return {
+        "total_predictions": total,
+        "verified_count": verified_count,
+        "avg_matches": round(avg_matches, 2),
+        "history": [
+            {
+                "period": p.AIPrediction.target_period,
+                "predicted": p.AIPrediction.predicted_numbers,
+                "prediction_sets": p.AIPrediction.prediction_sets or [],
+                "matches": p.AIPrediction.matches,
+                "confidence": p.AIPrediction.confidence,
+                "actual": p.numbers
+            }
+            for p in verified_data
+        ]
+    }
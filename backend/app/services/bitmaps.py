@@ -0,0 +1,74 @@
+"""
+Run-length encoded appearance bitmaps.
+
+A bitmap over draw indices is stored as sorted, disjoint runs of set bits
+(start, length). A number appearing in ~13% of draws needs a couple of KB for the
+whole history, and appearance timelines, gap series and streaks fall straight out
+of the runs without touching the draw rows.
+"""
+import numpy as np
+
+
+class RunBitmap:
+    __slots__ = ("starts", "lengths", "size")
+
+    def __init__(self):
+        self.starts = np.zeros(0, dtype=np.uint32)
+        self.lengths = np.zeros(0, dtype=np.uint32)
+        self.size = 0  # number of bits (draws) covered, set or not
+
+    @staticmethod
+    def _runs(bits: np.ndarray):
+        """(starts, lengths) of the runs of True in a bool vector."""
+        edges = np.diff(np.concatenate([[0], bits.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return starts, ends - starts
+
+    @classmethod
+    def from_bools(cls, bits: np.ndarray) -> "RunBitmap":
+        bitmap = cls()
+        bitmap.extend(bits)
+        return bitmap
+
+    def extend(self, bits: np.ndarray) -> None:
+        """Append bits for the next draws, merging with the last run when it is contiguous."""
+        starts, lengths = self._runs(np.asarray(bits, dtype=bool))
+        starts = starts + self.size
+        if len(starts) and len(self.starts) and int(self.starts[-1]) + int(self.lengths[-1]) == starts[0]:
+            self.lengths[-1] += lengths[0]
+            starts, lengths = starts[1:], lengths[1:]
+        self.starts = np.concatenate([self.starts, starts.astype(np.uint32)])
+        self.lengths = np.concatenate([self.lengths, lengths.astype(np.uint32)])
+        self.size += len(bits)
+
+    def __len__(self) -> int:
+        """Number of set bits."""
+        return int(self.lengths.sum())
+
+    @property
+    def nbytes(self) -> int:
+        return self.starts.nbytes + self.lengths.nbytes
+
+    def positions(self) -> np.ndarray:
+        """Indices of the set bits, ascending."""
+        if not len(self.starts):
+            return np.zeros(0, dtype=np.int64)
+        lengths = self.lengths.astype(np.int64)
+        # Offset of every bit inside its run, added to the run start
+        run_offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(self.starts.astype(np.int64), lengths) + (np.arange(lengths.sum()) - run_offsets)
+
+    def gaps(self) -> np.ndarray:
+        """
+        Misses before each appearance (the first entry counts from draw 0), followed by the
+        current open gap since the last appearance.
+        """
+        pos = self.positions()
+        bounded = np.concatenate([[-1], pos, [self.size]])
+        return np.diff(bounded) - 1
+
+    def streaks(self, min_length: int = 2):
+        """Runs of consecutive appearances at least ``min_length`` draws long, as (start, length)."""
+        mask = self.lengths >= min_length
+        return self.starts[mask], self.lengths[mask]
@@ -0,0 +1,57 @@
+"""
+Hash index of historic draw combinations.
+
+Every draw's main numbers are packed into a 64-bit key (bit n - 1 set for number n).
+The index maps the key of the full 6-number set and of each of its 5- and 4-subsets
+to the draws containing it, so "has this ticket ever been drawn, and how close have
+draws come" is answered with 1 + 6 + 15 dict probes instead of a scan over DrawResult.
+"""
+import itertools
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence
+
+from app.services.stats_engine import MAIN_NUMBERS
+
+SUBSET_SIZES = (MAIN_NUMBERS, MAIN_NUMBERS - 1, MAIN_NUMBERS - 2)
+
+
+def pack_numbers(numbers: Iterable[int]) -> int:
+    key = 0
+    for n in numbers:
+        key |= 1 << (n - 1)
+    return key
+
+
+def unpack_numbers(key: int) -> List[int]:
+    return [i + 1 for i in range(key.bit_length()) if key >> i & 1]
+
+
+class CombinationIndex:
+    def __init__(self):
+        # subset size -> packed subset key -> draw indices containing that subset
+        self.keys: Dict[int, Dict[int, List[int]]] = {size: defaultdict(list) for size in SUBSET_SIZES}
+
+    def add(self, draw_index: int, numbers: Sequence[int]) -> None:
+        main = sorted(set(numbers[:MAIN_NUMBERS]))
+        if len(main) != MAIN_NUMBERS:
+            return
+        for size in SUBSET_SIZES:
+            for subset in itertools.combinations(main, size):
+                self.keys[size][pack_numbers(subset)].append(draw_index)
+
+    def lookup(self, ticket: Sequence[int]) -> Dict[int, List[int]]:
+        """
+        Draw indices sharing exactly 6, 5 or 4 numbers with a 6-number ticket, keyed by match count.
+        A draw sharing k numbers shows up under C(k, s) probed s-subsets, so higher tiers are removed.
+        """
+        ticket = sorted(set(ticket))
+        found: Dict[int, List[int]] = {}
+        seen = set()
+        for size in SUBSET_SIZES:
+            hits = set()
+            for subset in itertools.combinations(ticket, size):
+                hits.update(self.keys[size].get(pack_numbers(subset), ()))
+            hits -= seen
+            found[size] = sorted(hits)
+            seen |= hits
+        return found
@@ -0,0 +1,76 @@
+"""
+Exact distributions of ticket features over every k-number combination of 1..max_num.
+
+Counts come from dynamic programming over the numbers (or decade groups) rather than
+enumerating the C(max_num, k) tickets: C(55, 6) is ~29M combinations, while each table
+below is filled in well under a millisecond. Results depend only on the game spec and
+are cached per (max_num, k).
+"""
+from functools import lru_cache
+from math import comb
+from typing import Dict
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def sum_distribution(max_num: int, k: int) -> np.ndarray:
+    """counts[s] = number of k-subsets of 1..max_num whose numbers add up to s."""
+    max_sum = sum(range(max_num - k + 1, max_num + 1))
+    # ways[j, s]: j numbers chosen among those processed so far, with total s
+    ways = np.zeros((k + 1, max_sum + 1), dtype=np.int64)
+    ways[0, 0] = 1
+    for n in range(1, max_num + 1):
+        # Descending j so each number is used at most once (0/1 knapsack)
+        for j in range(min(n, k), 0, -1):
+            ways[j, n:] += ways[j - 1, :max_sum + 1 - n]
+    counts = ways[k]
+    counts.flags.writeable = False
+    return counts
+
+
+@lru_cache(maxsize=None)
+def odd_count_distribution(max_num: int, k: int) -> np.ndarray:
+    """counts[i] = number of k-subsets of 1..max_num containing exactly i odd numbers."""
+    ways = np.zeros((k + 1, k + 1), dtype=np.int64)  # ways[j, i]: j chosen, i of them odd
+    ways[0, 0] = 1
+    for n in range(1, max_num + 1):
+        odd = n % 2
+        for j in range(min(n, k), 0, -1):
+            if odd:
+                ways[j, 1:] += ways[j - 1, :-1]
+            else:
+                ways[j] += ways[j - 1]
+    counts = ways[k]
+    counts.flags.writeable = False
+    return counts
+
+
+def decade_groups(max_num: int) -> list[int]:
+    """Size of each decade bucket (n // 10): 1-9, 10-19, ... as used by draw_features."""
+    return np.bincount(np.arange(1, max_num + 1) // 10).tolist()
+
+
+@lru_cache(maxsize=None)
+def decade_spread_distribution(max_num: int, k: int) -> np.ndarray:
+    """counts[d] = number of k-subsets of 1..max_num touching exactly d decade buckets."""
+    groups = decade_groups(max_num)
+    # ways[j, d]: j numbers chosen from the buckets processed so far, spread over d of them
+    ways = np.zeros((k + 1, len(groups) + 1), dtype=np.int64)
+    ways[0, 0] = 1
+    for size in groups:
+        nxt = ways.copy()  # taking nothing from this bucket
+        for t in range(1, min(size, k) + 1):
+            nxt[t:, 1:] += comb(size, t) * ways[:k + 1 - t, :-1]
+        ways = nxt
+    counts = ways[k]
+    counts.flags.writeable = False
+    return counts
+
+
+def combination_distributions(max_num: int, k: int) -> Dict[str, np.ndarray]:
+    return {
+        "sum": sum_distribution(max_num, k),
+        "odd_count": odd_count_distribution(max_num, k),
+        "decade_spread": decade_spread_distribution(max_num, k),
+    }
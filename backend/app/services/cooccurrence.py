@@ -0,0 +1,109 @@
+import logging
+import itertools
+from typing import Dict, List, Any, Sequence
+
+import numpy as np
+from sqlalchemy import select, delete, desc, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.draw_result import DrawResult
+from app.models.cooccurrence import PairCount, TripletCount
+from app.services.stats_engine import MAIN_NUMBERS, build_draw_matrix, get_max_number, pair_counts, triplet_counts
+
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK = 5000
+
+async def _rebuild_cooccurrence(db: AsyncSession, lottery_type: str) -> tuple:
+    result = await db.execute(
+        select(DrawResult.numbers).where(DrawResult.type == lottery_type)
+    )
+    matrix = build_draw_matrix(result.scalars().all(), get_max_number(lottery_type), width=MAIN_NUMBERS)
+
+    pair_rows = [
+        {"type": lottery_type, "num_a": int(a) + 1, "num_b": int(b) + 1, "count": int(c)}
+        for a, b, c in _nonzero_cells(pair_counts(matrix))
+    ]
+    triplet_rows = [
+        {"type": lottery_type, "num_a": int(a) + 1, "num_b": int(b) + 1, "num_c": int(c) + 1, "count": int(n)}
+        for a, b, c, n in _nonzero_cells(triplet_counts(matrix))
+    ]
+
+    await db.execute(delete(PairCount).where(PairCount.type == lottery_type))
+    await db.execute(delete(TripletCount).where(TripletCount.type == lottery_type))
+    for model, rows in ((PairCount, pair_rows), (TripletCount, triplet_rows)):
+        for start in range(0, len(rows), INSERT_CHUNK):
+            await db.execute(insert(model), rows[start:start + INSERT_CHUNK])
+    return len(pair_rows), len(triplet_rows)
+
+async def rebuild_cooccurrence(lottery_type: str = "mega645") -> None:
+    """Recount every pair/triplet of a lottery type from the full draw history."""
+    try:
+        async with async_session() as db:
+            pairs, triplets = await _rebuild_cooccurrence(db, lottery_type)
+            await db.commit()
+            logger.info(f"Rebuilt co-occurrence tables for {lottery_type}: {pairs} pairs, {triplets} triplets.")
+
+    except Exception as e:
+        logger.error(f"Error rebuilding co-occurrence tables for {lottery_type}: {e}")
+
+def _nonzero_cells(counts: np.ndarray):
+    coords = np.nonzero(counts)
+    return zip(*coords, counts[coords])
+
+async def add_draw_cooccurrence(db: AsyncSession, lottery_type: str, numbers: Sequence[int]) -> None:
+    """
+    Add one newly ingested draw's 15 pairs and 20 triplets to the materialized counts.
+    Runs inside the caller's session so the counts commit together with the DrawResult.
+    Empty tables for the type (never built, e.g. right after the migration) are rebuilt
+    in-session from the whole history instead, so the increment never lands on a partial count.
+    """
+    has_counts = await db.execute(select(PairCount.id).where(PairCount.type == lottery_type).limit(1))
+    if has_counts.scalar_one_or_none() is None:
+        await db.flush()
+        await _rebuild_cooccurrence(db, lottery_type)
+        return
+
+    nums = sorted(set(numbers[:MAIN_NUMBERS]))
+
+    pair_stmt = insert(PairCount).values([
+        {"type": lottery_type, "num_a": a, "num_b": b, "count": 1}
+        for a, b in itertools.combinations(nums, 2)
+    ])
+    pair_stmt = pair_stmt.on_conflict_do_update(
+        index_elements=["type", "num_a", "num_b"],
+        set_={"count": PairCount.count + pair_stmt.excluded.count},
+    )
+
+    triplet_stmt = insert(TripletCount).values([
+        {"type": lottery_type, "num_a": a, "num_b": b, "num_c": c, "count": 1}
+        for a, b, c in itertools.combinations(nums, 3)
+    ])
+    triplet_stmt = triplet_stmt.on_conflict_do_update(
+        index_elements=["type", "num_a", "num_b", "num_c"],
+        set_={"count": TripletCount.count + triplet_stmt.excluded.count},
+    )
+
+    await db.execute(pair_stmt)
+    await db.execute(triplet_stmt)
+
+async def get_top_pairs(db: AsyncSession, lottery_type: str, limit: int = 6, number: int | None = None) -> List[Dict[str, Any]]:
+    """Top pairs by count from the index, optionally only pairs containing ``number``."""
+    query = select(PairCount).where(PairCount.type == lottery_type)
+    if number is not None:
+        query = query.where(or_(PairCount.num_a == number, PairCount.num_b == number))
+    result = await db.execute(
+        query.order_by(desc(PairCount.count), PairCount.num_a, PairCount.num_b).limit(limit)
+    )
+    return [{"numbers": [p.num_a, p.num_b], "count": p.count} for p in result.scalars().all()]
+
+async def get_top_triplets(db: AsyncSession, lottery_type: str, limit: int = 6) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(TripletCount)
+        .where(TripletCount.type == lottery_type)
+        .order_by(desc(TripletCount.count), TripletCount.num_a, TripletCount.num_b, TripletCount.num_c)
+        .limit(limit)
+    )
+    return [{"numbers": [t.num_a, t.num_b, t.num_c], "count": t.count} for t in result.scalars().all()]
@@ -0,0 +1,198 @@
+"""
+Concurrent crawl engine for bulk Vietlott backfills.
+
+Pages are fetched through the shared keep-alive client by a bounded number of workers,
+paced by a token bucket whose rate adapts to what the site tells us: it creeps up while
+responses are fast and clean, and backs off multiplicatively on slow responses, errors,
+429/503 throttling (honouring Retry-After) and redirect-to-latest symptoms.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Tuple, TypeVar
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+THROTTLED_STATUSES = (429, 503)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int  # 0 when the request failed before a response
+    html: str
+    elapsed: float
+    redirected: bool = False  # ended on a different URL, e.g. Vietlott serving the latest draw
+    retry_after: float | None = None
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400 and not self.redirected
+
+
+async def fetch_page(url: str) -> FetchResult:
+    started = time.monotonic()
+    try:
+        response = await get_http_client().get(url)
+    except httpx.HTTPError as e:
+        logger.warning(f"Error fetching {url}: {e}")
+        return FetchResult(url, 0, "", time.monotonic() - started)
+
+    retry_after = response.headers.get("Retry-After")
+    return FetchResult(
+        url=url,
+        status=response.status_code,
+        html=response.text,
+        elapsed=time.monotonic() - started,
+        redirected=bool(response.history) and str(response.url) != url,
+        retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+    )
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket (requests/second) whose rate grows by 5% per fast, clean response and is cut
+    on slow responses (x0.9), errors (x0.8), redirect-to-latest pages (x0.8) and throttling (x0.5).
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        min_rate: float = 0.2,
+        max_rate: float = 10.0,
+        target_latency: float = 2.0,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        burst = max(1.0, self.rate)
+        self._tokens = min(burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def _set_rate(self, rate: float) -> None:
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+    def record_success(self, latency: float) -> None:
+        if latency > self.target_latency:
+            self._set_rate(self.rate * 0.9)
+        else:
+            self._set_rate(self.rate * 1.05)
+
+    def record_error(self) -> None:
+        self._set_rate(self.rate * 0.8)
+
+    def record_redirect(self) -> None:
+        self._set_rate(self.rate * 0.8)
+
+    def record_throttled(self, retry_after: float | None = None) -> None:
+        self._set_rate(self.rate * 0.5)
+        self._tokens = 0.0
+        pause = retry_after if retry_after is not None else 1.0 / self.rate
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        logger.warning(f"Throttled by server; rate lowered to {self.rate:.2f} req/s, pausing {pause:.1f}s")
+
+
+class CrawlEngine:
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        limiter: AdaptiveRateLimiter | None = None,
+        max_retries: int = 3,
+    ):
+        self.concurrency = concurrency or settings.CRAWLER_CONCURRENCY
+        self.limiter = limiter or AdaptiveRateLimiter(
+            rate=settings.CRAWLER_RATE, max_rate=settings.CRAWLER_MAX_RATE
+        )
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def fetch(self, url: str) -> FetchResult:
+        """Fetch one page under the concurrency and rate limits, retrying throttled and failed requests."""
+        result = None
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                await self.limiter.acquire()
+                result = await fetch_page(url)
+
+            if result.status in THROTTLED_STATUSES:
+                self.limiter.record_throttled(result.retry_after)
+            elif result.status == 0 or result.status >= 500:
+                self.limiter.record_error()
+                if attempt < self.max_retries:
+                    await asyncio.sleep(min(2 ** attempt, 30))
+            else:
+                if result.redirected:
+                    self.limiter.record_redirect()
+                else:
+                    self.limiter.record_success(result.elapsed)
+                return result
+
+        logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts (HTTP {result.status})")
+        return result
+
+    def report_redirect(self) -> None:
+        """Called by parsers that detect a redirect-to-latest page served under the requested URL."""
+        self.limiter.record_redirect()
+
+    async def imap(
+        self, items: Iterable[T], worker: Callable[[T], Awaitable[R]]
+    ) -> AsyncIterator[Tuple[T, R]]:
+        """
+        Run ``worker`` over ``items`` concurrently and yield (item, result) as each completes.
+        A worker exception is yielded as the result (like gather(return_exceptions=True)).
+        At most 2 x concurrency workers are pending at a time; consuming the results in one task
+        keeps shared resources such as a DB session single-threaded.
+        """
+        pending = {}  # task -> item
+        items = iter(items)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < 2 * self.concurrency:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[asyncio.ensure_future(worker(item))] = item
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = pending.pop(task)
+                    yield item, task.exception() or task.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,215 @@
+"""
+Staged pipeline for bulk crawls of draw detail pages.
+
+fetch (CrawlEngine workers on the event loop) -> bounded queue -> parse (lxml/bs4 in a
+ProcessPoolExecutor, one in-flight page per worker process) -> bounded queue -> batches
+handed to the caller, which writes them to the DB. Every queue is bounded, so a slow
+writer stalls the parsers and a slow parser stage stalls the fetchers: memory stays flat
+no matter how many periods are crawled, and parsing uses every core instead of blocking
+the event loop between fetches.
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Tuple
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.services.crawl_engine import CrawlEngine, FetchResult
+from app.services.crawl_state import CrawlCheckpoint, PageCache
+from app.services.draw_writer import DrawBatchWriter
+from app.services.period_gaps import find_missing_ranges, range_periods
+from app.services.vietlott_parser import parse_vietlott_results
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# (period, parsed draw | None when the page has no such draw | the exception raised)
+CrawledDraw = Tuple[str, Dict | None | Exception]
+
+_DONE = object()
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def parse_workers() -> int:
+    return settings.CRAWLER_PARSE_WORKERS or os.cpu_count() or 1
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool shared by bulk crawls, started on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=parse_workers())
+    return _pool
+
+
+def close_parse_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def parse_detail_page(html: str, lottery_type: str) -> Dict | None:
+    """Runs in a pool worker: None for "not found" pages, else the parsed draw."""
+    if "không tìm thấy" in html.lower():
+        return None
+    return parse_vietlott_results(html, lottery_type)
+
+
+class RedirectedPage(ValueError):
+    """The site answered with another period's page (unknown id or throttling); worth retrying."""
+
+
+async def crawl_draw_pages(
+    engine: CrawlEngine,
+    periods: Iterable[str],
+    url_for: Callable[[str], str],
+    lottery_type: str,
+    batch_size: int | None = None,
+    cache: PageCache | None = None,
+    offline: bool = False,
+) -> AsyncIterator[List[CrawledDraw]]:
+    """
+    Fetch and parse the detail page of each zero-padded period, yielding results in batches of
+    up to ``batch_size`` in completion order. Pages that come back for another period (Vietlott
+    serves the latest draw for unknown or throttled ids) are reported to the engine and yield
+    RedirectedPage. With a ``cache``, cached pages are read from disk and fetched pages are
+    stored once validated; ``offline`` never touches the network.
+    """
+    batch_size = batch_size or settings.CRAWLER_WRITE_BATCH
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    n_parsers = parse_workers()
+    fetched: asyncio.Queue = asyncio.Queue(maxsize=2 * engine.concurrency)
+    parsed: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+
+    async def fetch(period: str) -> FetchResult:
+        url = url_for(period)
+        if cache is not None:
+            html = await asyncio.to_thread(cache.get, url)
+            if html is not None:
+                return FetchResult(url, 200, html, 0.0, from_cache=True)
+        if offline:
+            return FetchResult(url, 0, "", 0.0)
+        return await engine.fetch(url)
+
+    async def fetch_stage():
+        try:
+            async for period, page in engine.imap(periods, fetch):
+                await fetched.put((period, page))
+        except Exception as e:
+            logger.error(f"Fetch stage failed: {e}")
+        for _ in range(n_parsers):
+            await fetched.put(_DONE)
+
+    async def parse_stage():
+        while (entry := await fetched.get()) is not _DONE:
+            period, page = entry
+            if isinstance(page, Exception):
+                outcome = page
+            elif offline and not page.from_cache:
+                outcome = ValueError(f"{page.url} is not in the page cache")
+            elif not page.ok:
+                outcome = ValueError(f"HTTP {page.status} for {page.url}")
+            else:
+                try:
+                    outcome = await loop.run_in_executor(pool, parse_detail_page, page.html, lottery_type)
+                except Exception as e:
+                    outcome = e
+            if isinstance(outcome, dict) and outcome["draw_period"] != period:
+                engine.report_redirect()
+                outcome = RedirectedPage(f"Requested {period} but got {outcome['draw_period']}")
+            # Only pages that parsed into the requested draw are cached; "not found", redirected and
+            # unparseable (anti-bot, interstitial) pages must be fetched again on the next run
+            if cache is not None and isinstance(outcome, dict) and not page.from_cache:
+                await asyncio.to_thread(cache.put, page.url, page.html, lottery_type)
+            await parsed.put((period, outcome))
+        await parsed.put(_DONE)
+
+    tasks = [asyncio.create_task(fetch_stage())]
+    tasks += [asyncio.create_task(parse_stage()) for _ in range(n_parsers)]
+    try:
+        batch = []
+        finished = 0
+        while finished < n_parsers:
+            entry = await parsed.get()
+            if entry is _DONE:
+                finished += 1
+                continue
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def crawl_missing_periods(
+    lottery_type: str,
+    first: int,
+    last: int,
+    url_for: Callable[[str], str],
+    engine: CrawlEngine | None = None,
+    offline: bool = False,
+    retry_unavailable: bool = False,
+) -> Dict[str, int]:
+    """
+    Backfill the periods of [first, last] missing from draw_results: gap detection, the staged
+    fetch/parse pipeline over the local page cache and batched writes. Progress is checkpointed
+    per (type, first, last) after every batch, so an interrupted run resumes with the periods
+    still missing. Periods the site reported as not found are skipped until
+    CRAWLER_UNAVAILABLE_TTL_HOURS have passed (or always retried with ``retry_unavailable``).
+    """
+    engine = engine or CrawlEngine()
+    checkpoint = CrawlCheckpoint.load(lottery_type, first, last)
+    if checkpoint.status == "running":
+        logger.info(
+            f"Resuming {lottery_type} crawl {first}-{last}; the interrupted run processed "
+            f"{checkpoint.processed}/{checkpoint.total} periods"
+        )
+    skip = set() if retry_unavailable else checkpoint.skipped_unavailable()
+
+    async with async_session() as db:
+        gaps = await find_missing_ranges(db, lottery_type, first, last)
+        periods = [p for p in range_periods(gaps) if p not in skip]
+        logger.info(
+            f"Crawling {len(periods)} missing {lottery_type} periods in {len(gaps)} gaps "
+            f"with {engine.concurrency} fetchers{' (offline)' if offline else ''}"
+        )
+        checkpoint.start_run(len(periods))
+        checkpoint.save()
+
+        writer = DrawBatchWriter(db, lottery_type)
+        async for batch in crawl_draw_pages(engine, periods, url_for, lottery_type, cache=PageCache(), offline=offline):
+            for period, outcome in batch:
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error crawling {lottery_type} {period}: {outcome}")
+                    checkpoint.failed.add(period)
+                    continue
+                if outcome is None:
+                    logger.warning(f"Period {period} not found. Skipping.")
+                    checkpoint.mark_unavailable(period)
+                    checkpoint.failed.discard(period)
+                    continue
+                writer.add(outcome)
+                checkpoint.failed.discard(period)
+                checkpoint.unavailable.pop(period, None)
+            added = await writer.flush()
+            checkpoint.processed += len(batch)
+            checkpoint.inserted += len(added)
+            checkpoint.save()
+            logger.info(f"Added {len(added)} {lottery_type} draws ({checkpoint.processed}/{checkpoint.total} processed)")
+
+    checkpoint.status = "done" if not checkpoint.failed and not writer.failed else "incomplete"
+    checkpoint.save()
+    summary = {**writer.summary(), "unavailable": len(checkpoint.unavailable), "errors": len(checkpoint.failed)}
+    logger.info(f"Draw writes for {lottery_type}: {summary}")
+    return summary
@@ -0,0 +1,141 @@
+"""
+Local, on-disk crawl state: a content-addressed page cache and per-range checkpoints.
+
+Cached pages live under CRAWLER_CACHE_DIR as compressed objects named by the SHA-256 of
+the HTML (objects/ab/<hash>.<codec>), with a small JSON index entry per URL
+(urls/cd/<sha256(url)>.json) pointing at the object. Identical pages share one object,
+pages survive DB restarts, and the parser can be replayed over the whole history from
+disk without touching the network.
+
+A checkpoint per (type, first, last) range records the progress of the latest run and the
+periods the site reported as not found, so an interrupted backfill resumes without
+re-fetching them until CRAWLER_UNAVAILABLE_TTL_HOURS have passed (draws can be published late).
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Set
+
+from app.core.config import get_settings
+from app.services.raw_archive import DEFAULT_CODEC, compress_html, content_hash, decompress_html
+
+settings = get_settings()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class PageCache:
+    def __init__(self, root: str | None = None):
+        self.root = Path(root or settings.CRAWLER_CACHE_DIR)
+
+    def _index_path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / "urls" / key[:2] / f"{key}.json"
+
+    def _object_path(self, digest: str, codec: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.{codec}"
+
+    def get(self, url: str) -> str | None:
+        try:
+            entry = json.loads(self._index_path(url).read_text())
+            return self.read(entry)
+        except (OSError, ValueError):
+            return None
+
+    def read(self, entry: Dict) -> str:
+        return decompress_html(entry["codec"], self._object_path(entry["hash"], entry["codec"]).read_bytes())
+
+    def put(self, url: str, html: str, lottery_type: str | None = None) -> str:
+        """Store a page (once per distinct content) and point the URL at it; returns the content hash."""
+        digest = content_hash(html)
+        obj = self._object_path(digest, DEFAULT_CODEC)
+        if not obj.exists():
+            _write_atomic(obj, compress_html(html)[0])
+        entry = {
+            "url": url,
+            "hash": digest,
+            "codec": DEFAULT_CODEC,
+            "type": lottery_type,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _write_atomic(self._index_path(url), json.dumps(entry).encode("utf-8"))
+        return digest
+
+    def entries(self, lottery_type: str | None = None) -> Iterator[Dict]:
+        """Index entries of every cached URL, optionally for one lottery type."""
+        for path in sorted((self.root / "urls").glob("*/*.json")):
+            try:
+                entry = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if lottery_type is None or entry.get("type") == lottery_type:
+                yield entry
+
+
+class CrawlCheckpoint:
+    def __init__(self, lottery_type: str, first: int, last: int, root: str | None = None):
+        self.lottery_type = lottery_type
+        self.first = first
+        self.last = last
+        self.path = Path(root or settings.CRAWLER_CACHE_DIR) / "checkpoints" / f"{lottery_type}_{first}_{last}.json"
+        self.status = "new"
+        # Progress of the latest run: periods it set out to crawl, processed and inserted
+        self.total = 0
+        self.processed = 0
+        self.inserted = 0
+        self.unavailable: Dict[str, str] = {}  # "not found" period -> when it was seen (ISO UTC)
+        self.failed: set[str] = set()  # fetch/parse errors, retried on resume
+
+    def start_run(self, total: int) -> None:
+        self.status = "running"
+        self.total = total
+        self.processed = 0
+        self.inserted = 0
+
+    def mark_unavailable(self, period: str) -> None:
+        self.unavailable[period] = datetime.now(timezone.utc).isoformat()
+
+    def skipped_unavailable(self, ttl_hours: int | None = None) -> Set[str]:
+        """Periods reported as not found recently enough to skip; older ones are retried."""
+        ttl_hours = settings.CRAWLER_UNAVAILABLE_TTL_HOURS if ttl_hours is None else ttl_hours
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=ttl_hours)
+        return {p for p, seen in self.unavailable.items() if datetime.fromisoformat(seen) > cutoff}
+
+    @classmethod
+    def load(cls, lottery_type: str, first: int, last: int, root: str | None = None) -> "CrawlCheckpoint":
+        checkpoint = cls(lottery_type, first, last, root)
+        try:
+            state = json.loads(checkpoint.path.read_text())
+        except (OSError, ValueError):
+            return checkpoint
+        checkpoint.status = state["status"]
+        checkpoint.total = state.get("total", 0)
+        checkpoint.processed = state["processed"]
+        checkpoint.inserted = state["inserted"]
+        unavailable = state["unavailable"]
+        # Checkpoints written before the timestamps were kept: retry those periods
+        checkpoint.unavailable = unavailable if isinstance(unavailable, dict) else {}
+        checkpoint.failed = set(state["failed"])
+        return checkpoint
+
+    def save(self) -> None:
+        state = {
+            "type": self.lottery_type,
+            "first": self.first,
+            "last": self.last,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "unavailable": dict(sorted(self.unavailable.items())),
+            "failed": sorted(self.failed),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        _write_atomic(self.path, json.dumps(state).encode("utf-8"))
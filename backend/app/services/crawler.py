@@ -1,143 +1,104 @@
-import logging
 import asyncio
-from datetime import datetime
-from typing import Optional, Dict
+import logging
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
 
 import httpx
-from bs4 import BeautifulSoup
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.database import async_session
+from app.core.http_client import get_http_client
 from app.models.draw_result import DrawResult
 from app.services.telegram import send_telegram_alert
+from app.services.vietlott_parser import parse_vietlott_results, peek_period
 from app.services.statistics import update_number_stats
+from app.services.ingest import apply_new_draw, publish_new_draw
+from app.services.raw_archive import archive_html, content_hash, prune_raw_pages, save_unparsed_html
 from app.services.ai_service import generate_prediction, verify_prediction
 
 logger = logging.getLogger(__name__)
 
-async def fetch_vietlott_html(url: str) -> str:
-    """Fetch raw HTML from Vietlott site using curl to bypass detection."""
-    import subprocess
+settings = get_settings()
+
+@dataclass
+class PageState:
+    """What we last processed for a result URL: HTTP validators, body hash and draw period."""
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    period: str | None = None
+
+
+_page_states: Dict[str, PageState] = {}
+
+
+async def fetch_latest_page(url: str) -> Tuple[str | None, PageState]:
+    """
+    Conditionally fetch a latest-result page. Returns (None, state) when it is unchanged since
+    the last processed fetch (304, identical body or same draw period), else (html, state) where
+    state should be remembered once the page is processed. html is "" on fetch errors.
+    """
+    known = _page_states.get(url, PageState())
+    headers = {}
+    if known.etag:
+        headers["If-None-Match"] = known.etag
+    if known.last_modified:
+        headers["If-Modified-Since"] = known.last_modified
     try:
-        # Use curl directly as it bypasses the silent pagination redirection/blocking
-        cmd = [
-            "curl", "-s", "-L",
-            "-H", "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            url
-        ]
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, lambda: subprocess.run(cmd, capture_output=True, text=True))
-        if result.returncode != 0:
-            logger.error(f"Curl failed for {url}: {result.stderr}")
-            return ""
-        return result.stdout
-    except Exception as e:
+        response = await get_http_client().get(url, headers=headers)
+    except httpx.HTTPError as e:
         logger.error(f"Error fetching {url}: {e}")
-        return ""
+        return "", known
+    if response.status_code == 304:
+        return None, known
+    if response.status_code >= 400:
+        logger.error(f"Fetch failed for {url}: HTTP {response.status_code}")
+        return "", known
 
-def parse_vietlott_results(html: str, lottery_type: str = "mega645") -> Dict:
-    """Parse HTML using BeautifulSoup to extract latest 6/45 or 6/55 results."""
-    soup = BeautifulSoup(html, 'html.parser')
-    
-    try:
-        header = soup.select_one(".chitietketqua_title")
-        if not header:
-            raise ValueError("Could not find title header")
-            
-        h5 = header.select_one("h5")
-        if not h5:
-            raise ValueError("Could not find h5 in title header")
-            
-        import re
-        m = re.search(r"#(\d+).*?(\d{2}/\d{2}/\d{4})", h5.text)
-        if not m:
-            raise ValueError("Could not parse period and date from title")
-            
-        draw_period = int(m.group(1))
-        draw_date = datetime.strptime(m.group(2), "%d/%m/%Y").date()
-        
-        nums = [int(n.text.strip()) for n in soup.select(".day_so_ket_qua_v2 span") if n.text.strip().isdigit()]
-        min_nums = 7 if lottery_type == "power655" else 6
-        if len(nums) < min_nums:
-            raise ValueError(f"Could not parse {min_nums} winning numbers for {lottery_type}")
-            
-        # Prize parsing
-        jackpot_value = 0
-        jackpot_winners = 0
-        jackpot2_value = 0
-        jackpot2_winners = 0
-        first_prize_value = 0
-        first_prize_winners = 0
-        second_prize_value = 0
-        second_prize_winners = 0
-        third_prize_value = 0
-        third_prize_winners = 0
-        
-        for row in soup.select("table.table-hover tbody tr"):
-            cols = row.select("td")
-            if cols and len(cols) > 3:
-                prize_name = cols[0].text.strip()
-                winners_str = cols[2].text.strip()
-                prize_val_str = cols[3].text.strip()
-                
-                val = int("".join(c for c in prize_val_str if c.isdigit()) or 0)
-                winners = int("".join(c for c in winners_str if c.isdigit()) or 0)
-                
-                if lottery_type == "power655":
-                    if "Jackpot 1" in prize_name:
-                        jackpot_value = val
-                        jackpot_winners = winners
-                    elif "Jackpot 2" in prize_name:
-                        jackpot2_value = val
-                        jackpot2_winners = winners
-                else:
-                    if "Jackpot" in prize_name:
-                        jackpot_value = val
-                        jackpot_winners = winners
-                
-                if "Nhất" in prize_name:
-                    first_prize_value = val
-                    first_prize_winners = winners
-                elif "Nhì" in prize_name:
-                    second_prize_value = val
-                    second_prize_winners = winners
-                elif "Ba" in prize_name:
-                    third_prize_value = val
-                    third_prize_winners = winners
-
-        return {
-            "draw_period": f"{draw_period:05d}",
-            "draw_date": draw_date,
-            "numbers": nums,
-            "jackpot_value": jackpot_value,
-            "jackpot_winners": jackpot_winners,
-            "jackpot2_value": jackpot2_value,
-            "jackpot2_winners": jackpot2_winners,
-            "jackpot_won": (jackpot_winners + jackpot2_winners) > 0,
-            "first_prize_value": first_prize_value,
-            "first_prize_winners": first_prize_winners,
-            "second_prize_value": second_prize_value,
-            "second_prize_winners": second_prize_winners,
-            "third_prize_value": third_prize_value,
-            "third_prize_winners": third_prize_winners,
-        }
-    except Exception as e:
-        logger.error(f"Error parsing HTML: {e}")
-        raise ValueError(f"Failed to parse Vietlott HTML structure: {e}")
-        
-async def run_daily_crawler(lottery_type: str = "mega645") -> bool:
-    """Main crawler entrypoint scheduled daily."""
+    html = response.text
+    state = PageState(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        content_hash=content_hash(html),
+        period=peek_period(html),
+    )
+    if state.content_hash == known.content_hash or (state.period and state.period == known.period):
+        _page_states[url] = replace(state, period=known.period)
+        return None, state
+    return html, state
+
+
+_crawl_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def run_daily_crawler(lottery_type: str = "mega645", alert: bool = True) -> bool:
+    """Main crawler entrypoint, scheduled daily and polled around draw time."""
+    # The daily job, draw-time polls and manual triggers may overlap; one crawl per type at a time
+    async with _crawl_locks.setdefault(lottery_type, asyncio.Lock()):
+        return await _crawl_latest(lottery_type, alert)
+
+
+async def _crawl_latest(lottery_type: str, alert: bool) -> bool:
     if lottery_type == "power655":
-        url = "https://vietlott.vn/vi/trung-thuong/ket-qua-trung-thuong/655"
+        url = f"{settings.VIETLOTT_BASE_URL}/vi/trung-thuong/ket-qua-trung-thuong/655"
     else:
-        url = "https://vietlott.vn/vi/trung-thuong/ket-qua-trung-thuong/mega-6-45"
+        url = f"{settings.VIETLOTT_BASE_URL}/vi/trung-thuong/ket-qua-trung-thuong/mega-6-45"
         
     html = ""
     try:
         logger.info(f"Starting crawler for {url} ({lottery_type})")
-        html = await fetch_vietlott_html(url)
-        data = parse_vietlott_results(html, lottery_type)
+        html, page_state = await fetch_latest_page(url)
+        if html is None:
+            logger.info(f"No new {lottery_type} draw at {url} (period {page_state.period}); skipping parse.")
+            return True
+        try:
+            data = parse_vietlott_results(html, lottery_type)
+        except ValueError:
+            if html:
+                await save_unparsed_html(html, lottery_type, url)
+            raise
         
         async with async_session() as db:
             # Check if this period already exists
@@ -150,6 +111,7 @@ async def run_daily_crawler(lottery_type: str = "mega645") -> bool:
             if existing.scalar_one_or_none():
                 logger.info(f"Draw period {data['draw_period']} ({lottery_type}) already exists in DB. Refreshing stats.")
                 await update_number_stats(lottery_type=lottery_type)
+                _page_states[url] = replace(page_state, period=data["draw_period"])
                 return True
                 
             new_draw = DrawResult(
@@ -168,14 +130,12 @@ async def run_daily_crawler(lottery_type: str = "mega645") -> bool:
                 second_prize_winners=data.get("second_prize_winners", 0),
                 third_prize_value=data.get("third_prize_value", 0),
                 third_prize_winners=data.get("third_prize_winners", 0),
-                raw_html_log=html
             )
             db.add(new_draw)
+            await apply_new_draw(db, new_draw)
+            await archive_html(db, html, lottery_type, url=url, draw_id=new_draw.id, draw_period=new_draw.draw_period)
             await db.commit()
             
-            # TRIGGER STATISTICS UPDATE for specific type
-            await update_number_stats(lottery_type=lottery_type)
-            
             # VERIFY PREVIOUS AI PREDICTION for this draw period
             await verify_prediction(data["draw_period"], data["numbers"], lottery_type=lottery_type)
             
@@ -186,6 +146,11 @@ async def run_daily_crawler(lottery_type: str = "mega645") -> bool:
             except ValueError:
                 next_period = data['draw_period'] + "_next"
             await generate_prediction(next_period, lottery_type=lottery_type)
+
+            # Stats and predictions are final for this draw; invalidate cached views
+            await publish_new_draw(lottery_type)
+            await prune_raw_pages()
+            _page_states[url] = replace(page_state, period=data["draw_period"])
             
             logger.info(f"Successfully scraped and saved {lottery_type} draw period {data['draw_period']}")
             return True
@@ -193,5 +158,11 @@ async def run_daily_crawler(lottery_type: str = "mega645") -> bool:
     except Exception as e:
         error_msg = f"Crawler failed for {url}: {str(e)}"
         logger.error(error_msg)
-        await send_telegram_alert(error_msg)
+        if alert:
+            await send_telegram_alert(error_msg)
         return False
+
+
+async def poll_latest_draw(lottery_type: str = "mega645") -> bool:
+    """Frequent check near draw time; unchanged pages cost one conditional GET and no parse."""
+    return await run_daily_crawler(lottery_type, alert=False)
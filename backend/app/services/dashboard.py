@@ -0,0 +1,40 @@
+import logging
+from typing import Any, Dict
+
+from app.core.database import async_session
+from app.services.ai_service import get_latest_prediction, get_prediction_accuracy_stats, prediction_to_dict
+from app.services.cooccurrence import get_top_pairs, get_top_triplets
+from app.services.draw_history import get_draw_history_page
+from app.services.statistics import (
+    frequency_view,
+    gap_view,
+    load_number_stats,
+    summary_view,
+)
+
+logger = logging.getLogger(__name__)
+
+async def load_dashboard_snapshot(lottery_type: str = "mega645", history_limit: int = 20) -> Dict[str, Any]:
+    """
+    Everything the dashboard needs for first paint, read in one session.
+    Hot/cold, frequency and gap views are all derived from a single NumberStat read.
+    The prediction is returned ungated so the snapshot can be cached for every user.
+    """
+    async with async_session() as db:
+        stats = await load_number_stats(db, lottery_type)
+        pairs = await get_top_pairs(db, lottery_type, limit=6)
+        triplets = await get_top_triplets(db, lottery_type, limit=6)
+        latest = await get_latest_prediction(db, lottery_type)
+        accuracy = await get_prediction_accuracy_stats(db, lottery_type)
+        history = await get_draw_history_page(db, lottery_type, page=1, limit=history_limit)
+
+    return {
+        "type": lottery_type,
+        "summary": summary_view(stats),
+        "frequency": frequency_view(stats),
+        "gaps": gap_view(stats),
+        "cooccurrence": {"pairs": pairs, "triplets": triplets},
+        "prediction": prediction_to_dict(latest) if latest else None,
+        "accuracy": accuracy,
+        "history": history,
+    }
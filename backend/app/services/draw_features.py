@@ -0,0 +1,86 @@
+"""
+Per-draw derived features, computed once at ingestion into draw_features.
+
+Analytics and model training read these columns instead of re-deriving sums, parity,
+decades or consecutive runs from DrawResult.numbers on every request.
+"""
+import logging
+from typing import Dict, Any, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.draw_feature import DrawFeature
+from app.models.draw_result import DrawResult
+from app.services.combination_index import pack_numbers
+from app.services.stats_engine import MAIN_NUMBERS, get_max_number
+
+logger = logging.getLogger(__name__)
+
+
+def compute_draw_features(numbers: Sequence[int], max_num: int = 45) -> Dict[str, Any]:
+    """Features of a draw's main numbers."""
+    main = sorted(set(numbers[:MAIN_NUMBERS]))
+    odd = sum(1 for n in main if n % 2)
+
+    decades = [0] * (max_num // 10 + 1)
+    for n in main:
+        decades[n // 10] += 1
+
+    runs, longest, current = 0, 1 if main else 0, 1
+    for prev, n in zip(main, main[1:]):
+        if n == prev + 1:
+            current += 1
+            if current == 2:
+                runs += 1
+            longest = max(longest, current)
+        else:
+            current = 1
+
+    return {
+        "number_sum": sum(main),
+        "odd_count": odd,
+        "even_count": len(main) - odd,
+        "number_range": main[-1] - main[0] if main else 0,
+        "decade_histogram": decades,
+        "decade_spread": sum(1 for d in decades if d),
+        "consecutive_runs": runs,
+        "max_consecutive": longest,
+        "bitmask": pack_numbers(main),
+    }
+
+
+def build_draw_feature(draw: DrawResult) -> DrawFeature:
+    return DrawFeature(
+        draw_id=draw.id,
+        type=draw.type,
+        draw_period=draw.draw_period,
+        **compute_draw_features(draw.numbers, get_max_number(draw.type)),
+    )
+
+
+async def add_draw_features(db: AsyncSession, draw: DrawResult) -> None:
+    """Attach the features row of a newly added draw (flushes to obtain its id)."""
+    if draw.id is None:
+        await db.flush()
+    db.add(build_draw_feature(draw))
+
+
+async def backfill_draw_features(lottery_type: str = "mega645") -> None:
+    """Create missing feature rows, e.g. for draws stored before draw_features existed."""
+    try:
+        async with async_session() as db:
+            result = await db.execute(
+                select(DrawResult)
+                .outerjoin(DrawFeature, DrawFeature.draw_id == DrawResult.id)
+                .where((DrawResult.type == lottery_type) & (DrawFeature.id.is_(None)))
+            )
+            draws = result.scalars().all()
+            for draw in draws:
+                db.add(build_draw_feature(draw))
+            await db.commit()
+            if draws:
+                logger.info(f"Backfilled draw features for {len(draws)} {lottery_type} draws.")
+    except Exception as e:
+        logger.error(f"Error backfilling draw features for {lottery_type}: {e}")
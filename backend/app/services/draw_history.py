@@ -0,0 +1,201 @@
+"""
+In-memory, incrementally refreshed draw history per lottery type.
+
+Holds the chronological one-hot draw matrix plus a prefix-sum matrix of cumulative
+per-number appearance counts, so frequency over any [start, end] draw window is a
+single row subtraction instead of a rescan of DrawResult. Each number also keeps a
+run-length encoded appearance bitmap for per-number timelines, gaps and streaks, and
+a combination index maps packed 6/5/4-number subsets to the draws containing them.
+Per-draw 64-bit masks and sums back the vectorized pattern search.
+"""
+import asyncio
+import logging
+from datetime import date
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.draw_result import DrawResult
+from app.services.bitmaps import RunBitmap
+from app.services.combination_index import CombinationIndex
+from app.services.pattern_search import build_masks
+from app.services.stats_engine import MAIN_NUMBERS, build_draw_matrix, get_max_number
+
+logger = logging.getLogger(__name__)
+
+
+class DrawHistory:
+    def __init__(self, lottery_type: str):
+        self.lottery_type = lottery_type
+        self.max_num = get_max_number(lottery_type)
+        self.ids: List[int] = []
+        self._last_id: int | None = None
+        self.periods: List[str] = []
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.numbers: List[List[int]] = []
+        self.matrix = np.zeros((0, self.max_num), dtype=bool)
+        # prefix[i] = appearances of each number in draws [0, i); shape (draws + 1, max_num)
+        self.prefix = np.zeros((1, self.max_num), dtype=np.int32)
+        # bitmaps[n - 1] marks the draw indices where number n appeared
+        self.bitmaps = [RunBitmap() for _ in range(self.max_num)]
+        self.combinations = CombinationIndex()
+        # Main numbers of each draw as a bitmask (bit n - 1 for number n) and their sum
+        self.masks = np.zeros(0, dtype=np.uint64)
+        self.sums = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def last_id(self) -> int | None:
+        """Highest id loaded so far, kept up to date by append()."""
+        return self._last_id
+
+    def append(self, rows: List[Tuple[int, str, date, List[int]]]) -> None:
+        """Append chronologically ordered (id, period, date, numbers) rows."""
+        if not rows:
+            return
+        new_matrix = build_draw_matrix((r[3] for r in rows), self.max_num)
+        new_prefix = self.prefix[-1] + np.cumsum(new_matrix, axis=0, dtype=np.int32)
+
+        offset = len(self.ids)
+        for i, r in enumerate(rows):
+            self.combinations.add(offset + i, r[3])
+
+        self.ids.extend(r[0] for r in rows)
+        # Rows come in draw order, not id order (backfilled draws get newer ids), so track the max
+        batch_max = max(r[0] for r in rows)
+        self._last_id = batch_max if self._last_id is None else max(self._last_id, batch_max)
+        self.periods.extend(r[1] for r in rows)
+        self.dates = np.concatenate([self.dates, np.array([r[2] for r in rows], dtype="datetime64[D]")])
+        self.numbers.extend(list(r[3]) for r in rows)
+        self.matrix = np.vstack([self.matrix, new_matrix])
+        self.prefix = np.vstack([self.prefix, new_prefix])
+        self.masks = np.concatenate([self.masks, build_masks(r[3][:MAIN_NUMBERS] for r in rows)])
+        self.sums = np.concatenate([self.sums, np.array([sum(r[3][:MAIN_NUMBERS]) for r in rows], dtype=np.int32)])
+        for idx, bitmap in enumerate(self.bitmaps):
+            bitmap.extend(new_matrix[:, idx])
+
+    def window_counts(self, start: int, end: int) -> np.ndarray:
+        """Appearances per number in draws start..end inclusive (chronological indices)."""
+        return self.prefix[end + 1] - self.prefix[start]
+
+    def last_n_range(self, n: int) -> Tuple[int, int]:
+        return max(len(self) - n, 0), len(self) - 1
+
+    def date_range(self, start_date: date | None, end_date: date | None) -> Tuple[int, int]:
+        """Chronological index range of draws with start_date <= draw_date <= end_date."""
+        start = 0 if start_date is None else int(np.searchsorted(self.dates, np.datetime64(start_date, "D"), side="left"))
+        end = len(self) if end_date is None else int(np.searchsorted(self.dates, np.datetime64(end_date, "D"), side="right"))
+        return start, end - 1
+
+
+_histories: Dict[str, DrawHistory] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _chronological(query):
+    return query.order_by(DrawResult.draw_date, DrawResult.draw_period)
+
+
+async def _load_rows(db: AsyncSession, lottery_type: str, after_id: int | None = None):
+    query = select(DrawResult.id, DrawResult.draw_period, DrawResult.draw_date, DrawResult.numbers).where(
+        DrawResult.type == lottery_type
+    )
+    if after_id is not None:
+        query = query.where(DrawResult.id > after_id)
+    result = await db.execute(_chronological(query))
+    return [tuple(r) for r in result.all()]
+
+
+async def get_draw_history(lottery_type: str = "mega645") -> DrawHistory:
+    """
+    Return the cached history for a lottery type, refreshed against the DB.
+    A freshness probe (count, max id) costs one aggregate query; new draws that sort after
+    the cached ones are appended, anything else (deletes, backfilled older periods) reloads.
+    """
+    lock = _locks.setdefault(lottery_type, asyncio.Lock())
+    async with lock:
+        history = _histories.get(lottery_type)
+        async with async_session() as db:
+            probe = await db.execute(
+                select(func.count(DrawResult.id), func.max(DrawResult.id)).where(DrawResult.type == lottery_type)
+            )
+            count, max_id = probe.one()
+
+            if history is not None and count == len(history) and max_id == history.last_id:
+                return history
+
+            if history is not None and count > len(history) and len(history) > 0:
+                rows = await _load_rows(db, lottery_type, after_id=history.last_id)
+                last_key = (history.dates[-1], history.periods[-1])
+                appendable = (
+                    len(rows) == count - len(history)
+                    and (np.datetime64(rows[0][2], "D"), rows[0][1]) > last_key
+                )
+                if appendable:
+                    history.append(rows)
+                    return history
+
+            history = DrawHistory(lottery_type)
+            history.append(await _load_rows(db, lottery_type))
+            _histories[lottery_type] = history
+            logger.info(f"Loaded draw history for {lottery_type}: {len(history)} draws")
+            return history
+
+
+def serialize_draw(d: DrawResult) -> dict:
+    return {
+        "draw_period": d.draw_period,
+        "draw_date": d.draw_date.isoformat(),
+        "numbers": d.numbers,
+        "jackpot_value": d.jackpot_value,
+        "jackpot_winners": d.jackpot_winners,
+        "jackpot2_value": d.jackpot2_value,
+        "jackpot2_winners": d.jackpot2_winners,
+        "first_prize_value": d.first_prize_value,
+        "first_prize_winners": d.first_prize_winners,
+        "second_prize_value": d.second_prize_value,
+        "second_prize_winners": d.second_prize_winners,
+        "third_prize_value": d.third_prize_value,
+        "third_prize_winners": d.third_prize_winners,
+    }
+
+
+async def get_draw_history_page(db: AsyncSession, lottery_type: str = "mega645", page: int = 1, limit: int = 20) -> dict:
+    """Paginated draw results (newest first) with the total count and the absolute latest draw."""
+    total_result = await db.execute(
+        select(func.count()).select_from(DrawResult).where(DrawResult.type == lottery_type)
+    )
+    total = total_result.scalar() or 0
+
+    newest_first = (
+        select(DrawResult)
+        .where(DrawResult.type == lottery_type)
+        .order_by(DrawResult.draw_date.desc(), DrawResult.draw_period.desc())
+    )
+    offset = (page - 1) * limit
+    result = await db.execute(newest_first.offset(offset).limit(limit))
+    draws = result.scalars().all()
+
+    # The first page already starts with the latest draw
+    if offset == 0 and limit > 0:
+        latest_draw = draws[0] if draws else None
+    else:
+        latest_result = await db.execute(newest_first.limit(1))
+        latest_draw = latest_result.scalar_one_or_none()
+
+    return {
+        "total": total,
+        "latest_draw": {
+            "draw_period": latest_draw.draw_period,
+            "jackpot_value": latest_draw.jackpot_value,
+            "jackpot2_value": latest_draw.jackpot2_value,
+        } if latest_draw else None,
+        "page": page,
+        "limit": limit,
+        "data": [serialize_draw(d) for d in draws]
+    }
@@ -0,0 +1,87 @@
+"""
+Batched writes of crawled draws.
+
+Parsed results are buffered and each batch goes to Postgres as one multi-row
+INSERT ... ON CONFLICT (draw_period, type) DO NOTHING RETURNING, followed by one insert
+of the draw_features rows of the draws that were actually new, and a single commit.
+Periods that are already stored are counted as skipped instead of surfacing as failed
+commits, and per-row flush/commit round trips no longer dominate backfill time.
+Page provenance is recorded in raw_pages only; draw_results.raw_html_log is left to legacy rows.
+"""
+import logging
+from typing import Dict, List
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.draw_feature import DrawFeature
+from app.models.draw_result import DrawResult
+from app.services.draw_features import compute_draw_features
+from app.services.stats_engine import get_max_number
+
+logger = logging.getLogger(__name__)
+
+DRAW_FIELDS = (
+    "draw_date", "draw_period", "numbers", "jackpot_won",
+    "jackpot_value", "jackpot_winners", "jackpot2_value", "jackpot2_winners",
+    "first_prize_value", "first_prize_winners", "second_prize_value", "second_prize_winners",
+    "third_prize_value", "third_prize_winners",
+)
+
+
+def draw_row(data: Dict, lottery_type: str) -> Dict:
+    """draw_results column values of a parse_vietlott_results() result."""
+    row = {field: data.get(field, 0) for field in DRAW_FIELDS}
+    row["type"] = lottery_type
+    return row
+
+
+class DrawBatchWriter:
+    def __init__(self, db: AsyncSession, lottery_type: str):
+        self.db = db
+        self.lottery_type = lottery_type
+        self.max_num = get_max_number(lottery_type)
+        self.inserted = 0
+        self.skipped = 0  # already stored (or repeated within a batch)
+        self.failed = 0
+        self._rows: List[Dict] = []
+
+    def add(self, data: Dict) -> None:
+        self._rows.append(draw_row(data, self.lottery_type))
+
+    async def flush(self) -> List[str]:
+        """Write the buffered draws in one transaction; returns the newly inserted periods."""
+        rows, self._rows = self._rows, []
+        if not rows:
+            return []
+        try:
+            result = await self.db.execute(
+                pg_insert(DrawResult)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["draw_period", "type"])
+                .returning(DrawResult.id, DrawResult.draw_period, DrawResult.numbers)
+            )
+            new = result.all()
+            if new:
+                await self.db.execute(pg_insert(DrawFeature).values([
+                    {
+                        "draw_id": r.id,
+                        "type": self.lottery_type,
+                        "draw_period": r.draw_period,
+                        **compute_draw_features(r.numbers, self.max_num),
+                    }
+                    for r in new
+                ]))
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            self.failed += len(rows)
+            logger.error(f"Failed to write {len(rows)} {self.lottery_type} draws: {e}")
+            return []
+
+        self.inserted += len(new)
+        self.skipped += len(rows) - len(new)
+        return [r.draw_period for r in new]
+
+    def summary(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "skipped": self.skipped, "failed": self.failed}
@@ -0,0 +1,43 @@
+"""
+Maintenance of tables derived from DrawResult.
+
+`apply_new_draw` runs inside the ingesting session for each newly inserted draw so
+incremental aggregates commit atomically with the draw itself. `publish_new_draw` runs
+after the commit to invalidate cached statistics. `rebuild_derived_tables` recomputes
+everything for a lottery type after bulk crawls.
+"""
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import bump_draw_version
+from app.models.draw_result import DrawResult
+from app.services.cooccurrence import add_draw_cooccurrence, rebuild_cooccurrence
+from app.services.draw_features import add_draw_features, backfill_draw_features
+from app.services.jackpot_cycles import add_draw_to_cycles, rebuild_jackpot_cycles
+from app.services.prize_rollups import add_draw_to_prize_rollups, rebuild_prize_rollups
+from app.services.statistics import add_draw_to_number_stats, update_number_stats
+
+logger = logging.getLogger(__name__)
+
+async def apply_new_draw(db: AsyncSession, draw: DrawResult) -> None:
+    """Fold one newly inserted (not yet committed) draw into the incremental aggregates."""
+    await add_draw_features(db, draw)
+    await add_draw_cooccurrence(db, draw.type, draw.numbers)
+    await add_draw_to_cycles(db, draw)
+    await add_draw_to_number_stats(db, draw)
+    await add_draw_to_prize_rollups(db, draw)
+
+async def publish_new_draw(lottery_type: str) -> None:
+    """Move the stats cache of a lottery type to a new draw version once the draw is committed."""
+    await bump_draw_version(lottery_type)
+
+async def rebuild_derived_tables(lottery_type: str = "mega645") -> None:
+    """Recompute every derived table for a lottery type from the stored history."""
+    await backfill_draw_features(lottery_type)
+    await update_number_stats(lottery_type=lottery_type)
+    await rebuild_cooccurrence(lottery_type)
+    await rebuild_jackpot_cycles(lottery_type)
+    await rebuild_prize_rollups(lottery_type)
+    await publish_new_draw(lottery_type)
+    logger.info(f"Rebuilt derived tables for {lottery_type}")
@@ -0,0 +1,217 @@
+"""
+Jackpot cycle index: the history segmented into runs of draws ending with a jackpot win.
+
+Each cycle row keeps its per-number appearance counts and the jackpot value at its first
+and last draw, so cycle analytics are served from a few dozen rows instead of a history scan.
+"""
+import logging
+from typing import Dict, List, Any
+
+import numpy as np
+from sqlalchemy import select, delete, desc, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.draw_result import DrawResult
+from app.models.jackpot_cycle import JackpotCycle
+from app.services.stats_engine import MAIN_NUMBERS, build_draw_matrix, get_max_number
+
+logger = logging.getLogger(__name__)
+
+CYCLE_KINDS = {"mega645": ("jackpot",), "power655": ("jackpot", "jackpot2")}
+
+
+def get_cycle_kinds(lottery_type: str):
+    return CYCLE_KINDS.get(lottery_type, ("jackpot",))
+
+
+def is_cycle_end(draw, kind: str) -> bool:
+    """Whether a draw closes a cycle of the given kind (works on DrawResult rows and objects)."""
+    if kind == "jackpot2":
+        return (draw.jackpot2_winners or 0) > 0
+    # Older rows only carry jackpot_won; it covers Jackpot 1 whenever no Jackpot 2 winner is recorded
+    return (draw.jackpot_winners or 0) > 0 or (bool(draw.jackpot_won) and not (draw.jackpot2_winners or 0))
+
+
+def _jackpot_value(draw, kind: str) -> int | None:
+    return draw.jackpot2_value if kind == "jackpot2" else draw.jackpot_value
+
+
+async def _rebuild_cycles(db: AsyncSession, lottery_type: str) -> int:
+    result = await db.execute(
+        select(
+            DrawResult.draw_period, DrawResult.draw_date, DrawResult.numbers,
+            DrawResult.jackpot_won, DrawResult.jackpot_winners, DrawResult.jackpot2_winners,
+            DrawResult.jackpot_value, DrawResult.jackpot2_value,
+        )
+        .where(DrawResult.type == lottery_type)
+        .order_by(DrawResult.draw_date, DrawResult.draw_period)
+    )
+    draws = result.all()
+    await db.execute(delete(JackpotCycle).where(JackpotCycle.type == lottery_type))
+    if not draws:
+        return 0
+
+    matrix = build_draw_matrix((d.numbers for d in draws), get_max_number(lottery_type), width=MAIN_NUMBERS)
+    total = 0
+    for kind in get_cycle_kinds(lottery_type):
+        ends = np.array([is_cycle_end(d, kind) for d in draws])
+        # A cycle starts at the first draw and right after every winning draw
+        starts = np.flatnonzero(np.concatenate([[True], ends[:-1]]))
+        counts = np.add.reduceat(matrix.astype(np.int32), starts, axis=0)
+        stops = np.append(starts[1:], len(draws)) - 1
+
+        for cycle_no, (start, stop) in enumerate(zip(starts, stops), start=1):
+            first, last = draws[start], draws[stop]
+            db.add(JackpotCycle(
+                type=lottery_type,
+                kind=kind,
+                cycle_no=cycle_no,
+                start_period=first.draw_period,
+                end_period=last.draw_period,
+                start_date=first.draw_date,
+                end_date=last.draw_date,
+                draw_count=int(stop - start + 1),
+                number_counts=counts[cycle_no - 1].tolist(),
+                start_jackpot=_jackpot_value(first, kind),
+                end_jackpot=_jackpot_value(last, kind),
+                is_closed=bool(ends[stop]),
+            ))
+        total += len(starts)
+    return total
+
+
+async def rebuild_jackpot_cycles(lottery_type: str = "mega645") -> None:
+    """Recompute the cycle index of a lottery type from the full draw history."""
+    try:
+        async with async_session() as db:
+            total = await _rebuild_cycles(db, lottery_type)
+            await db.commit()
+            logger.info(f"Rebuilt jackpot cycle index for {lottery_type}: {total} cycles.")
+    except Exception as e:
+        logger.error(f"Error rebuilding jackpot cycles for {lottery_type}: {e}")
+
+
+async def add_draw_to_cycles(db: AsyncSession, draw: DrawResult) -> None:
+    """
+    Fold a newly ingested draw into the open cycle of each kind (opening one if needed).
+    A draw that predates the indexed history (backfill), or an empty index over a non-empty
+    history (tables never built), triggers an in-session rebuild instead.
+    """
+    max_num = get_max_number(draw.type)
+    drawn = [n for n in set(draw.numbers[:MAIN_NUMBERS]) if 1 <= n <= max_num]
+
+    for kind in get_cycle_kinds(draw.type):
+        result = await db.execute(
+            select(JackpotCycle)
+            .where((JackpotCycle.type == draw.type) & (JackpotCycle.kind == kind))
+            .order_by(desc(JackpotCycle.cycle_no))
+            .limit(1)
+        )
+        cycle = result.scalar_one_or_none()
+
+        if cycle is None:
+            earlier = await db.execute(
+                select(DrawResult.id)
+                .where(
+                    (DrawResult.type == draw.type)
+                    & (tuple_(DrawResult.draw_date, DrawResult.draw_period) < tuple_(draw.draw_date, draw.draw_period))
+                )
+                .limit(1)
+            )
+            needs_rebuild = earlier.scalar_one_or_none() is not None
+        else:
+            needs_rebuild = (draw.draw_date, draw.draw_period) <= (cycle.end_date, cycle.end_period)
+
+        if needs_rebuild:
+            await db.flush()
+            await _rebuild_cycles(db, draw.type)
+            return
+
+        if cycle is None or cycle.is_closed:
+            cycle = JackpotCycle(
+                type=draw.type,
+                kind=kind,
+                cycle_no=(cycle.cycle_no + 1) if cycle else 1,
+                start_period=draw.draw_period,
+                start_date=draw.draw_date,
+                draw_count=0,
+                number_counts=[0] * max_num,
+                start_jackpot=_jackpot_value(draw, kind),
+            )
+            db.add(cycle)
+
+        counts = list(cycle.number_counts)
+        for n in drawn:
+            counts[n - 1] += 1
+        cycle.number_counts = counts
+        cycle.draw_count += 1
+        cycle.end_period = draw.draw_period
+        cycle.end_date = draw.draw_date
+        cycle.end_jackpot = _jackpot_value(draw, kind)
+        cycle.is_closed = is_cycle_end(draw, kind)
+
+
+def _cycle_to_dict(cycle: JackpotCycle, top: int = 6) -> Dict[str, Any]:
+    counts = np.asarray(cycle.number_counts)
+    order = np.lexsort((np.arange(len(counts)), -counts))[:top]
+    growth = None
+    if cycle.start_jackpot is not None and cycle.end_jackpot is not None:
+        growth = cycle.end_jackpot - cycle.start_jackpot
+    return {
+        "cycle_no": cycle.cycle_no,
+        "start_period": cycle.start_period,
+        "end_period": cycle.end_period,
+        "start_date": cycle.start_date,
+        "end_date": cycle.end_date,
+        "draw_count": cycle.draw_count,
+        "is_closed": cycle.is_closed,
+        "start_jackpot": cycle.start_jackpot,
+        "end_jackpot": cycle.end_jackpot,
+        "jackpot_growth": growth,
+        "growth_per_draw": round(growth / max(cycle.draw_count - 1, 1)) if growth is not None else None,
+        "top_numbers": [{"number": int(i) + 1, "count": int(counts[i])} for i in order if counts[i] > 0],
+        "number_counts": cycle.number_counts,
+    }
+
+
+async def get_jackpot_cycle_stats(lottery_type: str = "mega645", kind: str = "jackpot", limit: int = 20) -> Dict[str, Any]:
+    """Cycle summary plus the latest ``limit`` cycles, read from the cycle index only."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(JackpotCycle)
+            .where((JackpotCycle.type == lottery_type) & (JackpotCycle.kind == kind))
+            .order_by(desc(JackpotCycle.cycle_no))
+        )
+        cycles: List[JackpotCycle] = list(result.scalars().all())
+
+    if not cycles:
+        return {"kind": kind, "cycle_count": 0, "current_cycle": None, "numbers": [], "cycles": []}
+
+    closed = [c for c in cycles if c.is_closed]
+    lengths = np.array([c.draw_count for c in closed]) if closed else np.zeros(0)
+    counts = np.array([c.number_counts for c in closed]) if closed else np.zeros((0, get_max_number(lottery_type)))
+    draws_in_closed = int(lengths.sum()) if closed else 0
+
+    numbers = [
+        {
+            "number": n + 1,
+            "count": int(counts[:, n].sum()),
+            # Share of completed cycles in which the number appeared at least once
+            "cycle_hit_rate": round(float((counts[:, n] > 0).mean()), 4) if closed else 0.0,
+            "rate_per_draw": round(float(counts[:, n].sum()) / draws_in_closed, 4) if draws_in_closed else 0.0,
+        }
+        for n in range(counts.shape[1])
+    ]
+
+    current = cycles[0] if not cycles[0].is_closed else None
+    return {
+        "kind": kind,
+        "cycle_count": len(closed),
+        "avg_cycle_length": round(float(lengths.mean()), 2) if closed else None,
+        "median_cycle_length": float(np.median(lengths)) if closed else None,
+        "max_cycle_length": int(lengths.max()) if closed else None,
+        "current_cycle": _cycle_to_dict(current) if current else None,
+        "numbers": numbers,
+        "cycles": [_cycle_to_dict(c) for c in cycles[:limit]],
+    }
@@ -0,0 +1,74 @@
+"""
+Vectorized constraint and similarity search over draw bitmasks.
+
+Each draw is a 64-bit mask (bit n - 1 set for number n, as in combination_index), so
+"contains", "excludes" and parity predicates, as well as overlap/Jaccard similarity to a
+ticket, become bitwise ops plus a popcount over the whole history array in one pass.
+"""
+from typing import Iterable
+
+import numpy as np
+
+from app.services.combination_index import pack_numbers
+
+# Bits of the odd numbers 1, 3, 5, ... (bit positions 0, 2, 4, ...)
+ODD_MASK = np.uint64(0x5555_5555_5555_5555)
+
+SIMILARITY_METRICS = ("overlap", "jaccard")
+
+_POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Set bits per element of a uint64 array."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(masks)
+    # Older NumPy: per-byte lookup table summed over the 8 bytes of each mask
+    return _POPCOUNT_LUT[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+
+def build_masks(draws: Iterable) -> np.ndarray:
+    return np.fromiter((pack_numbers(d) for d in draws), dtype=np.uint64)
+
+
+def match_draws(
+    masks: np.ndarray,
+    sums: np.ndarray,
+    contains: Iterable[int] = (),
+    excludes: Iterable[int] = (),
+    min_sum: int | None = None,
+    max_sum: int | None = None,
+    odd_count: int | None = None,
+) -> np.ndarray:
+    """Boolean vector of the draws satisfying every given predicate."""
+    matched = np.ones(len(masks), dtype=bool)
+    required = np.uint64(pack_numbers(contains))
+    if required:
+        matched &= (masks & required) == required
+    banned = np.uint64(pack_numbers(excludes))
+    if banned:
+        matched &= (masks & banned) == 0
+    if min_sum is not None:
+        matched &= sums >= min_sum
+    if max_sum is not None:
+        matched &= sums <= max_sum
+    if odd_count is not None:
+        matched &= popcount(masks & ODD_MASK) == odd_count
+    return matched
+
+
+def similarity_scores(masks: np.ndarray, numbers: Iterable[int], metric: str = "overlap") -> np.ndarray:
+    """Shared numbers between each draw and ``numbers`` (overlap), or |A & B| / |A | B| (jaccard)."""
+    query = np.uint64(pack_numbers(numbers))
+    overlap = popcount(masks & query)
+    if metric == "jaccard":
+        union = popcount(masks | query)
+        return np.divide(overlap, union, out=np.zeros(len(masks)), where=union > 0)
+    return overlap
+
+
+def top_similar(masks: np.ndarray, numbers: Iterable[int], k: int = 10, metric: str = "overlap"):
+    """Indices and scores of the ``k`` most similar draws, ties broken by the most recent draw."""
+    scores = similarity_scores(masks, numbers, metric)
+    order = np.lexsort((-np.arange(len(scores)), -scores.astype(np.float64)))[:k]
+    return order, scores[order]
@@ -0,0 +1,39 @@
+"""
+Set-based detection of draw periods missing from draw_results.
+
+One query compares generate_series(first, last) against the stored periods of a type
+(an anti-join on the (draw_period, type) unique index) and folds the missing periods into
+contiguous ranges with the gaps-and-islands trick, so a backfill over an almost complete
+table costs a single round trip plus the pages that are actually missing.
+"""
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MISSING_RANGES_SQL = text("""
+    SELECT min(s) AS first_period, max(s) AS last_period
+    FROM (
+        SELECT s, s - row_number() OVER (ORDER BY s) AS grp
+        FROM generate_series(CAST(:first AS integer), CAST(:last AS integer)) AS s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM draw_results d
+            WHERE d.type = :type AND d.draw_period = lpad(s::text, 5, '0')
+        )
+    ) missing
+    GROUP BY grp
+    ORDER BY first_period DESC
+""")
+
+
+async def find_missing_ranges(db: AsyncSession, lottery_type: str, first: int, last: int) -> List[Tuple[int, int]]:
+    """Inclusive (first, last) ranges of periods in [first, last] with no stored draw, newest first."""
+    if last < first:
+        return []
+    result = await db.execute(MISSING_RANGES_SQL, {"type": lottery_type, "first": first, "last": last})
+    return [(r.first_period, r.last_period) for r in result]
+
+
+def range_periods(ranges: List[Tuple[int, int]]) -> List[str]:
+    """Zero-padded periods of the given ranges, newest first."""
+    return [f"{p:05d}" for lo, hi in ranges for p in range(hi, lo - 1, -1)]
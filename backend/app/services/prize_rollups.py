@@ -0,0 +1,181 @@
+"""
+Monthly and yearly prize/jackpot rollups per lottery type.
+
+Payouts, winner counts per tier, jackpot growth and the largest jackpots are aggregated
+into prize_rollups so prize analytics read a few dozen rows instead of scanning DrawResult.
+A new draw only re-aggregates the year it falls in (and later years, for backfills).
+"""
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Any, Sequence
+
+from sqlalchemy import select, delete, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.models.draw_result import DrawResult
+from app.models.prize_rollup import PrizeRollup
+from app.services.jackpot_cycles import is_cycle_end
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_PERIODS = ("month", "year")
+
+_PRIZE_TIERS = ("first_prize", "second_prize", "third_prize")
+
+
+def _period_start(day: date, period: str) -> date:
+    return day.replace(month=1, day=1) if period == "year" else day.replace(day=1)
+
+
+def _aggregate(lottery_type: str, draws: Sequence[DrawResult], previous: DrawResult | None) -> List[PrizeRollup]:
+    """Rollup rows for chronological ``draws``; ``previous`` is the draw just before them, if any."""
+    rollups: Dict[tuple, PrizeRollup] = {}
+
+    def bucket(period: str, day: date) -> PrizeRollup:
+        key = (period, _period_start(day, period))
+        if key not in rollups:
+            rollups[key] = PrizeRollup(
+                type=lottery_type, period=period, period_start=key[1], draw_count=0,
+                total_payout=0, jackpot_payout=0, jackpot_winners=0, jackpot2_winners=0,
+                first_prize_winners=0, second_prize_winners=0, third_prize_winners=0,
+                jackpot_growth_sum=0, jackpot_growth_draws=0,
+            )
+        return rollups[key]
+
+    for draw in draws:
+        jackpot_hit = is_cycle_end(draw, "jackpot")
+        jackpot2_hit = is_cycle_end(draw, "jackpot2")
+        jackpot_payout = (draw.jackpot_value or 0) * jackpot_hit + (draw.jackpot2_value or 0) * jackpot2_hit
+        prize_payout = sum(
+            (getattr(draw, f"{tier}_value") or 0) * (getattr(draw, f"{tier}_winners") or 0) for tier in _PRIZE_TIERS
+        )
+        growth = None
+        if previous is not None and not is_cycle_end(previous, "jackpot") \
+                and draw.jackpot_value is not None and previous.jackpot_value is not None:
+            growth = draw.jackpot_value - previous.jackpot_value
+
+        for period in ROLLUP_PERIODS:
+            r = bucket(period, draw.draw_date)
+            r.draw_count += 1
+            r.jackpot_payout += jackpot_payout
+            r.total_payout += jackpot_payout + prize_payout
+            r.jackpot_winners += draw.jackpot_winners or int(jackpot_hit)
+            r.jackpot2_winners += draw.jackpot2_winners or 0
+            r.first_prize_winners += draw.first_prize_winners or 0
+            r.second_prize_winners += draw.second_prize_winners or 0
+            r.third_prize_winners += draw.third_prize_winners or 0
+            if growth is not None:
+                r.jackpot_growth_sum += growth
+                r.jackpot_growth_draws += 1
+            if draw.jackpot_value is not None:
+                r.max_jackpot = max(r.max_jackpot or 0, draw.jackpot_value)
+                if jackpot_hit and draw.jackpot_value > (r.max_jackpot_won or 0):
+                    r.max_jackpot_won = draw.jackpot_value
+                    r.max_jackpot_won_period = draw.draw_period
+        previous = draw
+
+    return list(rollups.values())
+
+
+async def _refresh_rollups(db: AsyncSession, lottery_type: str, since: date | None = None) -> int:
+    """Recompute the rollups from the start of ``since``'s year onwards (everything when None)."""
+    query = select(DrawResult).where(DrawResult.type == lottery_type)
+    previous = None
+    if since is not None:
+        since = _period_start(since, "year")
+        query = query.where(DrawResult.draw_date >= since)
+        prev_result = await db.execute(
+            select(DrawResult)
+            .where((DrawResult.type == lottery_type) & (DrawResult.draw_date < since))
+            .order_by(desc(DrawResult.draw_date), desc(DrawResult.draw_period))
+            .limit(1)
+        )
+        previous = prev_result.scalar_one_or_none()
+
+    result = await db.execute(query.order_by(DrawResult.draw_date, DrawResult.draw_period))
+    rows = _aggregate(lottery_type, result.scalars().all(), previous)
+
+    stale = delete(PrizeRollup).where(PrizeRollup.type == lottery_type)
+    if since is not None:
+        stale = stale.where(PrizeRollup.period_start >= since)
+    await db.execute(stale)
+    db.add_all(rows)
+    return len(rows)
+
+
+async def rebuild_prize_rollups(lottery_type: str = "mega645") -> None:
+    """Recompute every prize rollup of a lottery type from the full draw history."""
+    try:
+        async with async_session() as db:
+            total = await _refresh_rollups(db, lottery_type)
+            await db.commit()
+            logger.info(f"Rebuilt prize rollups for {lottery_type}: {total} rows.")
+    except Exception as e:
+        logger.error(f"Error rebuilding prize rollups for {lottery_type}: {e}")
+
+
+async def add_draw_to_prize_rollups(db: AsyncSession, draw: DrawResult) -> None:
+    """Re-aggregate the year of a newly ingested draw, inside the ingesting session."""
+    await db.flush()
+    await _refresh_rollups(db, draw.type, since=draw.draw_date)
+
+
+def _rollup_to_dict(r: PrizeRollup) -> Dict[str, Any]:
+    return {
+        "period_start": r.period_start,
+        "draw_count": r.draw_count,
+        "total_payout": r.total_payout,
+        "jackpot_payout": r.jackpot_payout,
+        "winners": {
+            "jackpot": r.jackpot_winners,
+            "jackpot2": r.jackpot2_winners,
+            "first": r.first_prize_winners,
+            "second": r.second_prize_winners,
+            "third": r.third_prize_winners,
+        },
+        "avg_jackpot_growth": round(r.jackpot_growth_sum / r.jackpot_growth_draws) if r.jackpot_growth_draws else None,
+        "max_jackpot": r.max_jackpot,
+        "max_jackpot_won": r.max_jackpot_won,
+        "max_jackpot_won_period": r.max_jackpot_won_period,
+    }
+
+
+async def get_prize_stats(lottery_type: str = "mega645", period: str = "month", limit: int = 24, top: int = 5) -> Dict[str, Any]:
+    """Latest ``limit`` rollups of the given period, all-time totals and the largest jackpots won."""
+    async with async_session() as db:
+        result = await db.execute(
+            select(PrizeRollup)
+            .where(PrizeRollup.type == lottery_type)
+            .order_by(desc(PrizeRollup.period_start))
+        )
+        rollups = result.scalars().all()
+
+    by_period: Dict[str, List[PrizeRollup]] = defaultdict(list)
+    for r in rollups:
+        by_period[r.period].append(r)
+    years = by_period["year"]
+
+    growth_draws = sum(r.jackpot_growth_draws for r in years)
+    largest = sorted(
+        (r for r in by_period["month"] if r.max_jackpot_won),
+        key=lambda r: (-r.max_jackpot_won, r.period_start),
+    )[:top]
+
+    return {
+        "period": period,
+        "totals": {
+            "draw_count": sum(r.draw_count for r in years),
+            "total_payout": sum(r.total_payout for r in years),
+            "jackpot_payout": sum(r.jackpot_payout for r in years),
+            "jackpot_winners": sum(r.jackpot_winners for r in years),
+            "jackpot2_winners": sum(r.jackpot2_winners for r in years),
+            "avg_jackpot_growth": round(sum(r.jackpot_growth_sum for r in years) / growth_draws) if growth_draws else None,
+        },
+        "largest_jackpots": [
+            {"draw_period": r.max_jackpot_won_period, "jackpot_value": r.max_jackpot_won, "month": r.period_start}
+            for r in largest
+        ],
+        "data": [_rollup_to_dict(r) for r in by_period[period][:limit]],
+    }
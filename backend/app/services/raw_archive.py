@@ -0,0 +1,244 @@
+"""
+Compressed, deduplicated archive of crawled result pages (raw_pages).
+
+Pages are stored out of draw_results, compressed with zstd (zlib when the optional
+`zstandard` package is missing) and keyed by the SHA-256 of the HTML, so fetching the
+same page twice stores it once. Each page links to the draw parsed from it, or to no draw
+when parsing failed, which is exactly the HTML needed to re-parse after a parser fix.
+"""
+import hashlib
+import logging
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.models.draw_feature import DrawFeature
+from app.models.draw_result import DrawResult
+from app.models.raw_page import RawPage
+from app.services.draw_writer import DRAW_FIELDS, DrawBatchWriter
+from app.services.vietlott_parser import parse_vietlott_results
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+DEFAULT_CODEC = "zstd" if zstandard is not None else "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def compress_html(html: str, codec: str = DEFAULT_CODEC) -> Tuple[bytes, int]:
+    """Compressed bytes and raw size of a page."""
+    raw = html.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw), len(raw)
+    return zlib.compress(raw, ZLIB_LEVEL), len(raw)
+
+
+def decompress_html(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Page is zstd-compressed but the 'zstandard' package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    return zlib.decompress(data).decode("utf-8")
+
+
+async def archive_html(
+    db: AsyncSession,
+    html: str,
+    lottery_type: str,
+    url: str | None = None,
+    draw_id: int | None = None,
+    draw_period: str | None = None,
+) -> int:
+    """
+    Store a page in the caller's transaction and return its raw_pages id. A page already
+    archived is not stored again; it only gains the draw link if it had none.
+    """
+    data, size = compress_html(html)
+    stmt = pg_insert(RawPage).values(
+        content_hash=content_hash(html),
+        draw_id=draw_id,
+        type=lottery_type,
+        draw_period=draw_period,
+        url=url,
+        codec=DEFAULT_CODEC,
+        size=size,
+        compressed_size=len(data),
+        data=data,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["content_hash"],
+        set_={
+            "draw_id": func.coalesce(RawPage.draw_id, stmt.excluded.draw_id),
+            "draw_period": func.coalesce(RawPage.draw_period, stmt.excluded.draw_period),
+        },
+    ).returning(RawPage.id)
+    return (await db.execute(stmt)).scalar_one()
+
+
+async def save_unparsed_html(html: str, lottery_type: str, url: str | None = None) -> None:
+    """Keep a page the parser rejected so it can be re-parsed once the parser is fixed."""
+    try:
+        async with async_session() as db:
+            await archive_html(db, html, lottery_type, url=url)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Error archiving unparsed {lottery_type} page: {e}")
+
+
+async def get_raw_html(db: AsyncSession, lottery_type: str, draw_period: str) -> str | None:
+    """Most recent archived page of a draw."""
+    result = await db.execute(
+        select(RawPage.codec, RawPage.data)
+        .where((RawPage.type == lottery_type) & (RawPage.draw_period == draw_period))
+        .order_by(RawPage.created_at.desc(), RawPage.id.desc())
+        .limit(1)
+    )
+    row = result.first()
+    return decompress_html(row.codec, row.data) if row else None
+
+
+async def prune_raw_pages(max_age_days: int | None = None, max_pages: int | None = None) -> int:
+    """
+    Apply the retention limits: drop pages older than max_age_days and keep at most
+    max_pages newest pages per lottery type (0 disables a limit). Returns pages deleted.
+    """
+    max_age_days = settings.RAW_HTML_RETENTION_DAYS if max_age_days is None else max_age_days
+    max_pages = settings.RAW_HTML_MAX_PAGES if max_pages is None else max_pages
+    deleted = 0
+    try:
+        async with async_session() as db:
+            if max_age_days:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+                result = await db.execute(delete(RawPage).where(RawPage.created_at < cutoff))
+                deleted += result.rowcount
+            if max_pages:
+                ranked = select(
+                    RawPage.id,
+                    func.row_number().over(
+                        partition_by=RawPage.type,
+                        order_by=(RawPage.created_at.desc(), RawPage.id.desc()),
+                    ).label("rank"),
+                ).subquery()
+                result = await db.execute(
+                    delete(RawPage).where(RawPage.id.in_(select(ranked.c.id).where(ranked.c.rank > max_pages)))
+                )
+                deleted += result.rowcount
+            await db.commit()
+        if deleted:
+            logger.info(f"Pruned {deleted} archived pages.")
+    except Exception as e:
+        logger.error(f"Error pruning raw page archive: {e}")
+    return deleted
+
+
+async def archive_legacy_raw_html(batch_size: int = 200) -> int:
+    """Move HTML still stored in draw_results.raw_html_log into raw_pages and clear the column."""
+    moved = 0
+    last_id = 0
+    async with async_session() as db:
+        while True:
+            result = await db.execute(
+                select(DrawResult.id, DrawResult.type, DrawResult.draw_period, DrawResult.raw_html_log)
+                .where((DrawResult.id > last_id) & DrawResult.raw_html_log.ilike("%<html%"))
+                .order_by(DrawResult.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            for r in rows:
+                await archive_html(db, r.raw_html_log, r.type, draw_id=r.id, draw_period=r.draw_period)
+            await db.execute(
+                update(DrawResult).where(DrawResult.id.in_([r.id for r in rows])).values(raw_html_log=None)
+            )
+            await db.commit()
+            moved += len(rows)
+            last_id = rows[-1].id
+    logger.info(f"Moved {moved} legacy raw_html_log pages into raw_pages.")
+    return moved
+
+
+async def reparse_raw_pages(lottery_type: str, periods: List[str] | None = None, unlinked_only: bool = False) -> Dict[str, int]:
+    """
+    Re-run the parser over archived pages: draws whose stored fields differ are corrected,
+    draws missing from draw_results are inserted, and pages are linked to their draw.
+    Derived tables must be rebuilt afterwards when anything changed.
+    """
+    counts = {"pages": 0, "failed": 0, "updated": 0, "inserted": 0}
+    async with async_session() as db:
+        query = select(RawPage).where(RawPage.type == lottery_type).order_by(RawPage.created_at)
+        if periods:
+            query = query.where(RawPage.draw_period.in_(periods))
+        if unlinked_only:
+            query = query.where(RawPage.draw_id.is_(None))
+        pages = (await db.execute(query)).scalars().all()
+
+        parsed: Dict[str, Tuple[Dict, List[RawPage]]] = {}
+        for page in pages:
+            counts["pages"] += 1
+            try:
+                data = parse_vietlott_results(decompress_html(page.codec, page.data), lottery_type)
+            except Exception as e:
+                counts["failed"] += 1
+                logger.warning(f"Archived page {page.id} still does not parse: {e}")
+                continue
+            # Later archives of the same draw win
+            linked = parsed.get(data["draw_period"], (None, []))[1]
+            parsed[data["draw_period"]] = (data, linked + [page])
+
+        if not parsed:
+            return counts
+
+        existing = await db.execute(
+            select(DrawResult).where((DrawResult.type == lottery_type) & DrawResult.draw_period.in_(list(parsed)))
+        )
+        draws = {d.draw_period: d for d in existing.scalars().all()}
+
+        updated_ids = []
+        writer = DrawBatchWriter(db, lottery_type)
+        for period, (data, _) in parsed.items():
+            draw = draws.get(period)
+            if draw is None:
+                writer.add(data)
+                continue
+            changes = {f: data.get(f, 0) for f in DRAW_FIELDS if getattr(draw, f) != data.get(f, 0)}
+            if changes:
+                for field, value in changes.items():
+                    setattr(draw, field, value)
+                updated_ids.append(draw.id)
+        if updated_ids:
+            # Recomputed by backfill_draw_features when the derived tables are rebuilt
+            await db.execute(delete(DrawFeature).where(DrawFeature.draw_id.in_(updated_ids)))
+        await db.commit()
+        counts["updated"] = len(updated_ids)
+        counts["inserted"] = len(await writer.flush())
+
+        ids = await db.execute(
+            select(DrawResult.draw_period, DrawResult.id)
+            .where((DrawResult.type == lottery_type) & DrawResult.draw_period.in_(list(parsed)))
+        )
+        for period, draw_id in ids.all():
+            for page in parsed[period][1]:
+                page.draw_id = draw_id
+                page.draw_period = period
+        await db.commit()
+
+    logger.info(f"Re-parsed archived {lottery_type} pages: {counts}")
+    return counts
@@ -1,199 +1,495 @@
 import logging
-import itertools
-from typing import Dict, List, Any
-from collections import defaultdict, Counter
+import struct
+from datetime import date
+from math import comb
+from typing import Dict, List, Any, Sequence
+from collections import defaultdict
 
-from sqlalchemy import select, desc
+import numpy as np
+from sqlalchemy import select, desc, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import async_session
 from app.models.draw_result import DrawResult
+from app.models.draw_feature import DrawFeature
 from app.models.number_stat import NumberStat
+from app.services.draw_history import DrawHistory, get_draw_history
+from app.services.combinatorics import combination_distributions
+from app.services.cooccurrence import get_top_pairs, get_top_triplets
+from app.services.pattern_search import match_draws, top_similar
+from app.services.stats_engine import (
+    LOTTERY_TYPES,
+    MAIN_NUMBERS,
+    build_draw_matrix,
+    classify_frequency,
+    compute_number_stats,
+    gap_survival,
+    get_max_number,
+    heatmap_cells,
+    rank_by_frequency,
+)
 
 logger = logging.getLogger(__name__)
 
+def _draws_by_type_query(lottery_types: Sequence[str], limit: int):
+    """Latest ``limit`` draws per type, numbers only, newest first within each type."""
+    recency = func.row_number().over(
+        partition_by=DrawResult.type,
+        order_by=(desc(DrawResult.draw_date), desc(DrawResult.draw_period)),
+    ).label("recency")
+    ranked = (
+        select(DrawResult.type, DrawResult.draw_date, DrawResult.numbers, recency)
+        .where(DrawResult.type.in_(lottery_types))
+        .subquery()
+    )
+    return (
+        select(ranked.c.type, ranked.c.draw_date, ranked.c.numbers)
+        .where(ranked.c.recency <= limit)
+        .order_by(ranked.c.type, desc(ranked.c.recency))
+    )
+
+def set_number_stats(stats: Dict[int, NumberStat], draws: List[Any], max_num: int) -> None:
+    """Overwrite NumberStat rows (by number) with the stats of chronological (draw_date, numbers) rows."""
+    matrix = build_draw_matrix((d.numbers for d in draws), max_num)
+    computed = compute_number_stats(matrix)
+    for idx in range(max_num):
+        stat = stats[idx + 1]
+        last_idx = int(computed["last_seen_index"][idx])
+        stat.frequency = int(computed["frequency"][idx])
+        stat.last_seen = draws[last_idx].draw_date if last_idx >= 0 else None
+        stat.current_gap = int(computed["current_gap"][idx])
+
+        if computed["max_gap"][idx] > (stat.max_gap or 0):
+            stat.max_gap = int(computed["max_gap"][idx])
+        stat.gap_histogram = np.trim_zeros(computed["gap_histogram"][idx], "b").tolist()
+
+def fold_draw_into_stats(stats: Sequence[NumberStat], numbers: Sequence[int], draw_date: date) -> None:
+    """Advance NumberStat rows by one draw appended after the draws they were computed from."""
+    drawn = set(numbers)
+    for stat in stats:
+        if stat.number in drawn:
+            if stat.frequency:
+                # The gap since the previous appearance just ended; it joins the completed-gap
+                # histogram (a first appearance ends the leading gap, which is partial)
+                hist = list(stat.gap_histogram or [])
+                if stat.current_gap >= len(hist):
+                    hist.extend([0] * (stat.current_gap + 1 - len(hist)))
+                hist[stat.current_gap] += 1
+                stat.gap_histogram = hist
+            stat.frequency += 1
+            stat.last_seen = draw_date
+            stat.current_gap = 0
+        else:
+            stat.current_gap += 1
+            stat.max_gap = max(stat.max_gap or 0, stat.current_gap)
+
+async def _upsert_number_stats(db: AsyncSession, lottery_type: str, draws: List[Any]) -> None:
+    """Compute stats for one type from chronological (draw_date, numbers) rows and upsert NumberStat."""
+    max_num = get_max_number(lottery_type)
+    result = await db.execute(select(NumberStat).where(NumberStat.type == lottery_type))
+    existing = {s.number: s for s in result.scalars().all()}
+    for num in range(1, max_num + 1):
+        if num not in existing:
+            existing[num] = NumberStat(number=num, type=lottery_type, frequency=0, current_gap=0, max_gap=0)
+            db.add(existing[num])
+    set_number_stats(existing, draws, max_num)
+
+async def add_draw_to_number_stats(db: AsyncSession, draw: DrawResult, limit: int = 5000) -> None:
+    """
+    Fold a newly ingested draw into NumberStat (frequency, gaps and gap histograms) without
+    rescanning the history. Stats cover the latest ``limit`` draws, like update_number_stats:
+    once the history is longer, the oldest draw has to leave the window, so the draw is
+    handled by an in-session recompute instead, as are backfilled draws (not the latest of
+    their type) and types without stats yet.
+    """
+    await db.flush()
+    later = await db.execute(
+        select(DrawResult.id)
+        .where(
+            (DrawResult.type == draw.type)
+            & (DrawResult.id != draw.id)
+            & (tuple_(DrawResult.draw_date, DrawResult.draw_period) >= tuple_(draw.draw_date, draw.draw_period))
+        )
+        .limit(1)
+    )
+    stats = await load_number_stats(db, draw.type)
+    history_len = (await db.execute(
+        select(func.count()).select_from(DrawResult).where(DrawResult.type == draw.type)
+    )).scalar()
+
+    if later.first() is not None or len(stats) != get_max_number(draw.type) or history_len > limit:
+        result = await db.execute(_draws_by_type_query((draw.type,), limit))
+        await _upsert_number_stats(db, draw.type, result.all())
+        return
+
+    fold_draw_into_stats(stats, draw.numbers, draw.draw_date)
+
 async def update_number_stats(lottery_type: str = "mega645", limit: int = 5000) -> None:
     """
     Recalculate frequency and gap statistics based on the latest DrawResults.
     Upserts records into the NumberStat table.
     """
+    await update_all_number_stats(lottery_types=(lottery_type,), limit=limit)
+
+async def update_all_number_stats(lottery_types: Sequence[str] = LOTTERY_TYPES, limit: int = 5000) -> None:
+    """
+    Recalculate NumberStat for several lottery types from a single DrawResult query.
+    Each type's history is one-hot encoded and reduced by the vectorized stats engine.
+    """
     try:
-        max_num = 55 if lottery_type == "power655" else 45
         async with async_session() as db:
-            # Fetch all draw results, ordered by period descending (newest first)
-            result = await db.execute(
-                select(DrawResult)
-                .where(DrawResult.type == lottery_type)
-                .order_by(desc(DrawResult.draw_date), desc(DrawResult.draw_period))
-                .limit(limit)
-            )
-            draws = result.scalars().all()
-
-            if not draws:
-                logger.info(f"No valid DrawResults found to calculate stats for {lottery_type}.")
-                return
-
-            frequencies = defaultdict(int)
-            last_seen_dates = {}
-            current_gaps = {i: 0 for i in range(1, max_num + 1)}
-            max_gaps_tracking = defaultdict(int)
-            
-            # Note: draws is newest first [Draw100, Draw99, ..., Draw1]
-            # To calculate max gaps accurately, we need to iterate chronologically (oldest to newest)
-            chronological_draws = list(reversed(draws))
-            
-            # Temporary tracking for gap calculation
-            running_gaps = {i: 0 for i in range(1, max_num + 1)}
-
-            for draw in chronological_draws:
-                drawn_nums = set(draw.numbers)
-                
-                for num in range(1, max_num + 1):
-                    if num in drawn_nums:
-                        frequencies[num] += 1
-                        last_seen_dates[num] = draw.draw_date
-                        
-                        # Reset running gap for this number
-                        if running_gaps[num] > max_gaps_tracking[num]:
-                            max_gaps_tracking[num] = running_gaps[num]
-                        running_gaps[num] = 0
-                    else:
-                        running_gaps[num] += 1
-            
-            # After all draws, the running_gaps represent the current_gap
-            for num in range(1, max_num + 1):
-                current_gaps[num] = running_gaps[num]
-                # Also check if the final running gap is the local maximum
-                if running_gaps[num] > max_gaps_tracking[num]:
-                    max_gaps_tracking[num] = running_gaps[num]
-
-            # Upsert into NumberStat table
-            for num in range(1, max_num + 1):
-                stat_result = await db.execute(
-                    select(NumberStat)
-                    .where((NumberStat.number == num) & (NumberStat.type == lottery_type))
-                )
-                stat = stat_result.scalar_one_or_none()
-                
-                if not stat:
-                    stat = NumberStat(number=num, type=lottery_type, frequency=0, current_gap=0, max_gap=0)
-                    db.add(stat)
-                
-                stat.frequency = frequencies[num]
-                stat.last_seen = last_seen_dates.get(num)
-                stat.current_gap = current_gaps[num]
-                
-                if max_gaps_tracking[num] > stat.max_gap:
-                    stat.max_gap = max_gaps_tracking[num]
+            result = await db.execute(_draws_by_type_query(lottery_types, limit))
+
+            # Rows arrive grouped by type, oldest first within each type
+            draws_by_type: Dict[str, List[Any]] = defaultdict(list)
+            for row in result.all():
+                draws_by_type[row.type].append(row)
+
+            for lottery_type in lottery_types:
+                draws = draws_by_type.get(lottery_type)
+                if not draws:
+                    logger.info(f"No valid DrawResults found to calculate stats for {lottery_type}.")
+                    continue
+                await _upsert_number_stats(db, lottery_type, draws)
 
             await db.commit()
-            logger.info(f"Successfully updated Number Stats for {lottery_type}.")
-            
+            logger.info(f"Successfully updated Number Stats for {', '.join(draws_by_type) or 'no types'}.")
+
     except Exception as e:
         logger.error(f"Error calculating stats: {e}")
 
+async def load_number_stats(db: AsyncSession, lottery_type: str) -> List[NumberStat]:
+    result = await db.execute(
+        select(NumberStat)
+        .where(NumberStat.type == lottery_type)
+        .order_by(NumberStat.number)
+    )
+    return list(result.scalars().all())
+
+def _rank_stats(stats: List[NumberStat], ascending: bool = False) -> List[NumberStat]:
+    """Order NumberStat rows by frequency using the engine's ranking (ties by number asc)."""
+    if not stats:
+        return []
+    numbers = np.array([s.number for s in stats])
+    freqs = np.array([s.frequency for s in stats])
+    return [stats[i] for i in rank_by_frequency(numbers, freqs, ascending=ascending)]
+
+def frequency_view(stats: List[NumberStat]) -> List[Dict[str, Any]]:
+    ranked = _rank_stats(stats)
+    labels = classify_frequency(len(ranked))
+    return [
+        {
+            "number": s.number,
+            "frequency": s.frequency,
+            "classification": labels[idx]
+        }
+        for idx, s in enumerate(ranked)
+    ]
+
+def current_gap_survival(stat: NumberStat) -> float | None:
+    """Share of the number's completed gaps that lasted at least as long as its current gap."""
+    if not stat.gap_histogram:
+        return None
+    if stat.current_gap == 0:
+        return 1.0
+    survival = gap_survival(stat.gap_histogram)
+    return round(float(survival[stat.current_gap - 1]), 4) if stat.current_gap <= len(survival) else 0.0
+
+def gap_view(stats: List[NumberStat]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "number": s.number,
+            "current_gap": s.current_gap,
+            "max_gap": s.max_gap,
+            "last_seen": s.last_seen,
+            # Low values mean the current gap is unusually long for this number
+            "gap_survival": current_gap_survival(s),
+        }
+        for s in sorted(stats, key=lambda s: (-s.current_gap, s.number))
+    ]
+
+def summary_view(stats: List[NumberStat]) -> Dict[str, Any]:
+    hot = _rank_stats(stats)[:6]
+    cold = _rank_stats(stats, ascending=True)[:6]
+    return {
+        "hot": [{"number": s.number, "frequency": s.frequency} for s in hot],
+        "cold": [{"number": s.number, "frequency": s.frequency} for s in cold]
+    }
+
 async def get_frequency_stats(lottery_type: str = "mega645") -> List[Dict[str, Any]]:
     """Fetch frequency stats and classify Hot/Cold."""
     async with async_session() as db:
-        result = await db.execute(
-            select(NumberStat)
-            .where(NumberStat.type == lottery_type)
-            .order_by(desc(NumberStat.frequency), NumberStat.number)
-        )
-        stats = result.scalars().all()
-        
-        if not stats:
-            return []
-            
-        return [
-            {
-                "number": s.number,
-                "frequency": s.frequency,
-                "classification": "hot" if idx < 5 else ("cold" if idx >= len(stats) - 5 else "neutral")
-            }
-            for idx, s in enumerate(stats)
-        ]
+        return frequency_view(await load_number_stats(db, lottery_type))
 
 async def get_gap_stats(lottery_type: str = "mega645") -> List[Dict[str, Any]]:
     """Fetch gap stats."""
     async with async_session() as db:
-        result = await db.execute(
-            select(NumberStat)
-            .where(NumberStat.type == lottery_type)
-            .order_by(desc(NumberStat.current_gap), NumberStat.number)
-        )
-        stats = result.scalars().all()
-        
+        return gap_view(await load_number_stats(db, lottery_type))
+
+async def get_gap_distribution_stats(lottery_type: str = "mega645", number: int | None = None) -> List[Dict[str, Any]]:
+    """Per-number completed-gap histogram and survival curve P(gap > g), read from NumberStat."""
+    async with async_session() as db:
+        stats = await load_number_stats(db, lottery_type)
+    return [
+        {
+            "number": s.number,
+            "current_gap": s.current_gap,
+            "gap_survival": current_gap_survival(s),
+            "histogram": s.gap_histogram or [],
+            "survival": np.round(gap_survival(s.gap_histogram or []), 4).tolist(),
+        }
+        for s in stats
+        if number is None or s.number == number
+    ]
+
+async def get_summary_stats(lottery_type: str = "mega645") -> Dict[str, Any]:
+    """Fetch Top 6 most frequent (Hot) and Top 6 least frequent (Cold) numbers."""
+    async with async_session() as db:
+        return summary_view(await load_number_stats(db, lottery_type))
+
+async def get_cooccurrence_stats(lottery_type: str = "mega645", top_n: int = 6, number: int | None = None) -> Dict[str, Any]:
+    """
+    Top pairs and triplets from the materialized co-occurrence tables.
+    With ``number`` set, pairs are restricted to those containing it.
+    """
+    async with async_session() as db:
+        top_pairs = await get_top_pairs(db, lottery_type, limit=top_n, number=number)
+        top_triplets = await get_top_triplets(db, lottery_type, limit=top_n)
+
+    if not top_pairs and number is None:
+        # Filled by ingest / rebuild_derived_tables; never rebuilt from a read
+        logger.warning(f"No co-occurrence counts for {lottery_type}; run rebuild_derived_tables to build them.")
+
+    return {
+        "pairs": top_pairs,
+        "triplets": top_triplets
+    }
+
+async def get_window_frequency_stats(
+    lottery_type: str = "mega645",
+    last: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> Dict[str, Any]:
+    """
+    Hot/cold frequency over a draw window: the latest ``last`` draws, or a draw_date range.
+    Answered from the prefix-sum matrix of the cached draw history in O(numbers).
+    """
+    history = await get_draw_history(lottery_type)
+    if last is not None:
+        start, end = history.last_n_range(last)
+    else:
+        start, end = history.date_range(start_date, end_date)
+
+    if len(history) == 0 or end < start:
+        return {"draws": 0, "start": None, "end": None, "data": []}
+
+    counts = history.window_counts(start, end)
+    numbers = np.arange(1, history.max_num + 1)
+    order = rank_by_frequency(numbers, counts)
+    labels = classify_frequency(len(order))
+
+    return {
+        "draws": end - start + 1,
+        "start": {"draw_period": history.periods[start], "draw_date": str(history.dates[start])},
+        "end": {"draw_period": history.periods[end], "draw_date": str(history.dates[end])},
+        "data": [
+            {
+                "number": int(numbers[i]),
+                "frequency": int(counts[i]),
+                "classification": labels[rank]
+            }
+            for rank, i in enumerate(order)
+        ]
+    }
+
+async def get_number_history(lottery_type: str = "mega645", number: int = 1) -> Dict[str, Any]:
+    """Appearance timeline, gap series and streaks of one number, read from its appearance bitmap."""
+    history = await get_draw_history(lottery_type)
+    bitmap = history.bitmaps[number - 1]
+
+    positions = bitmap.positions()
+    gaps = bitmap.gaps()
+    streak_starts, streak_lengths = bitmap.streaks()
+    # Gaps between two appearances; the leading and the open trailing gap are partial
+    closed_gaps = gaps[1:-1]
+
+    return {
+        "number": number,
+        "draws": len(history),
+        "frequency": len(bitmap),
+        "current_gap": int(gaps[-1]) if len(history) else 0,
+        "max_gap": int(gaps.max()) if len(history) else 0,
+        "avg_gap": round(float(closed_gaps.mean()), 2) if len(closed_gaps) else None,
+        "longest_streak": int(bitmap.lengths.max()) if len(bitmap.lengths) else 0,
+        "bitmap_bytes": bitmap.nbytes,
+        "timeline": [
+            {"index": int(i), "draw_period": history.periods[i], "draw_date": str(history.dates[i])}
+            for i in positions
+        ],
+        "gaps": gaps.tolist(),
+        "streaks": [
+            {
+                "start_period": history.periods[int(start)],
+                "end_period": history.periods[int(start + length - 1)],
+                "length": int(length),
+            }
+            for start, length in zip(streak_starts, streak_lengths)
+        ],
+    }
+
+async def lookup_combination(lottery_type: str = "mega645", numbers: Sequence[int] = ()) -> Dict[str, Any]:
+    """Historic draws matching a 6-number ticket exactly, or on 5 or 4 of its numbers."""
+    history = await get_draw_history(lottery_type)
+    found = history.combinations.lookup(numbers)
+    ticket = set(numbers)
+
+    def draws(indices):
         return [
             {
-                "number": s.number,
-                "current_gap": s.current_gap,
-                "max_gap": s.max_gap,
-                "last_seen": s.last_seen
+                "draw_period": history.periods[i],
+                "draw_date": str(history.dates[i]),
+                "numbers": history.numbers[i],
+                "matched": sorted(ticket & set(history.numbers[i][:MAIN_NUMBERS])),
             }
-            for s in stats
+            for i in reversed(indices)  # newest first
         ]
 
-async def get_summary_stats(lottery_type: str = "mega645") -> Dict[str, Any]:
-    """Fetch Top 6 most frequent (Hot) and Top 6 least frequent (Cold) numbers."""
-    async with async_session() as db:
-        # Most frequent (Hot)
-        hot_result = await db.execute(
-            select(NumberStat)
-            .where(NumberStat.type == lottery_type)
-            .order_by(desc(NumberStat.frequency), NumberStat.number)
-            .limit(6)
-        )
-        hot = hot_result.scalars().all()
-        
-        # Least frequent (Cold)
-        cold_result = await db.execute(
-            select(NumberStat)
-            .where(NumberStat.type == lottery_type)
-            .order_by(NumberStat.frequency, NumberStat.number)
-            .limit(6)
-        )
-        cold = cold_result.scalars().all()
-        
-        return {
-            "hot": [{"number": s.number, "frequency": s.frequency} for s in hot],
-            "cold": [{"number": s.number, "frequency": s.frequency} for s in cold]
-        }
+    return {
+        "numbers": sorted(ticket),
+        "draws": len(history),
+        "exact": draws(found[MAIN_NUMBERS]),
+        "match_5": draws(found[MAIN_NUMBERS - 1]),
+        "match_4": draws(found[MAIN_NUMBERS - 2]),
+    }
+
+async def get_distribution_stats(lottery_type: str = "mega645") -> Dict[str, Any]:
+    """
+    Observed histograms of ticket sum, odd count and decade spread (from draw_features) next to
+    their exact theoretical distribution over every possible 6-number ticket.
+    """
+    max_num = get_max_number(lottery_type)
+    expected = combination_distributions(max_num, MAIN_NUMBERS)
 
-async def get_cooccurrence_stats(lottery_type: str = "mega645", limit: int = 1500) -> Dict[str, Any]:
-    """Analyze pairs and triplets frequent co-occurrence."""
     async with async_session() as db:
         result = await db.execute(
-            select(DrawResult)
-            .where(DrawResult.type == lottery_type)
-            .order_by(desc(DrawResult.draw_date))
-            .limit(limit)
+            select(DrawFeature.number_sum, DrawFeature.odd_count, DrawFeature.decade_spread)
+            .where(DrawFeature.type == lottery_type)
         )
-        draws = result.scalars().all()
-        
-        pair_counts = Counter()
-        triplet_counts = Counter()
-        
-        for draw in draws:
-            nums = sorted(draw.numbers[:6]) # Only main 6 numbers for consistency
-            # Pairs
-            for pair in itertools.combinations(nums, 2):
-                pair_counts[pair] += 1
-            # Triplets
-            for triplet in itertools.combinations(nums, 3):
-                triplet_counts[triplet] += 1
-                
-        # Get Top 6 of each
-        top_pairs = [
-            {"numbers": list(p), "count": count} 
-            for p, count in pair_counts.most_common(6)
-        ]
-        top_triplets = [
-            {"numbers": list(t), "count": count} 
-            for t, count in triplet_counts.most_common(6)
+        rows = result.all()
+
+    draws = len(rows)
+    observed_columns = np.array(rows, dtype=np.int64).reshape(draws, 3).T
+    total = comb(max_num, MAIN_NUMBERS)
+
+    def histogram(counts: np.ndarray, observed_values: np.ndarray) -> List[Dict[str, Any]]:
+        observed = np.bincount(observed_values, minlength=len(counts))[:len(counts)]
+        return [
+            {
+                "value": value,
+                "combinations": int(counts[value]),
+                "probability": float(counts[value]) / total,
+                "expected": round(draws * float(counts[value]) / total, 2),
+                "observed": int(observed[value]),
+            }
+            for value in np.flatnonzero(counts).tolist()
         ]
-        
-        return {
-            "pairs": top_pairs,
-            "triplets": top_triplets
+
+    return {
+        "draws": draws,
+        "total_combinations": total,
+        "sum": histogram(expected["sum"], observed_columns[0]),
+        "odd_count": histogram(expected["odd_count"], observed_columns[1]),
+        "decade_spread": histogram(expected["decade_spread"], observed_columns[2]),
+    }
+
+async def search_draws(
+    lottery_type: str = "mega645",
+    contains: Sequence[int] = (),
+    excludes: Sequence[int] = (),
+    min_sum: int | None = None,
+    max_sum: int | None = None,
+    odd_count: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """Draws matching every given constraint, newest first, evaluated over the cached draw bitmasks."""
+    history = await get_draw_history(lottery_type)
+    start, end = history.date_range(start_date, end_date)
+    if len(history) == 0 or end < start:
+        return {"draws": 0, "matched": 0, "data": []}
+
+    window = slice(start, end + 1)
+    matched = match_draws(
+        history.masks[window], history.sums[window],
+        contains=contains, excludes=excludes,
+        min_sum=min_sum, max_sum=max_sum, odd_count=odd_count,
+    )
+    indices = np.flatnonzero(matched)[::-1][:limit] + start
+
+    return {
+        "draws": end - start + 1,
+        "matched": int(matched.sum()),
+        "data": [
+            {
+                "draw_period": history.periods[i],
+                "draw_date": str(history.dates[i]),
+                "numbers": history.numbers[i],
+                "sum": int(history.sums[i]),
+            }
+            for i in indices
+        ],
+    }
+
+def closest_draws(history: DrawHistory, numbers: Sequence[int], limit: int = 10, metric: str = "overlap") -> List[Dict[str, Any]]:
+    """Historic draws most similar to ``numbers`` (overlap or Jaccard), from the cached draw masks."""
+    indices, scores = top_similar(history.masks, numbers, k=limit, metric=metric)
+    ticket = set(numbers)
+    return [
+        {
+            "draw_period": history.periods[i],
+            "draw_date": str(history.dates[i]),
+            "numbers": history.numbers[i],
+            "matched": sorted(ticket & set(history.numbers[i][:MAIN_NUMBERS])),
+            "score": round(float(score), 4) if metric == "jaccard" else int(score),
         }
+        for i, score in zip(indices, scores)
+    ]
+
+async def get_similar_draws(
+    lottery_type: str = "mega645", numbers: Sequence[int] = (), limit: int = 10, metric: str = "overlap"
+) -> Dict[str, Any]:
+    history = await get_draw_history(lottery_type)
+    return {
+        "numbers": sorted(numbers),
+        "metric": metric,
+        "draws": len(history),
+        "data": closest_draws(history, numbers, limit=limit, metric=metric),
+    }
+
+# magic, version, bits per cell, numbers (rows), columns, draws, bucket size; little-endian
+HEATMAP_HEADER = struct.Struct("<4sBBHIIH")
+HEATMAP_MAGIC = b"VLHM"
+
+async def get_heatmap(lottery_type: str = "mega645", bucket: int = 1) -> Dict[str, Any]:
+    """
+    Number x draw appearance heatmap packed from the cached draw matrix.
+    ``payload`` is HEATMAP_HEADER followed by the row-major cells (see stats_engine.heatmap_cells).
+    """
+    history = await get_draw_history(lottery_type)
+    bucket = max(bucket, 1)
+    bits, cells = heatmap_cells(history.matrix, bucket)
+    # Logical columns (draws or buckets); bit-packed rows take ceil(columns / 8) bytes
+    columns = -(-len(history) // bucket)
+    header = HEATMAP_HEADER.pack(HEATMAP_MAGIC, 1, bits, cells.shape[0], columns, len(history), bucket)
+    return {
+        "draws": len(history),
+        "numbers": history.max_num,
+        "columns": columns,
+        "bucket": bucket,
+        "bits": bits,
+        "first_period": history.periods[0] if len(history) else None,
+        "last_period": history.periods[-1] if len(history) else None,
+        "payload": header + cells.tobytes(),
+    }
@@ -0,0 +1,197 @@
+"""
+Vectorized statistics engine over a one-hot draw matrix.
+
+A draw history is represented as a boolean matrix of shape (draws, max_num)
+in chronological order (oldest draw first), where ``matrix[i, n - 1]`` is True
+when number ``n`` was drawn in draw ``i``. Every per-number statistic exposed by
+the ``/stats`` endpoints is derived from this matrix with NumPy reductions
+instead of nested Python loops.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+LOTTERY_TYPES = ("mega645", "power655")
+MAIN_NUMBERS = 6  # Main balls per draw; power655 appends a bonus ball after these
+
+
+def get_max_number(lottery_type: str) -> int:
+    return 55 if lottery_type == "power655" else 45
+
+
+def build_draw_matrix(draws: Iterable[Sequence[int]], max_num: int, width: int | None = None) -> np.ndarray:
+    """
+    One-hot encode draws (chronological order) into a (len(draws), max_num) bool matrix.
+    ``width`` keeps only the first N numbers of each draw (e.g. MAIN_NUMBERS to drop the bonus ball).
+    Out-of-range numbers are ignored, matching the legacy loops.
+    """
+    rows: List[int] = []
+    cols: List[int] = []
+    n_draws = 0
+    for idx, nums in enumerate(draws):
+        n_draws = idx + 1
+        for num in (nums[:width] if width else nums):
+            if 1 <= num <= max_num:
+                rows.append(idx)
+                cols.append(num - 1)
+
+    matrix = np.zeros((n_draws, max_num), dtype=bool)
+    if rows:
+        matrix[np.asarray(rows), np.asarray(cols)] = True
+    return matrix
+
+
+def frequencies(matrix: np.ndarray) -> np.ndarray:
+    """Number of draws each number appeared in."""
+    return matrix.sum(axis=0, dtype=np.int64)
+
+
+def current_gaps(matrix: np.ndarray) -> np.ndarray:
+    """Draws since each number last appeared (0 if it is in the latest draw, len(matrix) if never)."""
+    n_draws = matrix.shape[0]
+    if n_draws == 0:
+        return np.zeros(matrix.shape[1], dtype=np.int64)
+    reversed_view = matrix[::-1]
+    gaps = reversed_view.argmax(axis=0).astype(np.int64)
+    gaps[~reversed_view.any(axis=0)] = n_draws
+    return gaps
+
+
+def last_seen_positions(matrix: np.ndarray) -> np.ndarray:
+    """Row index of each number's latest appearance, -1 if it never appeared."""
+    return matrix.shape[0] - 1 - current_gaps(matrix)
+
+
+def appearance_gaps(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Every gap (misses between consecutive appearances) for every number, including the
+    leading gap before the first appearance and the trailing gap after the last one.
+    Returns (number_index, gap) arrays of equal length, grouped by number_index.
+    """
+    n_draws, max_num = matrix.shape
+    # Sentinel appearances just before the first draw and just after the last one
+    sentinel = np.ones((1, max_num), dtype=bool)
+    padded = np.vstack([sentinel, matrix, sentinel])
+    num_idx, positions = np.nonzero(padded.T)
+
+    same_number = num_idx[1:] == num_idx[:-1]
+    gaps = np.diff(positions) - 1
+    return num_idx[1:][same_number], gaps[same_number]
+
+
+def max_gaps(matrix: np.ndarray) -> np.ndarray:
+    """Longest run of misses per number, including the current (open) gap."""
+    result = np.zeros(matrix.shape[1], dtype=np.int64)
+    num_idx, gaps = appearance_gaps(matrix)
+    np.maximum.at(result, num_idx, gaps)
+    return result
+
+
+def gap_histograms(matrix: np.ndarray) -> np.ndarray:
+    """
+    (max_num, longest gap + 1) counts of completed gaps per number: hist[n, g] is how many
+    times number n + 1 appeared after exactly g misses since its previous appearance. Only
+    gaps between two appearances count: the leading gap before the first appearance has an
+    unknown start and the open gap since the last appearance has not ended yet.
+    """
+    num_idx, gaps = appearance_gaps(matrix)
+    # The first gap of each number starts at the leading sentinel and the last one runs into
+    # the trailing sentinel; both are partial
+    same_as_prev = np.insert(num_idx[1:] == num_idx[:-1], 0, False)
+    same_as_next = np.append(num_idx[1:] == num_idx[:-1], False)
+    closed = same_as_prev & same_as_next
+    num_idx, gaps = num_idx[closed], gaps[closed]
+    width = int(gaps.max()) + 1 if len(gaps) else 1
+    hist = np.zeros((matrix.shape[1], width), dtype=np.int64)
+    np.add.at(hist, (num_idx, gaps), 1)
+    return hist
+
+
+def gap_survival(histogram: Sequence[int]) -> np.ndarray:
+    """Empirical survival of one number's gaps: survival[g] = P(gap > g)."""
+    hist = np.asarray(histogram, dtype=np.float64)
+    total = hist.sum()
+    if not total:
+        return np.zeros(len(hist))
+    return 1.0 - np.cumsum(hist) / total
+
+
+def pair_counts(matrix: np.ndarray) -> np.ndarray:
+    """(max_num, max_num) co-occurrence counts; only the upper triangle (a < b) is meaningful."""
+    # Float matmul goes through BLAS; counts stay exact far beyond any real history length
+    m = matrix.astype(np.float64)
+    return np.triu(m.T @ m, k=1).astype(np.int64)
+
+
+def triplet_counts(matrix: np.ndarray) -> np.ndarray:
+    """(max_num, max_num, max_num) co-occurrence counts; only cells with a < b < c are meaningful."""
+    max_num = matrix.shape[1]
+    m = matrix.astype(np.float64)
+    counts = np.zeros((max_num, max_num, max_num), dtype=np.int64)
+    for a in range(max_num - 2):
+        # Pair counts restricted to the draws containing ``a``
+        rows = m[matrix[:, a]]
+        if rows.size:
+            counts[a] = np.triu(rows.T @ rows, k=1)
+        counts[a, : a + 1, :] = 0
+    return counts
+
+
+def top_cells(counts: np.ndarray, n: int) -> List[Tuple[Tuple[int, ...], int]]:
+    """
+    Top ``n`` strictly-increasing index tuples of a pair/triplet count tensor, as
+    ((number, ...), count) ordered by count desc then numbers asc.
+    """
+    flat = counts.ravel()
+    nonzero = np.flatnonzero(flat)
+    if nonzero.size == 0 or n <= 0:
+        return []
+    # Cells are stored in ascending index order, so a stable sort on -count keeps numbers asc on ties
+    order = nonzero[np.argsort(-flat[nonzero], kind="stable")][:n]
+    coords = np.unravel_index(order, counts.shape)
+    return [
+        (tuple(int(c[i]) + 1 for c in coords), int(flat[order[i]]))
+        for i in range(len(order))
+    ]
+
+
+def rank_by_frequency(numbers: np.ndarray, freqs: np.ndarray, ascending: bool = False) -> np.ndarray:
+    """Indices ordering numbers by frequency (desc by default), ties broken by number asc."""
+    primary = freqs if ascending else -freqs
+    return np.lexsort((numbers, primary))
+
+
+def classify_frequency(n_numbers: int, band: int = 5) -> List[str]:
+    """Hot/cold labels for numbers already ranked by frequency desc."""
+    return [
+        "hot" if idx < band else ("cold" if idx >= n_numbers - band else "neutral")
+        for idx in range(n_numbers)
+    ]
+
+
+def heatmap_cells(matrix: np.ndarray, bucket: int = 1) -> Tuple[int, np.ndarray]:
+    """
+    Number x time appearance grid as compact bytes, rows = numbers, columns = draws (oldest first).
+    With ``bucket`` 1 each row is bit-packed (1 bit per draw, MSB first, padded to whole bytes);
+    otherwise each cell is the appearance count in a bucket of ``bucket`` draws (uint8, or
+    uint16 above 255). Returns (bits per cell, cells).
+    """
+    by_number = matrix.T
+    if bucket <= 1:
+        return 1, np.packbits(by_number, axis=1)
+    starts = np.arange(0, matrix.shape[0], bucket)
+    counts = np.add.reduceat(by_number.astype(np.uint16), starts, axis=1) if len(starts) else by_number.astype(np.uint16)
+    if bucket <= 255:
+        return 8, counts.astype(np.uint8)
+    return 16, counts.astype("<u2")
+
+
+def compute_number_stats(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """All per-number statistics persisted into NumberStat, in one pass over the matrix."""
+    return {
+        "frequency": frequencies(matrix),
+        "current_gap": current_gaps(matrix),
+        "max_gap": max_gaps(matrix),
+        "last_seen_index": last_seen_positions(matrix),
+        "gap_histogram": gap_histograms(matrix),
+    }
@@ -0,0 +1,191 @@
+"""
+Parsers for vietlott.vn result pages.
+
+The lxml backend walks the few nodes we need (`.chitietketqua_title h5`,
+`.day_so_ket_qua_v2 span`, the prize table rows) with compiled XPath on lxml's C parser,
+which is several times faster than building a BeautifulSoup tree with the pure-Python
+`html.parser`. BeautifulSoup stays as the fallback when lxml is not installed and as the
+reference implementation; both backends feed the same field extraction.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("lxml", "bs4")
+DEFAULT_BACKEND = "lxml" if lxml_html is not None else "bs4"
+
+TITLE_RE = re.compile(r"#(\d+).*?(\d{2}/\d{2}/\d{4})")
+_TITLE_H5_RE = re.compile(r"chitietketqua_title.*?<h5[^>]*>(.*?)</h5>", re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# (title text or None, number span texts, prize table rows as cell texts)
+Extracted = Tuple[str | None, List[str], List[List[str]]]
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if lxml_html is not None:
+    _XP_TITLE = etree.XPath(f"//*[{_has_class('chitietketqua_title')}]")
+    _XP_H5 = etree.XPath(".//h5")
+    _XP_NUMBERS = etree.XPath(f"//*[{_has_class('day_so_ket_qua_v2')}]//span")
+    _XP_ROW_NUMBERS = etree.XPath(f".//*[{_has_class('day_so_ket_qua_v2')}]//span")
+    _XP_TABLE_ROWS = etree.XPath(f"//table[{_has_class('table-hover')}]//tbody//tr")
+    _XP_CELLS = etree.XPath("./td")
+
+
+def _extract_lxml(html: str) -> Extracted:
+    root = lxml_html.fromstring(html)
+    title = None
+    headers = _XP_TITLE(root)
+    if headers:
+        h5 = _XP_H5(headers[0])
+        title = h5[0].text_content() if h5 else ""
+    numbers = [span.text_content() for span in _XP_NUMBERS(root)]
+    rows = [[td.text_content() for td in _XP_CELLS(tr)] for tr in _XP_TABLE_ROWS(root)]
+    return title, numbers, rows
+
+
+def _extract_bs4(html: str) -> Extracted:
+    soup = BeautifulSoup(html, 'html.parser')
+    title = None
+    header = soup.select_one(".chitietketqua_title")
+    if header:
+        h5 = header.select_one("h5")
+        title = h5.text if h5 else ""
+    numbers = [n.text for n in soup.select(".day_so_ket_qua_v2 span")]
+    rows = [[td.text for td in tr.select("td")] for tr in soup.select("table.table-hover tbody tr")]
+    return title, numbers, rows
+
+
+def _extract(html: str, backend: str | None) -> Extracted:
+    backend = backend or DEFAULT_BACKEND
+    if backend == "lxml" and lxml_html is not None and html.strip():
+        return _extract_lxml(html)
+    return _extract_bs4(html)
+
+
+def _digits(text: str) -> int:
+    return int("".join(c for c in text if c.isdigit()) or 0)
+
+
+def _build_result(title: str | None, number_texts: List[str], prize_rows: List[List[str]], lottery_type: str) -> Dict:
+    if title is None:
+        raise ValueError("Could not find title header")
+    if not title:
+        raise ValueError("Could not find h5 in title header")
+
+    m = TITLE_RE.search(title)
+    if not m:
+        raise ValueError("Could not parse period and date from title")
+
+    draw_period = int(m.group(1))
+    draw_date = datetime.strptime(m.group(2), "%d/%m/%Y").date()
+
+    nums = [int(n.strip()) for n in number_texts if n.strip().isdigit()]
+    min_nums = 7 if lottery_type == "power655" else 6
+    if len(nums) < min_nums:
+        raise ValueError(f"Could not parse {min_nums} winning numbers for {lottery_type}")
+
+    # Prize parsing
+    prizes = {
+        "jackpot": (0, 0), "jackpot2": (0, 0),
+        "first_prize": (0, 0), "second_prize": (0, 0), "third_prize": (0, 0),
+    }
+    for cols in prize_rows:
+        if len(cols) <= 3:
+            continue
+        prize_name = cols[0].strip()
+        prize = (_digits(cols[3]), _digits(cols[2]))
+
+        if lottery_type == "power655":
+            if "Jackpot 1" in prize_name:
+                prizes["jackpot"] = prize
+            elif "Jackpot 2" in prize_name:
+                prizes["jackpot2"] = prize
+        elif "Jackpot" in prize_name:
+            prizes["jackpot"] = prize
+
+        if "Nhất" in prize_name:
+            prizes["first_prize"] = prize
+        elif "Nhì" in prize_name:
+            prizes["second_prize"] = prize
+        elif "Ba" in prize_name:
+            prizes["third_prize"] = prize
+
+    result = {"draw_period": f"{draw_period:05d}", "draw_date": draw_date, "numbers": nums}
+    for name in ("jackpot", "jackpot2"):
+        result[f"{name}_value"], result[f"{name}_winners"] = prizes[name]
+    result["jackpot_won"] = (prizes["jackpot"][1] + prizes["jackpot2"][1]) > 0
+    for name in ("first_prize", "second_prize", "third_prize"):
+        result[f"{name}_value"], result[f"{name}_winners"] = prizes[name]
+    return result
+
+
+def parse_vietlott_results(html: str, lottery_type: str = "mega645", backend: str | None = None) -> Dict:
+    """Parse a 6/45 or 6/55 result detail page (draw, numbers and prize table)."""
+    try:
+        return _build_result(*_extract(html, backend), lottery_type)
+    except Exception as e:
+        logger.error(f"Error parsing HTML: {e}")
+        raise ValueError(f"Failed to parse Vietlott HTML structure: {e}")
+
+
+def peek_period(html: str) -> str | None:
+    """Draw period of a detail page from a regex over the raw HTML, without building a tree."""
+    m = _TITLE_H5_RE.search(html)
+    if not m:
+        return None
+    title = TITLE_RE.search(_TAG_RE.sub("", m.group(1)))
+    return f"{int(title.group(1)):05d}" if title else None
+
+
+def parse_listing_rows(html: str, backend: str | None = None) -> List[Dict]:
+    """
+    Rows of a paginated results listing (winning-number-645/655): date, period and numbers.
+    Rows without a parseable period are skipped.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == "lxml" and lxml_html is not None and html.strip():
+        root = lxml_html.fromstring(html)
+        rows = [
+            ([td.text_content() for td in _XP_CELLS(tr)], [s.text_content() for s in _XP_ROW_NUMBERS(tr)])
+            for tr in _XP_TABLE_ROWS(root)
+        ]
+    else:
+        soup = BeautifulSoup(html, 'html.parser')
+        rows = [
+            ([td.text for td in tr.select("td")], [s.text for s in tr.select(".day_so_ket_qua_v2 span")])
+            for tr in soup.select("table.table-hover tbody tr")
+        ]
+
+    results = []
+    for cells, number_texts in rows:
+        if len(cells) < 2:
+            continue
+        try:
+            period = int(cells[1].strip().replace("#", ""))
+        except ValueError:
+            continue
+        try:
+            draw_date = datetime.strptime(cells[0].strip(), "%d/%m/%Y").date()
+        except ValueError:
+            draw_date = None
+        results.append({
+            "draw_period": f"{period:05d}",
+            "draw_date": draw_date,
+            "numbers": [int(n.strip()) for n in number_texts if n.strip().isdigit()],
+        })
+    return results
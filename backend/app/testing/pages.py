@@ -0,0 +1,84 @@
+"""
+Vietlott result pages for offline checks, benchmarks and the local stand-in site.
+
+Builds detail and listing pages with the same markup as vietlott.vn, and locates the
+recorded listing captures saved in backend/ (independent of the working directory).
+"""
+import os
+import random
+from datetime import date, timedelta
+from typing import List
+
+from app.services.stats_engine import get_max_number
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Recorded captures of the first 6/55 results listing page
+LISTING_FIXTURES = ["p1.html", "p2.html", "debug_crawl.html", "terminal_curl.html"]
+RESULTS_PATH = "/vi/trung-thuong/ket-qua-trung-thuong"
+ROWS_PER_LISTING = 8
+NOT_FOUND_HTML = "<html><body><div class='alert'>Không tìm thấy kết quả kỳ quay thưởng</div></body></html>"
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(BACKEND_DIR, name)
+
+
+def read_fixture(name: str) -> str | None:
+    """Contents of a recorded page, None when it is not in the checkout."""
+    path = fixture_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return f.read()
+
+
+def draw_numbers(period: int, lottery_type: str) -> List[int]:
+    """Deterministic numbers of a synthetic draw (6/55 draws end with the bonus ball)."""
+    rnd = random.Random(period * 2 + (lottery_type == "power655"))
+    max_num = get_max_number(lottery_type)
+    numbers = sorted(rnd.sample(range(1, max_num + 1), 6))
+    if lottery_type == "power655":
+        numbers.append(rnd.choice([n for n in range(1, max_num + 1) if n not in numbers]))
+    return numbers
+
+
+def detail_page(period: int, numbers: list, lottery_type: str) -> str:
+    spans = "".join(f'<span class="bong_tron">{n:02d}</span>' for n in numbers[:6])
+    if lottery_type == "power655":
+        spans += f'<span class="bong_tron-sperator">|</span><span class="bong_tron no-margin-right">{numbers[6]:02d}</span>'
+        jackpots = (
+            "<tr><td>Jackpot 1</td><td>O O O O O O</td><td>1</td><td>45.123.456.750</td></tr>"
+            "<tr><td>Jackpot 2</td><td>O O O O O | O</td><td>2</td><td>3.456.789.000</td></tr>"
+        )
+    else:
+        jackpots = "<tr><td>Jackpot</td><td>O O O O O O</td><td>0</td><td>15.987.654.500</td></tr>"
+    return f"""<html><body>
+<div class="chitietketqua_title">
+  <h5>Kỳ quay thưởng <b>#{period:05d}</b> ngày <b>22/02/2026</b></h5>
+</div>
+<div class="day_so_ket_qua_v2" style="padding-top: 15px;">{spans}</div>
+<table class="table table-striped table-hover">
+  <thead><tr><th>Giải thưởng</th><th>Trùng khớp</th><th>Số lượng giải</th><th>Giá trị giải (đồng)</th></tr></thead>
+  <tbody>
+    {jackpots}
+    <tr><td>Giải Nhất</td><td>O O O O O</td><td>27</td><td>10.000.000</td></tr>
+    <tr><td>Giải Nhì</td><td>O O O O</td><td>1.345</td><td>300.000</td></tr>
+    <tr><td>Giải Ba</td><td>O O O</td><td>28.765</td><td>30.000</td></tr>
+  </tbody>
+</table>
+</body></html>"""
+
+
+def listing_page(lottery_type: str, latest: int, page: int) -> str:
+    """Page ``page`` of the results listing when ``latest`` is the newest period."""
+    rows = []
+    top = latest - (page - 1) * ROWS_PER_LISTING
+    for period in range(top, max(top - ROWS_PER_LISTING, 0), -1):
+        spans = "".join(f'<span class="bong_tron small">{n:02d}</span>' for n in draw_numbers(period, lottery_type))
+        day = date(2016, 7, 18) + timedelta(days=2 * period)
+        rows.append(
+            f'<tr><td>{day:%d/%m/%Y}</td><td><a href="{RESULTS_PATH}?id={period:05d}">{period:05d}</a></td>'
+            f'<td><div class="day_so_ket_qua_v2">{spans}</div></td></tr>'
+        )
+    return f'<html><body><table class="table table-hover"><tbody>{"".join(rows)}</tbody></table></body></html>'
@@ -1,11 +1,15 @@
 import asyncio
-from app.services.crawler import fetch_vietlott_html
+from app.core.config import get_settings
+from app.core.http_client import close_http_client, get_http_client
 
 async def run():
     print("Fetching HTML...")
-    html = await fetch_vietlott_html("https://vietlott.vn/vi/trung-thuong/ket-qua-trung-thuong/mega-6-45")
+    try:
+        response = await get_http_client().get(f"{get_settings().VIETLOTT_BASE_URL}/vi/trung-thuong/ket-qua-trung-thuong/mega-6-45")
+    finally:
+        await close_http_client()
     with open("vietlott.html", "w") as f:
-        f.write(html)
+        f.write(response.text)
     print("Saved to vietlott.html")
 
 if __name__ == "__main__":
@@ -8,7 +8,10 @@ from tensorflow import keras
 from sqlalchemy import select, desc
 from app.core.database import async_session
 from app.models.draw_result import DrawResult
+from app.models.draw_feature import DrawFeature
 from app.models.number_stat import NumberStat
+from app.services.draw_features import compute_draw_features
+from app.services.stats_engine import get_max_number
 import joblib
 from sklearn.ensemble import RandomForestRegressor
 
@@ -19,19 +22,38 @@ def get_model_path(lottery_type: str, model_name: str, ext: str):
     return os.path.join(os.path.dirname(__file__), f"lottery_{model_name}_{lottery_type}.{ext}")
 
 # 1. FETCH DATA
-async def fetch_dataset(lottery_type: str, limit=None):
+async def fetch_dataset(lottery_type: str, limit=None, with_features=False):
+    """
+    Main numbers of each draw in chronological order. With ``with_features`` also returns the
+    precomputed (sum, odd count) of each draw from draw_features, aligned with the dataset.
+    """
     async with async_session() as db:
-        query = select(DrawResult).where(DrawResult.type == lottery_type).order_by(desc(DrawResult.draw_date))
+        query = (
+            select(DrawResult.numbers, DrawFeature.number_sum, DrawFeature.odd_count)
+            .outerjoin(DrawFeature, DrawFeature.draw_id == DrawResult.id)
+            .where(DrawResult.type == lottery_type)
+            .order_by(desc(DrawResult.draw_date))
+        )
         if limit:
             query = query.limit(limit)
         result = await db.execute(query)
-        draws = result.scalars().all()
-        logger.info(f"Đã lấy TOÀN BỘ dữ liệu lịch sử ({len(draws)} kỳ quay) cho {lottery_type} để huấn luyện Ensemble.")
-    if not draws:
-        return []
-    draws = list(reversed(draws))
-    dataset = [d.numbers[:6] for d in draws]
-    return dataset
+        rows = result.all()
+        logger.info(f"Đã lấy TOÀN BỘ dữ liệu lịch sử ({len(rows)} kỳ quay) cho {lottery_type} để huấn luyện Ensemble.")
+    rows = list(reversed(rows))
+    dataset = [r.numbers[:6] for r in rows]
+    if not with_features:
+        return dataset
+
+    max_num = get_max_number(lottery_type)
+    features = []
+    for r in rows:
+        if r.number_sum is None:
+            # Draw stored before its features row was written
+            f = compute_draw_features(r.numbers, max_num)
+            features.append((f["number_sum"], f["odd_count"]))
+        else:
+            features.append((r.number_sum, r.odd_count))
+    return dataset, features
 
 # 2. LSTM PREDICTOR
 class LSTMPredictor:
@@ -92,7 +114,8 @@ class RandomForestPredictor:
         self.num_classes = 55 if lottery_type == "power655" else 45
         self.model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
         
-    def prepare_data(self, dataset):
+    def prepare_data(self, dataset, features=None):
+        """``features`` holds the precomputed (sum, odd count) per draw from fetch_dataset."""
         X, y = [], []
         for i in range(1, len(dataset)):
             prev_draw = dataset[i-1]
@@ -102,11 +125,14 @@ class RandomForestPredictor:
             for num in prev_draw:
                 if 1 <= num <= self.num_classes: vec[num - 1] = 1.0
             
-            t_sum = sum(prev_draw)
-            odd_count = sum(1 for n in prev_draw if n % 2 != 0)
+            if features is not None:
+                t_sum, odd_count = features[i-1]
+            else:
+                t_sum = sum(prev_draw)
+                odd_count = sum(1 for n in prev_draw if n % 2 != 0)
             
-            features = np.concatenate([vec, [t_sum, odd_count]])
-            X.append(features)
+            row = np.concatenate([vec, [t_sum, odd_count]])
+            X.append(row)
             
             target = np.zeros(self.num_classes)
             for num in curr_draw:
@@ -115,10 +141,10 @@ class RandomForestPredictor:
             
         return np.array(X), np.array(y)
         
-    def train_model(self, dataset):
+    def train_model(self, dataset, features=None):
         logger.info(f"Training Random Forest for {self.lottery_type}...")
         if len(dataset) < 10: return False
-        X, y = self.prepare_data(dataset)
+        X, y = self.prepare_data(dataset, features)
         self.model.fit(X, y)
         path = get_model_path(self.lottery_type, "rf", "joblib")
         joblib.dump(self.model, path)
@@ -157,14 +183,14 @@ async def main():
     ltype = sys.argv[1] if len(sys.argv) > 1 else "mega645"
     epochs = int(sys.argv[2]) if len(sys.argv) > 2 else 50
     
-    dataset = await fetch_dataset(ltype)
+    dataset, features = await fetch_dataset(ltype, with_features=True)
     
     # Train Ensemble
     lstm = LSTMPredictor(lottery_type=ltype)
     lstm.train_model(dataset, epochs=epochs)
     
     rf = RandomForestPredictor(lottery_type=ltype)
-    rf.train_model(dataset)
+    rf.train_model(dataset, features)
     
     mc = MarkovChainPredictor(lottery_type=ltype)
     mc.train_model(dataset)
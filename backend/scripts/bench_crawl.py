@@ -0,0 +1,106 @@
+"""
+End-to-end crawler throughput against the local stand-in site (scripts/standin_site.py).
+
+Runs crawl_range and then crawl_all_pages for one lottery type with VIETLOTT_BASE_URL pointed
+at the stand-in, and prints pages/sec and DB rows/sec of each run (derived-table rebuild
+included, as in a real crawl). Every run starts by deleting the type's draws in 1..latest, so
+DATABASE_URL must point at a scratch database: pass --scratch to confirm.
+
+Usage: python scripts/bench_crawl.py [type] --scratch [--latest=1310] [--rate=1000] [--concurrency=8]
+         [--latency=0.05] [--jitter=0.02] [--errors=0.02] [--redirects=0.01] [--throttle=50] [--missing=...]
+The stand-in is local, so the request rate defaults to 1000/s to measure the pipeline, not pacing.
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# add parent dir to path so we can import app
+sys.path.append(BACKEND_DIR)
+
+from sqlalchemy import delete, func, select
+
+from app.core.config import get_settings
+from app.core.database import async_session
+from app.core.http_client import close_http_client
+from app.models.draw_result import DrawResult
+from app.services.crawl_pipeline import close_parse_pool
+from scripts.crawl_by_id import crawl_range
+from scripts.full_crawl import crawl_all_pages
+from scripts.standin_site import StandInSite, site_options
+
+# The crawl scripts configure INFO logging on import; keep the report readable
+logging.getLogger().setLevel(logging.WARNING)
+
+settings = get_settings()
+
+
+async def stored_draws(lottery_type: str, latest: int) -> int:
+    async with async_session() as db:
+        result = await db.execute(
+            select(func.count()).select_from(DrawResult)
+            .where((DrawResult.type == lottery_type) & (DrawResult.draw_period <= f"{latest:05d}"))
+        )
+        return result.scalar()
+
+
+async def run(name: str, crawl, site: StandInSite, lottery_type: str) -> None:
+    async with async_session() as db:
+        await db.execute(
+            delete(DrawResult).where((DrawResult.type == lottery_type) & (DrawResult.draw_period <= f"{site.latest:05d}"))
+        )
+        await db.commit()
+    site.reset_counts()
+    workdir = tempfile.mkdtemp(prefix="bench_crawl_")
+    # Fresh page cache and checkpoints, so every page really goes over HTTP
+    settings.CRAWLER_CACHE_DIR = os.path.join(workdir, "crawl_cache")
+    cwd = os.getcwd()
+    os.chdir(workdir)  # full_crawl leaves debug_crawl.html in the working directory
+    try:
+        start = time.perf_counter()
+        await crawl()
+        elapsed = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+    rows = await stored_draws(lottery_type, site.latest)
+    counts = site.counts
+    pages = counts.get("detail", 0) + counts.get("listing", 0)
+    faults = {k: counts[k] for k in ("errors", "throttled", "redirects") if counts.get(k)}
+    print(
+        f"{name:<16} {pages:>6} pages in {elapsed:6.2f}s = {pages / elapsed:7.1f} pages/s | "
+        f"{rows:>6} rows = {rows / elapsed:7.1f} rows/s | {counts.get('requests', 0)} requests, "
+        f"{counts.get('bytes', 0) / 1e6:.1f} MB, faults {faults or 'none'}"
+    )
+
+
+async def main(lottery_type: str, argv: list):
+    flags = dict(a[2:].split("=", 1) for a in argv if a.startswith("--") and "=" in a)
+    settings.CRAWLER_RATE = settings.CRAWLER_MAX_RATE = float(flags.get("rate", 1000))
+    if "concurrency" in flags:
+        settings.CRAWLER_CONCURRENCY = int(flags["concurrency"])
+
+    with StandInSite(**site_options(argv)) as site:
+        settings.VIETLOTT_BASE_URL = site.base_url
+        print(
+            f"{lottery_type} periods 1..{site.latest} from {site.base_url}: concurrency {settings.CRAWLER_CONCURRENCY}, "
+            f"rate {settings.CRAWLER_RATE:g}/s, latency {site.latency}s (+{site.jitter}s), errors {site.error_rate}, "
+            f"redirects {site.redirect_rate}, throttle every {site.throttle_every or '-'}"
+        )
+        try:
+            await run("crawl_range", lambda: crawl_range(lottery_type, site.latest, 1), site, lottery_type)
+            await run("crawl_all_pages", lambda: crawl_all_pages(lottery_type), site, lottery_type)
+        finally:
+            await close_http_client()
+            close_parse_pool()
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if "--scratch" not in sys.argv:
+        sys.exit("bench_crawl.py deletes and re-crawls draws; run it on a scratch database with --scratch")
+    asyncio.run(main(args[0] if args else "power655", sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""
+Benchmark result-page parsing throughput of the lxml and BeautifulSoup backends.
+
+Usage: python scripts/bench_parser.py [repeats]
+Parses the saved listing pages and a built 6/55 detail page with each backend and
+prints pages/second (best of ``repeats`` rounds).
+"""
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# add parent dir to path so we can import app
+sys.path.append(BACKEND_DIR)
+
+from app.services.vietlott_parser import BACKENDS, lxml_html, parse_listing_rows, parse_vietlott_results
+from app.testing.pages import LISTING_FIXTURES, detail_page, read_fixture
+
+
+def throughput(fn, pages: list, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - start)
+    return len(pages) / best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    if lxml_html is None:
+        print("lxml is not installed; nothing to compare")
+        return
+
+    listings = [html for html in map(read_fixture, LISTING_FIXTURES) if html is not None]
+    listings = listings * 20
+    details = [detail_page(1310, [3, 14, 22, 37, 45, 51, 9], "power655")] * 200
+    print(f"{len(listings)} listing pages ({sum(map(len, listings)) // len(listings) // 1024} KB avg), "
+          f"{len(details)} detail pages, best of {repeats}")
+
+    rates = {}
+    for backend in BACKENDS:
+        rates[backend] = (
+            throughput(lambda h: parse_listing_rows(h, backend=backend), listings, repeats),
+            throughput(lambda h: parse_vietlott_results(h, "power655", backend=backend), details, repeats),
+        )
+        print(f"  {backend:5s}: listing {rates[backend][0]:8.0f} pages/s   detail {rates[backend][1]:8.0f} pages/s")
+
+    print(f"lxml speedup: listing {rates['lxml'][0] / rates['bs4'][0]:.1f}x, "
+          f"detail {rates['lxml'][1] / rates['bs4'][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
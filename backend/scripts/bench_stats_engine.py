@@ -0,0 +1,107 @@
+"""
+Benchmark the vectorized stats engine against the legacy per-number loops.
+
+Usage: python scripts/bench_stats_engine.py [draws] [repeats]
+Generates a synthetic history for every lottery type (100k draws by default),
+checks that both implementations agree and prints timings.
+"""
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+# add parent dir to path so we can import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.stats_engine import (
+    LOTTERY_TYPES,
+    MAIN_NUMBERS,
+    build_draw_matrix,
+    compute_number_stats,
+    get_max_number,
+    pair_counts,
+    triplet_counts,
+)
+
+
+def synthetic_history(n_draws: int, max_num: int, seed: int = 42) -> list[list[int]]:
+    rng = np.random.default_rng(seed)
+    # argsort of random keys gives a uniform 6-of-N sample per row without Python loops
+    picks = np.argsort(rng.random((n_draws, max_num)), axis=1)[:, :MAIN_NUMBERS] + 1
+    return picks.tolist()
+
+
+def legacy_number_stats(draws: list[list[int]], max_num: int) -> dict:
+    """The nested loops previously used by update_number_stats."""
+    frequencies = defaultdict(int)
+    max_gaps_tracking = defaultdict(int)
+    running_gaps = {i: 0 for i in range(1, max_num + 1)}
+    for draw in draws:
+        drawn_nums = set(draw)
+        for num in range(1, max_num + 1):
+            if num in drawn_nums:
+                frequencies[num] += 1
+                if running_gaps[num] > max_gaps_tracking[num]:
+                    max_gaps_tracking[num] = running_gaps[num]
+                running_gaps[num] = 0
+            else:
+                running_gaps[num] += 1
+    for num in range(1, max_num + 1):
+        if running_gaps[num] > max_gaps_tracking[num]:
+            max_gaps_tracking[num] = running_gaps[num]
+    return {
+        "frequency": [frequencies[n] for n in range(1, max_num + 1)],
+        "current_gap": [running_gaps[n] for n in range(1, max_num + 1)],
+        "max_gap": [max_gaps_tracking[n] for n in range(1, max_num + 1)],
+    }
+
+
+def timed(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n_draws = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    histories = {t: synthetic_history(n_draws, get_max_number(t)) for t in LOTTERY_TYPES}
+    print(f"Synthetic histories: {n_draws} draws x {len(LOTTERY_TYPES)} types, best of {repeats}")
+
+    for lottery_type, draws in histories.items():
+        max_num = get_max_number(lottery_type)
+
+        legacy = legacy_number_stats(draws, max_num)
+        engine = compute_number_stats(build_draw_matrix(draws, max_num))
+        for key, expected in legacy.items():
+            assert engine[key].tolist() == expected, f"{lottery_type} {key} mismatch"
+
+        t_legacy = timed(lambda: legacy_number_stats(draws, max_num), repeats)
+        t_encode = timed(lambda: build_draw_matrix(draws, max_num), repeats)
+        matrix = build_draw_matrix(draws, max_num)
+        t_engine = timed(lambda: compute_number_stats(matrix), repeats)
+        t_pairs = timed(lambda: pair_counts(matrix), repeats)
+        t_triplets = timed(lambda: triplet_counts(matrix), repeats)
+
+        print(f"\n[{lottery_type}] max_num={max_num}")
+        print(f"  legacy loops        : {t_legacy * 1000:9.1f} ms")
+        print(f"  one-hot encode      : {t_encode * 1000:9.1f} ms")
+        print(f"  engine number stats : {t_engine * 1000:9.1f} ms  ({t_legacy / t_engine:.0f}x vs legacy)")
+        print(f"  engine pairs        : {t_pairs * 1000:9.1f} ms")
+        print(f"  engine triplets     : {t_triplets * 1000:9.1f} ms")
+
+    all_types = timed(
+        lambda: [compute_number_stats(build_draw_matrix(d, get_max_number(t))) for t, d in histories.items()],
+        repeats,
+    )
+    print(f"\nAll types, encode + stats in one pass: {all_types * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Rebuild every table derived from draw_results (features, number stats, pair/triplet counts,
+jackpot cycles, prize rollups) from the stored history.
+
+Required after `alembic upgrade head` on a database that already holds draws: the migrations
+only create the derived tables, and the read paths never rebuild them.
+
+Usage: python scripts/rebuild_derived.py [type ...]   (default: mega645 power655)
+"""
+import asyncio
+import logging
+import os
+import sys
+
+# add parent dir to path so we can import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ingest import rebuild_derived_tables
+
+logging.basicConfig(level=logging.INFO)
+
+LOTTERY_TYPES = ["mega645", "power655"]
+
+
+async def main(lottery_types: list):
+    for lottery_type in lottery_types:
+        await rebuild_derived_tables(lottery_type)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:] or LOTTERY_TYPES))
@@ -0,0 +1,40 @@
+"""
+Re-parse archived result pages (raw_pages) and fix or fill draw_results from them.
+
+Usage: python scripts/reparse_raw_html.py [type] [--unlinked] [--migrate-legacy] [--prune]
+  --unlinked        only pages the parser rejected when they were crawled
+  --migrate-legacy  first move HTML still stored in draw_results.raw_html_log into raw_pages
+  --prune           apply RAW_HTML_RETENTION_DAYS / RAW_HTML_MAX_PAGES afterwards
+"""
+import asyncio
+import logging
+import os
+import sys
+
+# add parent dir to path so we can import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ingest import rebuild_derived_tables
+from app.services.raw_archive import archive_legacy_raw_html, prune_raw_pages, reparse_raw_pages
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main(lottery_type: str, flags: set):
+    if "--migrate-legacy" in flags:
+        await archive_legacy_raw_html()
+
+    counts = await reparse_raw_pages(lottery_type, unlinked_only="--unlinked" in flags)
+    print(f"{lottery_type}: {counts}")
+    if counts["updated"] or counts["inserted"]:
+        await rebuild_derived_tables(lottery_type)
+
+    if "--prune" in flags:
+        await prune_raw_pages()
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    flags = {a for a in sys.argv[1:] if a.startswith("--")}
+    asyncio.run(main(args[0] if args else "mega645", flags))
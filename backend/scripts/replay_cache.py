@@ -0,0 +1,95 @@
+"""
+Replay the parser over the local page cache (CRAWLER_CACHE_DIR) without touching the network.
+
+Every cached page of a lottery type is parsed in the crawl process pool and compared with
+draw_results, which is how a parser change is checked against the whole crawled history.
+
+Usage: python scripts/replay_cache.py [type] [--write]
+  --write  insert the draws that parse from the cache but are missing from the DB
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+# add parent dir to path so we can import app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app.core.database import async_session
+from app.models.draw_result import DrawResult
+from app.services.crawl_pipeline import close_parse_pool, get_parse_pool, parse_detail_page
+from app.services.crawl_state import PageCache
+from app.services.draw_writer import DRAW_FIELDS, DrawBatchWriter
+from app.services.ingest import rebuild_derived_tables
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def replay(lottery_type: str, write: bool = False) -> dict:
+    cache = PageCache()
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    counts = {"pages": 0, "parsed": 0, "not_found": 0, "failed": 0, "missing": 0, "mismatched": 0, "inserted": 0}
+
+    start = time.perf_counter()
+    entries = list(cache.entries(lottery_type))
+    pages = [(entry, cache.read(entry)) for entry in entries]
+    outcomes = await asyncio.gather(
+        *(loop.run_in_executor(pool, parse_detail_page, html, lottery_type) for _, html in pages),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    parsed = {}
+    for (entry, _), outcome in zip(pages, outcomes):
+        counts["pages"] += 1
+        if isinstance(outcome, Exception):
+            counts["failed"] += 1
+            logger.warning(f"Cached page {entry['url']} does not parse: {outcome}")
+        elif outcome is None:
+            counts["not_found"] += 1
+        else:
+            counts["parsed"] += 1
+            parsed[outcome["draw_period"]] = outcome
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(DrawResult).where((DrawResult.type == lottery_type) & DrawResult.draw_period.in_(list(parsed)))
+        )
+        stored = {d.draw_period: d for d in result.scalars().all()}
+        writer = DrawBatchWriter(db, lottery_type)
+        for period, data in sorted(parsed.items()):
+            draw = stored.get(period)
+            if draw is None:
+                counts["missing"] += 1
+                if write:
+                    writer.add(data)
+                continue
+            diff = [f for f in DRAW_FIELDS if getattr(draw, f) != data.get(f, 0)]
+            if diff:
+                counts["mismatched"] += 1
+                logger.warning(f"{lottery_type} {period} differs from the DB in {', '.join(diff)}")
+        if write:
+            counts["inserted"] = len(await writer.flush())
+
+    rate = counts["pages"] / elapsed if elapsed else 0.0
+    print(f"{lottery_type}: {counts} ({counts['pages']} pages parsed in {elapsed:.2f}s, {rate:.0f} pages/s)")
+    return counts
+
+
+async def main(lottery_type: str, write: bool):
+    try:
+        counts = await replay(lottery_type, write)
+    finally:
+        close_parse_pool()
+    if counts["inserted"]:
+        await rebuild_derived_tables(lottery_type)
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    asyncio.run(main(args[0] if args else "mega645", "--write" in sys.argv))
@@ -0,0 +1,205 @@
+"""
+Local stand-in for the vietlott.vn result pages, for crawler runs that must not touch the real site.
+
+Serves the recorded 6/55 listing captures (p1.html, p2.html, terminal_curl.html, ...) and generated
+listing and detail pages for both games on the same paths as vietlott.vn, with injectable
+latency, errors, throttling and redirects. Point VIETLOTT_BASE_URL at it.
+
+Usage: python scripts/standin_site.py [--port=8765] [--latest=1310] [--latency=0.05] [--errors=0.02]
+                                      [--redirects=0.01] [--throttle=50] [--missing=1200,1201]
+"""
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qs, urlsplit
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# add parent dir to path so we can import app
+sys.path.append(BACKEND_DIR)
+
+from app.services.vietlott_parser import parse_listing_rows
+from app.testing.pages import (
+    LISTING_FIXTURES,
+    NOT_FOUND_HTML,
+    RESULTS_PATH,
+    detail_page,
+    draw_numbers,
+    listing_page,
+    read_fixture,
+)
+
+# path -> (lottery type, listing page parameter); detail paths take ?id=<period>
+LISTING_PATHS = {"winning-number-655": ("power655", "cur_page"), "winning-number-645": ("mega645", "p")}
+DETAIL_PATHS = {"655": "power655", "mega-6-45": "mega645", "645": "mega645"}
+
+
+class StandInSite:
+    """
+    Threaded HTTP server answering like vietlott.vn for periods 1..latest. Faults are drawn from
+    a seeded RNG so runs are repeatable: ``error_rate`` of requests get a 503, every
+    ``throttle_every``-th request a 429, and ``redirect_rate`` of detail requests a 302 to the
+    latest draw, the way the real site deflects throttled clients. Unknown ids (and ids above
+    ``latest``) get the latest draw; ``missing`` periods get a "not found" page.
+    """
+
+    def __init__(
+        self,
+        latest: int = 1310,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_every: int = 0,
+        redirect_rate: float = 0.0,
+        missing: Iterable[int] = (),
+        seed: int = 0,
+    ):
+        self.latest = latest
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_every = throttle_every
+        self.redirect_rate = redirect_rate
+        self.missing = set(missing)
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self._fixtures = self._load_fixtures()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _load_fixtures(self) -> List[str]:
+        """Recorded captures of listing page 1, served while ``latest`` matches their newest period."""
+        pages = []
+        for html in map(read_fixture, LISTING_FIXTURES):
+            rows = parse_listing_rows(html) if html else []
+            if rows and int(rows[0]["draw_period"]) == self.latest:
+                pages.append(html)
+        return pages
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + n
+
+    def _draw(self) -> float:
+        with self._lock:
+            return self._rnd.random()
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> tuple:
+        """(status, headers, body) of a request; faults are injected before routing."""
+        with self._lock:
+            self.counts["requests"] = n = self.counts.get("requests", 0) + 1
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self.jitter * self._draw())
+        if self.throttle_every and n % self.throttle_every == 0:
+            self._count("throttled")
+            return 429, {"Retry-After": "1"}, ""
+        if self.error_rate and self._draw() < self.error_rate:
+            self._count("errors")
+            return 503, {}, "Service Unavailable"
+
+        if not path.startswith(RESULTS_PATH + "/"):
+            return 404, {}, "Not Found"
+        name = path[len(RESULTS_PATH) + 1:]
+        if name in LISTING_PATHS:
+            lottery_type, param = LISTING_PATHS[name]
+            page = int(query.get(param, ["1"])[0])
+            self._count("listing")
+            if lottery_type == "power655" and page == 1 and self._fixtures:
+                self._count("fixture")
+                return 200, {}, self._fixtures[self.counts["fixture"] % len(self._fixtures)]
+            return 200, {}, listing_page(lottery_type, self.latest, page)
+        if name not in DETAIL_PATHS:
+            return 404, {}, "Not Found"
+
+        lottery_type = DETAIL_PATHS[name]
+        period = int(query.get("id", [str(self.latest)])[0])
+        if "id" in query and self.redirect_rate and self._draw() < self.redirect_rate:
+            self._count("redirects")
+            return 302, {"Location": f"{RESULTS_PATH}/{name}"}, ""
+        self._count("detail")
+        if period in self.missing:
+            return 200, {}, NOT_FOUND_HTML
+        if not 1 <= period <= self.latest:
+            period = self.latest
+        return 200, {}, detail_page(period, draw_numbers(period, lottery_type), lottery_type)
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, headers, body = site.respond(url.path, parse_qs(url.query))
+                data = body.encode("utf-8")
+                site._count("bytes", len(data))
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInSite":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts = {}
+
+    def __enter__(self) -> "StandInSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def site_options(argv: List[str]) -> Dict:
+    """StandInSite keyword arguments from --name=value flags."""
+    flags = dict(a[2:].split("=", 1) for a in argv if a.startswith("--") and "=" in a)
+    return {
+        "port": int(flags.get("port", 0)),
+        "latest": int(flags.get("latest", 1310)),
+        "latency": float(flags.get("latency", 0)),
+        "jitter": float(flags.get("jitter", 0)),
+        "error_rate": float(flags.get("errors", 0)),
+        "throttle_every": int(flags.get("throttle", 0)),
+        "redirect_rate": float(flags.get("redirects", 0)),
+        "missing": [int(p) for p in flags.get("missing", "").split(",") if p],
+    }
+
+
+if __name__ == "__main__":
+    options = site_options(sys.argv[1:])
+    options["port"] = options["port"] or 8765
+    site = StandInSite(**options)
+    print(f"Serving stand-in vietlott.vn on {site.base_url} (latest period {site.latest}); Ctrl+C to stop")
+    try:
+        site._server.serve_forever()
+    except KeyboardInterrupt:
+        site._server.server_close()
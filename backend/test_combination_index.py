@@ -0,0 +1,66 @@
+"""
+Brute-force check of the historic combination index (app/services/combination_index.py).
+
+Run from backend/: python test_combination_index.py
+Lookups of random and historic tickets must return exactly the draws sharing 6, 5 and 4
+numbers with the ticket, as found by comparing the ticket with every draw.
+"""
+import random
+
+from app.services.combination_index import CombinationIndex, pack_numbers, unpack_numbers
+from app.services.stats_engine import MAIN_NUMBERS, get_max_number
+
+
+def synthetic_draws(lottery_type: str, n: int, seed: int = 5) -> list:
+    rnd = random.Random(seed)
+    max_num = get_max_number(lottery_type)
+    width = MAIN_NUMBERS + (lottery_type == "power655")
+    return [rnd.sample(range(1, max_num + 1), width) for _ in range(n)]
+
+
+def brute_force_lookup(draws: list, ticket: list) -> dict:
+    found = {size: [] for size in (6, 5, 4)}
+    for i, draw in enumerate(draws):
+        shared = len(set(ticket) & set(draw[:MAIN_NUMBERS]))
+        if shared >= 4:
+            found[shared].append(i)
+    return found
+
+
+def check_pack_roundtrip():
+    for numbers in ([1, 2, 3, 4, 5, 6], [40, 45, 50, 51, 54, 55], [7]):
+        assert unpack_numbers(pack_numbers(numbers)) == sorted(numbers), numbers
+    print("pack/unpack roundtrip OK")
+
+
+def check_lookup_matches_brute_force():
+    for lottery_type in ("mega645", "power655"):
+        max_num = get_max_number(lottery_type)
+        draws = synthetic_draws(lottery_type, 3000)
+        index = CombinationIndex()
+        for i, draw in enumerate(draws):
+            index.add(i, draw)
+
+        rnd = random.Random(9)
+        tickets = [sorted(rnd.sample(range(1, max_num + 1), MAIN_NUMBERS)) for _ in range(200)]
+        # Historic tickets (a 6-match) and near misses (one number swapped)
+        for draw in rnd.sample(draws, 50):
+            main = draw[:MAIN_NUMBERS]
+            tickets.append(sorted(main))
+            swap = rnd.choice([n for n in range(1, max_num + 1) if n not in main])
+            tickets.append(sorted(main[1:] + [swap]))
+
+        hits = {6: 0, 5: 0, 4: 0}
+        for ticket in tickets:
+            expected = brute_force_lookup(draws, ticket)
+            got = index.lookup(ticket)
+            assert got == expected, f"{lottery_type} {ticket}: {got} != {expected}"
+            for size in hits:
+                hits[size] += len(got[size])
+        assert all(hits.values()), f"{lottery_type}: a match tier was never exercised {hits}"
+        print(f"{lottery_type}: {len(tickets)} lookups match brute force ({hits})")
+
+
+if __name__ == "__main__":
+    check_pack_roundtrip()
+    check_lookup_matches_brute_force()
@@ -0,0 +1,73 @@
+"""
+Page cache behaviour of the bulk crawl pipeline (app/services/crawl_pipeline.py).
+
+Run from backend/: python test_crawl_cache.py
+A mocked site first answers one period with an HTTP 200 anti-bot page, then with the real
+page: the unparseable page must not be cached, and the next run must fetch it again.
+"""
+import asyncio
+import re
+import tempfile
+
+import httpx
+
+import app.core.http_client as http_client
+from app.services.crawl_engine import CrawlEngine, AdaptiveRateLimiter
+from app.services.crawl_pipeline import close_parse_pool, crawl_draw_pages
+from app.services.crawl_state import PageCache
+from app.testing.pages import detail_page
+
+ANTI_BOT_HTML = "<html><body><script>document.cookie='D1N=1';location.reload()</script></body></html>"
+
+
+def url_for(period: str) -> str:
+    return f"https://vietlott.test/vi/trung-thuong/ket-qua-trung-thuong/mega-6-45?id={period}"
+
+
+async def crawl(cache: PageCache, periods: list) -> dict:
+    engine = CrawlEngine(concurrency=2, limiter=AdaptiveRateLimiter(rate=1000, max_rate=1000))
+    results = {}
+    async for batch in crawl_draw_pages(engine, periods, url_for, "mega645", cache=cache):
+        results.update(batch)
+    return results
+
+
+async def check_unparseable_page_is_refetched():
+    requests = []
+    blocked = {"00002"}
+
+    def handler(request):
+        period = re.search(r"id=(\d+)", str(request.url)).group(1)
+        requests.append(period)
+        if period in blocked:
+            return httpx.Response(200, text=ANTI_BOT_HTML)
+        return httpx.Response(200, text=detail_page(int(period), [1, 2, 3, 4, 5, 6], "mega645"))
+
+    http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    cache = PageCache(tempfile.mkdtemp())
+    periods = ["00001", "00002", "00003"]
+
+    first = await crawl(cache, periods)
+    assert isinstance(first["00002"], Exception), first["00002"]
+    assert cache.get(url_for("00002")) is None, "unparseable page was cached"
+    assert cache.get(url_for("00001")) is not None
+
+    blocked.clear()
+    requests.clear()
+    second = await crawl(cache, periods)
+    assert requests == ["00002"], f"expected only the failed period to be fetched again, got {requests}"
+    assert all(isinstance(second[p], dict) for p in periods), second
+    assert cache.get(url_for("00002")) is not None
+    print("unparseable page not cached and fetched again on the next run OK")
+
+
+async def main():
+    try:
+        await check_unparseable_page_is_refetched()
+    finally:
+        await http_client.close_http_client()
+        close_parse_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Checks of the NumberStat gap statistics: the vectorized histograms against a brute-force
+scan, and the incremental per-draw update against a full recompute.
+
+Run from backend/: python test_number_stats.py
+"""
+import random
+from collections import namedtuple
+from datetime import date, timedelta
+
+from app.models.number_stat import NumberStat
+from app.services.statistics import fold_draw_into_stats, set_number_stats
+from app.services.stats_engine import build_draw_matrix, gap_histograms, get_max_number
+
+Draw = namedtuple("Draw", "draw_date numbers")
+
+
+def synthetic_draws(lottery_type: str, n: int, seed: int = 11) -> list:
+    rnd = random.Random(seed)
+    max_num = get_max_number(lottery_type)
+    width = 7 if lottery_type == "power655" else 6
+    return [
+        Draw(date(2020, 1, 1) + timedelta(days=2 * i), sorted(rnd.sample(range(1, max_num + 1), width)))
+        for i in range(n)
+    ]
+
+
+def brute_force_histogram(draws: list, number: int) -> list:
+    """Gaps between consecutive appearances only (no leading or open trailing gap)."""
+    positions = [i for i, d in enumerate(draws) if number in d.numbers]
+    gaps = [b - a - 1 for a, b in zip(positions, positions[1:])]
+    hist = [0] * (max(gaps) + 1) if gaps else []
+    for g in gaps:
+        hist[g] += 1
+    return hist
+
+
+def fresh_stats(lottery_type: str) -> dict:
+    return {
+        n: NumberStat(number=n, type=lottery_type, frequency=0, current_gap=0, max_gap=0)
+        for n in range(1, get_max_number(lottery_type) + 1)
+    }
+
+
+def snapshot(stats: dict) -> dict:
+    return {
+        n: (s.frequency, s.current_gap, s.max_gap, s.last_seen, list(s.gap_histogram or []))
+        for n, s in stats.items()
+    }
+
+
+def check_histograms_match_brute_force():
+    for lottery_type in ("mega645", "power655"):
+        draws = synthetic_draws(lottery_type, 400)
+        max_num = get_max_number(lottery_type)
+        hist = gap_histograms(build_draw_matrix((d.numbers for d in draws), max_num))
+        for number in range(1, max_num + 1):
+            row = hist[number - 1].tolist()
+            while row and row[-1] == 0:
+                row.pop()
+            assert row == brute_force_histogram(draws, number), f"{lottery_type} {number}: histogram differs"
+        print(f"{lottery_type}: gap histograms match brute force (leading and open gaps excluded)")
+
+
+def check_incremental_matches_recompute():
+    for lottery_type in ("mega645", "power655"):
+        draws = synthetic_draws(lottery_type, 300)
+        max_num = get_max_number(lottery_type)
+        # Includes a split before some numbers have appeared at all
+        for split in (0, 3, 150):
+            incremental = fresh_stats(lottery_type)
+            set_number_stats(incremental, draws[:split], max_num)
+            for d in draws[split:]:
+                fold_draw_into_stats(list(incremental.values()), d.numbers, d.draw_date)
+
+            recomputed = fresh_stats(lottery_type)
+            set_number_stats(recomputed, draws, max_num)
+            assert snapshot(incremental) == snapshot(recomputed), f"{lottery_type} split {split}: paths disagree"
+        print(f"{lottery_type}: incremental updates agree with the full recompute")
+
+
+if __name__ == "__main__":
+    check_histograms_match_brute_force()
+    check_incremental_matches_recompute()
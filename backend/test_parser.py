@@ -0,0 +1,71 @@
+"""
+Parity check of the lxml and BeautifulSoup parser backends.
+
+Run from backend/: python test_parser.py
+Uses the saved listing pages (p1.html, p2.html, debug_crawl.html) and built 6/45 and 6/55
+detail pages with the same markup as vietlott.vn (app/testing/pages.py).
+"""
+from app.services.vietlott_parser import lxml_html, parse_listing_rows, parse_vietlott_results
+from app.testing.pages import detail_page, read_fixture
+
+FIXTURES = ["p1.html", "p2.html", "debug_crawl.html"]
+
+
+def check_listing_fixtures():
+    for name in FIXTURES:
+        html = read_fixture(name)
+        if html is None:
+            print(f"Skipping missing fixture {name}")
+            continue
+        fast = parse_listing_rows(html, backend="lxml")
+        slow = parse_listing_rows(html, backend="bs4")
+        assert fast == slow, f"{name}: listing rows differ"
+        assert fast and all(len(r["numbers"]) == 7 for r in fast), f"{name}: unexpected rows {fast}"
+        print(f"{name}: {len(fast)} rows, periods {fast[-1]['draw_period']}..{fast[0]['draw_period']} OK")
+
+        # Listing pages are not detail pages: both backends must reject them the same way
+        errors = []
+        for backend in ("lxml", "bs4"):
+            try:
+                parse_vietlott_results(html, "power655", backend=backend)
+            except ValueError as e:
+                errors.append(str(e))
+        assert len(errors) == 2 and errors[0] == errors[1], f"{name}: detail parse mismatch {errors}"
+
+
+def check_detail_pages():
+    cases = [
+        ("mega645", 1475, [5, 12, 19, 28, 33, 41]),
+        ("power655", 1310, [3, 14, 22, 37, 45, 51, 9]),
+    ]
+    for lottery_type, period, numbers in cases:
+        html = detail_page(period, numbers, lottery_type)
+        fast = parse_vietlott_results(html, lottery_type, backend="lxml")
+        slow = parse_vietlott_results(html, lottery_type, backend="bs4")
+        assert fast == slow, f"{lottery_type}: {fast} != {slow}"
+        assert fast["draw_period"] == f"{period:05d}"
+        assert fast["numbers"] == numbers
+        assert fast["second_prize_winners"] == 1345
+        if lottery_type == "power655":
+            assert (fast["jackpot_value"], fast["jackpot2_winners"]) == (45123456750, 2)
+            assert fast["jackpot_won"]
+        else:
+            assert (fast["jackpot_value"], fast["jackpot_won"]) == (15987654500, False)
+        print(f"{lottery_type} detail #{period:05d}: {fast['numbers']} OK")
+
+    for broken in ("", "<html><body><p>Không tìm thấy</p></body></html>"):
+        for backend in ("lxml", "bs4"):
+            try:
+                parse_vietlott_results(broken, backend=backend)
+                raise AssertionError(f"{backend} accepted a page without results")
+            except ValueError:
+                pass
+
+
+if __name__ == "__main__":
+    if lxml_html is None:
+        print("lxml is not installed; only the BeautifulSoup backend is available")
+    else:
+        check_listing_fixtures()
+        check_detail_pages()
+        print("lxml and BeautifulSoup parsers agree")
@@ -0,0 +1,70 @@
+"""
+Brute-force check of the bitmask pattern search (app/services/pattern_search.py).
+
+Run from backend/: python test_pattern_search.py
+match_draws must select exactly the draws a plain Python filter selects, for random
+combinations of contains / excludes / sum range / odd count constraints.
+"""
+import random
+
+import numpy as np
+
+import app.services.pattern_search as pattern_search
+from app.services.pattern_search import build_masks, match_draws, popcount
+from app.services.stats_engine import MAIN_NUMBERS, get_max_number
+
+
+def synthetic_draws(lottery_type: str, n: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    max_num = get_max_number(lottery_type)
+    return [sorted(rnd.sample(range(1, max_num + 1), MAIN_NUMBERS)) for _ in range(n)]
+
+
+def brute_force_match(draws, contains, excludes, min_sum, max_sum, odd_count) -> np.ndarray:
+    return np.array([
+        set(contains) <= set(d)
+        and not set(excludes) & set(d)
+        and (min_sum is None or sum(d) >= min_sum)
+        and (max_sum is None or sum(d) <= max_sum)
+        and (odd_count is None or sum(n % 2 for n in d) == odd_count)
+        for d in draws
+    ], dtype=bool)
+
+
+def check_popcount():
+    rnd = random.Random(1)
+    values = [0, 1, 2 ** 63, 2 ** 64 - 1] + [rnd.getrandbits(64) for _ in range(500)]
+    masks = np.array(values, dtype=np.uint64)
+    expected = [bin(v).count("1") for v in values]
+    assert popcount(masks).tolist() == expected
+    # The lookup-table fallback used on NumPy < 2.0
+    lut = pattern_search._POPCOUNT_LUT[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+    assert lut.tolist() == expected
+    print("popcount OK")
+
+
+def check_match_draws():
+    rnd = random.Random(3)
+    for lottery_type in ("mega645", "power655"):
+        max_num = get_max_number(lottery_type)
+        draws = synthetic_draws(lottery_type, 2000)
+        masks = build_masks(draws)
+        sums = np.array([sum(d) for d in draws], dtype=np.int32)
+        matched_any = 0
+        for _ in range(300):
+            pool = rnd.sample(range(1, max_num + 1), 6)
+            contains = pool[: rnd.randint(0, 2)]
+            excludes = pool[3: 3 + rnd.randint(0, 3)]
+            min_sum = rnd.choice([None, rnd.randint(60, 160)])
+            max_sum = rnd.choice([None, rnd.randint(120, 260)])
+            odd_count = rnd.choice([None, rnd.randint(0, 6)])
+            got = match_draws(masks, sums, contains, excludes, min_sum, max_sum, odd_count)
+            expected = brute_force_match(draws, contains, excludes, min_sum, max_sum, odd_count)
+            assert np.array_equal(got, expected), (lottery_type, contains, excludes, min_sum, max_sum, odd_count)
+            matched_any += int(got.any())
+        print(f"{lottery_type}: 300 random searches match brute force ({matched_any} with results)")
+
+
+if __name__ == "__main__":
+    check_popcount()
+    check_match_draws()
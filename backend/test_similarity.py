@@ -0,0 +1,74 @@
+"""
+Brute-force check of the nearest-draw similarity search (pattern_search.top_similar and
+statistics.closest_draws).
+
+Run from backend/: python test_similarity.py
+Scores must equal set overlap / Jaccard computed per draw, and the top-k ranking must match
+sorting every draw by score desc, most recent draw first on ties.
+"""
+import random
+from datetime import date, timedelta
+
+import numpy as np
+
+from app.services.draw_history import DrawHistory
+from app.services.pattern_search import build_masks, similarity_scores, top_similar
+from app.services.statistics import closest_draws
+from app.services.stats_engine import MAIN_NUMBERS, get_max_number
+
+
+def synthetic_draws(lottery_type: str, n: int, seed: int = 13) -> list:
+    rnd = random.Random(seed)
+    max_num = get_max_number(lottery_type)
+    return [sorted(rnd.sample(range(1, max_num + 1), MAIN_NUMBERS)) for _ in range(n)]
+
+
+def brute_force_scores(draws: list, ticket: list, metric: str) -> list:
+    scores = []
+    for d in draws:
+        shared = len(set(d) & set(ticket))
+        scores.append(shared / len(set(d) | set(ticket)) if metric == "jaccard" else shared)
+    return scores
+
+
+def brute_force_top(draws: list, ticket: list, k: int, metric: str) -> list:
+    scores = brute_force_scores(draws, ticket, metric)
+    return sorted(range(len(draws)), key=lambda i: (-scores[i], -i))[:k]
+
+
+def check_top_similar():
+    rnd = random.Random(2)
+    for lottery_type in ("mega645", "power655"):
+        max_num = get_max_number(lottery_type)
+        draws = synthetic_draws(lottery_type, 1500)
+        masks = build_masks(draws)
+        for metric in ("overlap", "jaccard"):
+            for _ in range(100):
+                ticket = rnd.sample(range(1, max_num + 1), MAIN_NUMBERS)
+                scores = similarity_scores(masks, ticket, metric)
+                assert np.allclose(scores, brute_force_scores(draws, ticket, metric)), (metric, ticket)
+                k = rnd.choice([1, 10, 50])
+                indices, top = top_similar(masks, ticket, k=k, metric=metric)
+                assert indices.tolist() == brute_force_top(draws, ticket, k, metric), (metric, ticket, k)
+                assert np.allclose(top, scores[indices])
+        print(f"{lottery_type}: top_similar matches brute force (overlap and jaccard)")
+
+
+def check_closest_draws():
+    history = DrawHistory("power655")
+    rows = [
+        (i + 1, f"{i + 1:05d}", date(2020, 1, 1) + timedelta(days=2 * i), numbers + [1])
+        for i, numbers in enumerate(synthetic_draws("power655", 200))
+    ]
+    history.append(rows)
+    ticket = rows[120][3][:MAIN_NUMBERS]
+    result = closest_draws(history, ticket, limit=5)
+    assert result[0]["draw_period"] == rows[120][1] and result[0]["score"] == MAIN_NUMBERS
+    # The bonus ball is not part of the match
+    assert all(r["score"] == len(r["matched"]) for r in result)
+    print("closest_draws OK")
+
+
+if __name__ == "__main__":
+    check_top_similar()
+    check_closest_draws()
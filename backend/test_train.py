@@ -0,0 +1,49 @@
+"""
+Checks of the training data preparation in ml/train.py.
+
+Run from backend/: python test_train.py
+"""
+import random
+
+import numpy as np
+
+from app.services.draw_features import compute_draw_features
+from app.services.stats_engine import get_max_number
+from ml.train import RandomForestPredictor
+
+
+def synthetic_draws(lottery_type: str, n: int, seed: int = 3) -> list:
+    rnd = random.Random(seed)
+    max_num = get_max_number(lottery_type)
+    return [sorted(rnd.sample(range(1, max_num + 1), 6)) for _ in range(n)]
+
+
+def check_prepare_data_with_features():
+    for lottery_type in ("mega645", "power655"):
+        max_num = get_max_number(lottery_type)
+        dataset = synthetic_draws(lottery_type, 12)
+        # The precomputed features (fetch_dataset's fallback path included) must match the computed ones
+        features = []
+        for draw in dataset:
+            f = compute_draw_features(draw, max_num)
+            features.append((f["number_sum"], f["odd_count"]))
+
+        predictor = RandomForestPredictor(lottery_type)
+        X, y = predictor.prepare_data(dataset, features)
+        X_plain, y_plain = predictor.prepare_data(dataset)
+        assert X.shape == (len(dataset) - 1, max_num + 2), X.shape
+        assert y.shape == (len(dataset) - 1, max_num), y.shape
+        assert np.array_equal(X, X_plain) and np.array_equal(y, y_plain), f"{lottery_type}: features differ"
+        print(f"{lottery_type}: prepare_data over {len(X)} windows with precomputed features OK")
+
+
+def check_high_numbers_features():
+    # 6/55 draws with numbers >= 50 fall in the last decade bucket
+    f = compute_draw_features([3, 17, 28, 50, 54, 55], get_max_number("power655"))
+    assert f["number_sum"] == 207 and f["odd_count"] == 3, f
+    print("power655 features of numbers >= 50 OK")
+
+
+if __name__ == "__main__":
+    check_prepare_data_with_features()
+    check_high_numbers_features()